@@ -7,6 +7,7 @@ from metabci.brainda.algorithms.utils.model_selection import (
     generate_kfold_indices, match_kfold_indices)
 from metabci.brainda.algorithms.decomposition import FBTRCA
 from metabci.brainda.algorithms.transfer_learning import LST
+from metabci.brainda.algorithms.transfer_learning.lst import lst_source_kernel
 from metabci.brainda.algorithms.decomposition.base import generate_filterbank
 
 
@@ -74,6 +75,8 @@ filterweights = [(idx_filter+1) ** (-1.25) + 0.25 for idx_filter in range(5)]
 estimator = FBTRCA(filterbank=filterbank,n_components = 1, ensemble = True,filterweights=np.array(filterweights), n_jobs=-1)
 
 
+# the source part of LST does not depend on the fold
+source_kernel = lst_source_kernel(Xs)
 accs = []
 for k in range(kfold):
     train_ind, validate_ind, test_ind = match_kfold_indices(k, meta_t, indices)
@@ -82,7 +85,7 @@ for k in range(kfold):
     # transfer_learning
     LST_estimator = LST()
     LST_estimator.fit(Xt[train_ind], yt[train_ind])
-    Xs_transform = LST_estimator.transform(Xs, ys)
+    Xs_transform = LST_estimator.transform(Xs, ys, source_kernel=source_kernel)
     Xnew = np.concatenate((Xt[train_ind], Xs_transform), axis=0)
     ynew = np.concatenate((yt[train_ind], ys), axis=0)
     # train and test
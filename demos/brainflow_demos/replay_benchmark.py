@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the online pipeline without hardware.
+
+Synthetic data with triggers are replayed at an accelerated rate through the
+ReplayAmplifier, then through a local ReplayServer emulating the NeuroScan,
+Neuracle and HT wire formats with the real amplifier clients. The report
+gives the trigger-to-consume latency, dropped packets and CPU use.
+
+"""
+import numpy as np
+
+from metabci.brainflow.amplifiers import Marker, NeuroScan, Neuracle, HTOnlineSystem
+from metabci.brainflow.simulator import (
+    ReplaySource, ReplayAmplifier, ReplayServer, run_benchmark)
+
+srate = 1000
+n_chans = 64
+packet_samples = 40
+speed = 4
+
+
+def make_source():
+    return ReplaySource.synthetic(
+        n_channels=n_chans, srate=srate, n_trials=20, events=(1, 2, 3),
+        trial_len=1.0, iti=0.5, random_state=42,
+        packet_samples=packet_samples, speed=speed)
+
+
+def make_marker():
+    return Marker(interval=[0.14, 1.14], srate=srate, events=[1, 2, 3])
+
+
+def replay():
+    source = make_source()
+    amplifier = ReplayAmplifier(source)
+    return run_benchmark(amplifier, source, make_marker())
+
+
+def tcp(protocol):
+    source = make_source()
+    server = ReplayServer(source, protocol=protocol)
+    address = server.start()
+    try:
+        if protocol == 'neuroscan':
+            amplifier = NeuroScan(device_address=address, srate=srate, num_chans=n_chans)
+            amplifier.connect_tcp()
+            amplifier.start_acq()
+            start, stop = amplifier.start_trans, amplifier.stop_trans
+        elif protocol == 'neuracle':
+            amplifier = Neuracle(device_address=address, srate=srate, num_chans=n_chans + 1)
+            amplifier.connect_tcp()
+            start, stop = amplifier.start_trans, amplifier.stop_trans
+        else:
+            amplifier = HTOnlineSystem(
+                device_address=address, srate=srate,
+                packet_samples=packet_samples, num_chans=n_chans)
+            amplifier.connect_tcp()
+            start, stop = amplifier.start_acq, amplifier.stop_acq
+        # the clients block on recv, unblock them once the server stops streaming
+        amplifier.set_timeout(1.0)
+        report = run_benchmark(amplifier, source, make_marker(), start=start, stop=stop)
+        amplifier.close_connection()
+    finally:
+        server.stop()
+    return report
+
+
+if __name__ == '__main__':
+    for name, run in [('replay', replay),
+                      ('neuroscan', lambda: tcp('neuroscan')),
+                      ('neuracle', lambda: tcp('neuracle')),
+                      ('ht', lambda: tcp('ht'))]:
+        report = run()
+        print('{:s}: {:d}/{:d} trials, epoch-to-consume p50 {:.2f} ms, p99 {:.2f} ms, '
+              'trigger-to-consume p50 {:.1f} ms, {:d} dropped packets, '
+              'cpu main {:.1f}%, worker {:.1f}%'.format(
+                  name, report['n_epochs'], report['n_triggers'],
+                  report['epoch_latency']['p50'], report['epoch_latency']['p99'],
+                  report['trigger_latency']['p50'], report['dropped_packets'],
+                  report['cpu_main'], report['cpu_worker']))
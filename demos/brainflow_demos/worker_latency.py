@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Latency of the epoch transport between the amplifier thread and a ProcessWorker,
+comparing the multiprocessing queue with the shared memory slot ring.
+
+"""
+import time
+import multiprocessing
+import numpy as np
+
+from metabci.brainflow.workers import ProcessWorker
+
+
+class LatencyWorker(ProcessWorker):
+    def __init__(self, results, **kwargs):
+        self.results = results
+        super().__init__(**kwargs)
+
+    def pre(self):
+        pass
+
+    def consume(self, data):
+        # the first sample carries the time the epoch was put
+        self.results.put(time.perf_counter() - data[0, 0])
+
+    def post(self):
+        pass
+
+
+def benchmark(n_trials=50, n_samples=4000, n_chans=65, shm=False):
+    results = multiprocessing.Queue()
+    kwargs = dict(timeout=1e-3, name='latency_worker')
+    if shm:
+        kwargs.update(shm_shape=(n_samples, n_chans), shm_slots=4)
+    worker = LatencyWorker(results, **kwargs)
+    worker.start()
+    time.sleep(1)
+
+    epoch = np.random.randn(n_samples, n_chans)
+    latencies = []
+    for _ in range(n_trials):
+        epoch[0, 0] = time.perf_counter()
+        worker.put(epoch)
+        latencies.append(results.get())
+    worker.stop()
+    worker.join()
+    return np.array(latencies) * 1e3
+
+
+if __name__ == '__main__':
+    # 64 channels and trigger channel x 4 s x 1 kHz
+    for shm in (False, True):
+        latencies = benchmark(shm=shm)
+        print('{:s}: median {:.3f} ms, 95th percentile {:.3f} ms'.format(
+            'shared memory' if shm else 'queue',
+            np.median(latencies), np.percentile(latencies, 95)))
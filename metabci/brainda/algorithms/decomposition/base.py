@@ -6,12 +6,16 @@
 
 
 from typing import Optional, List, Tuple, Union
+from collections import OrderedDict
+import hashlib
+import threading
 import warnings
 import numpy as np
 from numpy import ndarray
 from scipy.linalg import solve
-from scipy.signal import sosfiltfilt, cheby1, cheb1ord
+from scipy.signal import sosfilt, sosfilt_zi, sosfiltfilt, cheby1, cheb1ord
 from sklearn.base import BaseEstimator, TransformerMixin, clone
+from joblib import Parallel, delayed
 from metabci.brainda.datasets.base import BaseTimeEncodingDataset
 import mne
 
@@ -52,6 +56,52 @@ def robust_pattern(W : ndarray, Cx: ndarray, Cs: ndarray) -> ndarray:
     return A
 
 
+_filterbank_cache: "OrderedDict[tuple, ndarray]" = OrderedDict()
+_filterbank_cache_lock = threading.Lock()
+_filterbank_cache_size = 0
+
+
+def set_filterbank_cache(maxsize: int = 0):
+    """
+    Enable the LRU cache of filter bank outputs shared by all FilterBank estimators.
+
+    Each entry is one sub-band of one input array, keyed by a hash of the array content and of the filter
+    coefficients, so several filter bank estimators evaluated on the same data filter each band only once.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of cached sub-band outputs, 0 disables and clears the cache. The default is 0.
+    """
+    global _filterbank_cache_size
+    with _filterbank_cache_lock:
+        _filterbank_cache_size = maxsize
+        _filterbank_cache.clear()
+
+
+def _array_digest(X: ndarray) -> tuple:
+    X = np.ascontiguousarray(X)
+    return (X.shape, X.dtype.str, hashlib.blake2b(X.view(np.uint8).data, digest_size=16).digest())
+
+
+def _cached_sosfiltfilt(sos: ndarray, X: ndarray, key: Optional[tuple] = None) -> ndarray:
+    if key is None:
+        return sosfiltfilt(sos, X, axis=-1)
+    key = (key, _array_digest(sos))
+    with _filterbank_cache_lock:
+        Xf = _filterbank_cache.get(key, None)
+        if Xf is not None:
+            _filterbank_cache.move_to_end(key)
+            return Xf
+    Xf = sosfiltfilt(sos, X, axis=-1)
+    with _filterbank_cache_lock:
+        if _filterbank_cache_size > 0:
+            _filterbank_cache[key] = Xf
+            while len(_filterbank_cache) > _filterbank_cache_size:
+                _filterbank_cache.popitem(last=False)
+    return Xf
+
+
 class FilterBank(BaseEstimator, TransformerMixin):
     """
     Filter bank decomposition is a bandpass filter array that divides the input signal into
@@ -67,7 +117,8 @@ class FilterBank(BaseEstimator, TransformerMixin):
     filterbank : list[ndarray]
         A bandpass filter bank used to divide the input signal into multiple subband components.
     n_jobs : int
-        Sets the number of CPU working cores. The default is None.
+        Sets the number of CPU working cores. The default is None. Sub-bands are filtered, fitted and transformed
+        concurrently in a thread pool.
 
     References
     ----------
@@ -100,17 +151,30 @@ class FilterBank(BaseEstimator, TransformerMixin):
         Yf : None
             Reference signal (ibid., ignorable).
         """
+        return self.fit_subbands(self.transform_filterbank(X), y, **kwargs)
+
+    def fit_subbands(self, Xs: ndarray, y: Optional[ndarray] = None, **kwargs):
+        """
+        Training model on subband components that are already filtered by the filter bank, e.g. when they are also
+        used to compute training features.
+
+        Parameters
+        ----------
+        Xs : ndarray, shape(Nfb, n_trials, n_channels, n_samples)
+            Individual subband components of the training signal.
+        y : None
+            Label data.
+        """
         self.estimators_ = [
             clone(self.base_estimator) for _ in range(len(self.filterbank))
         ]
-        X = self.transform_filterbank(X)
-        for i, est in enumerate(self.estimators_):
-            est.fit(X[i], y, **kwargs)
-        # def wrapper(est, X, y, kwargs):
-        #     est.fit(X, y, **kwargs)
-        #     return est
-        # self.estimators_ = Parallel(n_jobs=self.n_jobs)(
-        #     delayed(wrapper)(est, X[i], y, kwargs) for i, est in enumerate(self.estimators_))
+        X = Xs
+
+        def wrapper(est, X, y, kwargs):
+            est.fit(X, y, **kwargs)
+            return est
+        self.estimators_ = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(wrapper)(est, X[i], y, kwargs) for i, est in enumerate(self.estimators_))
         return self
 
     def transform(self, X: ndarray, **kwargs):
@@ -131,19 +195,38 @@ class FilterBank(BaseEstimator, TransformerMixin):
         feat : ndarray, shape(n_trials, n_fre)
             Feature array.
         """
-        X = self.transform_filterbank(X)
-        feat = [est.transform(X[i], **kwargs) for i, est in enumerate(self.estimators_)]
-        # def wrapper(est, X, kwargs):
-        #     retval = est.transform(X, **kwargs)
-        #     return retval
-        # feat = Parallel(n_jobs=self.n_jobs)(
-        #     delayed(wrapper)(est, X[i], kwargs) for i, est in enumerate(self.estimators_))
+        return self.transform_subbands(self.transform_filterbank(X), **kwargs)
+
+    def transform_subbands(self, Xs: ndarray, **kwargs):
+        """
+        Convert subband components that are already filtered by the filter bank into features, e.g. the outputs of
+        StreamingFilterBank in online decoding.
+
+        Parameters
+        ----------
+        Xs : ndarray, shape(Nfb, n_trials, n_channels, n_samples)
+            Individual subband components of the test signal.
+
+        Returns
+        -------
+        feat : ndarray, shape(n_trials, n_fre)
+            Feature array.
+        """
+        X = Xs
+
+        def wrapper(est, X, kwargs):
+            retval = est.transform(X, **kwargs)
+            return retval
+        feat = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(wrapper)(est, X[i], kwargs) for i, est in enumerate(self.estimators_))
         feat = np.concatenate(feat, axis=-1)
         return feat
 
     def transform_filterbank(self, X: ndarray):
         """
-        The input signal is filtered through a filter bank.
+        The input signal is filtered through a filter bank. Sub-bands are filtered concurrently (SciPy releases
+        the GIL) into a preallocated output, and are taken from the cache enabled by set_filterbank_cache when
+        the same data has been filtered before.
 
         update log:
             2023-12-10 by Leyi Jia <18020095036@163.com>, Add code annotation
@@ -158,7 +241,14 @@ class FilterBank(BaseEstimator, TransformerMixin):
         Xs: ndarray, shape(Nfb, n_trials, n_channels, n_samples)
             Individual subband components of the input signal.
         """
-        Xs = np.stack([sosfiltfilt(sos, X, axis=-1) for sos in self.filterbank])
+        X = np.asarray(X)
+        Xs = np.empty((len(self.filterbank), *X.shape), dtype=np.result_type(X.dtype, np.float64))
+        key = _array_digest(X) if _filterbank_cache_size > 0 else None
+
+        def wrapper(i, sos):
+            Xs[i] = _cached_sosfiltfilt(sos, X, key=key)
+        Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(wrapper)(i, sos) for i, sos in enumerate(self.filterbank))
         return Xs
 
 
@@ -193,25 +283,25 @@ class FilterBankSSVEP(FilterBank):
         self.filterweights = filterweights
         super().__init__(base_estimator, filterbank, n_jobs=n_jobs)
 
-    def transform(self, X: ndarray):  # type: ignore[override]
+    def transform_subbands(self, Xs: ndarray):  # type: ignore[override]
         """
-        X is converted into features by using the parameters stored in self, and the eigenvalues of each subband
-        component are obtained after the input signal is filtered by the filter bank.
+        Subband components are converted into features by using the parameters stored in self, and the features of
+        each subband are combined with the filter weights. transform(X) filters X through the filter bank first.
 
         update log:
             2023-12-10 by Leyi Jia <18020095036@163.com>, Add code annotation
 
         Parameters
         ----------
-        X : ndarray, shape(n_trials, n_channels, n_samples)
-            Test the signal.
+        Xs : ndarray, shape(Nfb, n_trials, n_channels, n_samples)
+            Individual subband components of the test signal.
 
         Returns
         -------
         features : ndarray, shape(n_trials, n_fre)
             Feature array.
         """
-        features = super().transform(X)
+        features = super().transform_subbands(Xs)
         if self.filterweights is None:
             return features
         else:
@@ -582,6 +672,126 @@ def generate_filterbank(
     return filterbank
 
 
+class StreamingFilterBank:
+    """
+    Causal filter bank for online decoding.
+    Incoming sample chunks of arbitrary size are filtered with sosfilt, keeping the filter state of every subband
+    and channel between updates, and the filtered subband components are kept in a ring buffer, so the filtering
+    cost of each update is proportional to the number of new samples rather than to the window length. The
+    subband windows returned by get_subbands can be consumed directly by FilterBank.transform_subbands.
+
+    In offline mode (online=False) raw samples are buffered instead and each window is filtered with the
+    zero-phase sosfiltfilt of FilterBank.transform_filterbank, which reproduces the offline results.
+
+    Parameters
+    ----------
+    filterbank : list[ndarray]
+        The filter bank, e.g. from generate_filterbank.
+    n_channels : int
+        The number of channels.
+    buffer_len : int
+        The number of samples kept in the ring buffer, at least the window length to decode.
+    online : bool
+        Whether to filter causally while streaming, the default is True.
+
+    Attributes
+    ----------
+    zi_ : list[ndarray]
+        Filter state of every subband, each of shape(n_sections, n_channels, 2).
+    buffer_ : ndarray, shape(Nfb, n_channels, buffer_len) or shape(n_channels, buffer_len)
+        Ring buffer of filtered subband components (online) or raw samples (offline).
+    n_samples_ : int
+        The number of samples received since the last reset.
+    """
+
+    def __init__(
+        self,
+        filterbank: List[ndarray],
+        n_channels: int,
+        buffer_len: int,
+        online: bool = True,
+    ):
+        self.filterbank = filterbank
+        self.n_channels = n_channels
+        self.buffer_len = buffer_len
+        self.online = online
+        self.reset()
+
+    def reset(self):
+        """Clear the filter states and the ring buffer."""
+        if self.online:
+            self.buffer_ = np.zeros((len(self.filterbank), self.n_channels, self.buffer_len))
+        else:
+            self.buffer_ = np.zeros((self.n_channels, self.buffer_len))
+        self.zi_ = [np.zeros((sos.shape[0], self.n_channels, 2)) for sos in self.filterbank]
+        self.n_samples_ = 0
+        self._index = 0
+
+    def update(self, X: ndarray):
+        """
+        Feed a new chunk of samples.
+
+        Parameters
+        ----------
+        X : ndarray, shape(n_channels, n_samples)
+            New samples.
+
+        Returns
+        -------
+        Xs : ndarray, shape(Nfb, n_channels, n_samples) or None
+            Filtered subband components of the chunk in online mode, None in offline mode.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape[0] != self.n_channels:
+            raise ValueError("the number of channels of X does not match n_channels.")
+        if self.online:
+            if self.n_samples_ == 0:
+                # start from the steady state of the first sample to avoid the step transient
+                for i, sos in enumerate(self.filterbank):
+                    self.zi_[i] = sosfilt_zi(sos)[:, np.newaxis, :] * X[np.newaxis, :, :1]
+            Xs = np.empty((len(self.filterbank), *X.shape))
+            for i, sos in enumerate(self.filterbank):
+                Xs[i], self.zi_[i] = sosfilt(sos, X, axis=-1, zi=self.zi_[i])
+            self._write(Xs)
+            return Xs
+        self._write(X)
+        return None
+
+    def get_subbands(self, n_samples: Optional[int] = None):
+        """
+        Get the latest window of subband components.
+
+        Parameters
+        ----------
+        n_samples : int
+            Window length, the default is buffer_len.
+
+        Returns
+        -------
+        Xs : ndarray, shape(Nfb, 1, n_channels, n_samples)
+            Individual subband components of the latest window, in chronological order.
+        """
+        n_samples = self.buffer_len if n_samples is None else n_samples
+        if n_samples > min(self.n_samples_, self.buffer_len):
+            raise ValueError("not enough samples in the buffer.")
+        ind = np.arange(self._index - n_samples, self._index) % self.buffer_len
+        X = np.take(self.buffer_, ind, axis=-1)
+        if not self.online:
+            X = np.stack([sosfiltfilt(sos, X, axis=-1) for sos in self.filterbank])
+        return X[:, np.newaxis]
+
+    def _write(self, X: ndarray):
+        n_samples = X.shape[-1]
+        if n_samples >= self.buffer_len:
+            self.buffer_[...] = X[..., n_samples - self.buffer_len:]
+            self._index = 0
+        else:
+            ind = np.arange(self._index, self._index + n_samples) % self.buffer_len
+            self.buffer_[..., ind] = X
+            self._index = (self._index + n_samples) % self.buffer_len
+        self.n_samples_ += n_samples
+
+
 def generate_cca_references(
     freqs: Union[ndarray, int, float],
     srate,
@@ -697,3 +907,65 @@ def sign_flip(u, s, vh=None):
         vh = signs[:, np.newaxis] * vh
 
         return u, s, vh
+
+
+def pearson_features(
+    X: ndarray,
+    templates: ndarray,
+    Us: Optional[ndarray] = None,
+    dtype: Optional[Union[str, np.dtype]] = None,
+) -> ndarray:
+    """Batched pearson correlation between (spatially filtered) trials and templates.
+
+    All trials are projected through all spatial filters at once, the projections are flattened over
+    (n_filters, n_samples) and correlated with the projected templates, which gives the same values as calling
+    scipy.stats.pearsonr for every trial and every template.
+
+    Parameters
+    ----------
+    X : ndarray
+        Test data, shape(n_trials, n_channels, n_samples).
+    templates : ndarray
+        Templates, shape(n_classes, n_channels, n_samples).
+    Us : ndarray, optional
+        Spatial filters. None means no spatial filtering, shape(n_channels, n_filters) for filters shared by all
+        templates, shape(n_classes, n_channels, n_filters) for one set of filters per template and
+        shape(n_trials, n_classes, n_channels, n_filters) for one set of filters per trial and template.
+    dtype : str or dtype, optional
+        Computation dtype, e.g. 'float32' to halve memory traffic in online decoding, default is the input dtype.
+
+    Returns
+    -------
+    corr : ndarray
+        Pearson correlation coefficients, shape(n_trials, n_classes).
+    """
+    X = np.reshape(X, (-1, *X.shape[-2:]))
+    templates = np.reshape(templates, (-1, *templates.shape[-2:]))
+    if dtype is not None:
+        X = X.astype(dtype, copy=False)
+        templates = templates.astype(dtype, copy=False)
+    if Us is None:
+        a = X[:, np.newaxis]
+        b = templates[np.newaxis]
+    else:
+        Us = np.asarray(Us, dtype=X.dtype)
+        if Us.ndim == 2:
+            a = np.einsum("cf,tcs->tfs", Us, X, optimize=True)[:, np.newaxis]
+            b = np.einsum("cf,kcs->kfs", Us, templates, optimize=True)[np.newaxis]
+        elif Us.ndim == 3:
+            a = np.einsum("kcf,tcs->tkfs", Us, X, optimize=True)
+            b = np.einsum("kcf,kcs->kfs", Us, templates, optimize=True)[np.newaxis]
+        elif Us.ndim == 4:
+            a = np.einsum("tkcf,tcs->tkfs", Us, X, optimize=True)
+            b = np.einsum("tkcf,kcs->tkfs", Us, templates, optimize=True)
+        else:
+            raise ValueError("non-supported shape of spatial filters")
+    a = np.reshape(a, (*a.shape[:2], -1))
+    b = np.reshape(b, (*b.shape[:2], -1))
+    a = a - np.mean(a, axis=-1, keepdims=True)
+    b = b - np.mean(b, axis=-1, keepdims=True)
+    norm_a = np.sqrt(np.sum(np.square(a), axis=-1))
+    norm_b = np.sqrt(np.sum(np.square(b), axis=-1))
+    corr = np.matmul(a[..., np.newaxis, :], b[..., np.newaxis])[..., 0, 0]
+    corr = corr / (norm_a * norm_b)
+    return corr
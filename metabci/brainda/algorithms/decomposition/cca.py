@@ -18,7 +18,7 @@ from sklearn.base import BaseEstimator, ClassifierMixin, TransformerMixin
 from sklearn.svm import SVC
 from joblib import Parallel, delayed
 
-from .base import FilterBankSSVEP
+from .base import FilterBankSSVEP, pearson_features
 
 
 def _ged_wong(
@@ -87,6 +87,61 @@ def _scca_feature(X: ndarray, Yf: ndarray, n_components: int = 1):
     return np.array(rhos)
 
 
+def _orth_basis(X: ndarray):
+    """Orthonormal basis of the row space of (batched) signals.
+
+    X: (..., n_channels, n_samples)
+    Q: (..., n_samples, n_channels)
+    """
+    Q, _ = np.linalg.qr(np.swapaxes(X, -1, -2), mode="reduced")
+    return Q
+
+
+def _scca_batch_feature(X: ndarray, Qf: ndarray, n_components: int = 1):
+    """Batched closed-form sCCA.
+
+    The canonical correlations between X and Yf are the singular values of
+    Qx.T @ Qy, where Qx, Qy are orthonormal bases of the (centered) signals.
+    For the first k canonical components, the pearson correlation between the
+    flattened projections used in _scca_feature reduces to
+    sqrt(sum(s[:k]**2) / k), so no (n_samples, n_samples) matrix or GED
+    is needed.
+
+    X: (n_trials, n_channels, n_samples), centered
+    Qf: (n_freqs, n_samples, 2*n_harmonics), from _orth_basis of centered Yf
+    rhos: (n_trials, n_freqs)
+    """
+    Qx = _orth_basis(X)
+    M = np.einsum("tsc,fsh->tfch", Qx, Qf, optimize=True)
+    s = np.linalg.svd(M, compute_uv=False)
+    return _canonical_rhos(s, n_components)
+
+
+def _canonical_rhos(s: ndarray, n_components: int = 1):
+    """Pearson correlation of the first n_components canonical projections
+    from the canonical correlations s (sorted in descending order)."""
+    k = min(n_components, s.shape[-1])
+    return np.sqrt(np.sum(np.square(s[..., :k]), axis=-1) / k)
+
+
+def _scca_batch_kernel(X: ndarray, Yf: ndarray):
+    """Batched sCCA spatial filters for X of every trial against every reference.
+
+    Filters are normalized as in _scca_kernel, i.e. U.T @ X @ X.T @ U = I.
+
+    X: (n_trials, n_channels, n_samples), centered
+    Yf: (n_freqs, n_refs, n_samples), centered
+    U: (n_trials, n_freqs, n_channels, n_components)
+    s: (n_trials, n_freqs, n_components), canonical correlations
+    """
+    Qx, Rx = np.linalg.qr(np.swapaxes(X, -1, -2), mode="reduced")
+    Qy = _orth_basis(Yf)
+    M = np.einsum("tsc,fsh->tfch", Qx, Qy, optimize=True)
+    A, s, _ = np.linalg.svd(M, full_matrices=False)
+    U = np.linalg.solve(Rx[:, np.newaxis], A)
+    return U, s
+
+
 class SCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
     """
     Standard CCA (sCCA).The Canonical Correlation Analysis (CCA) method finds the coefficients of the linear combination
@@ -102,12 +157,15 @@ class SCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         The number of feature dimensions after dimensionality reduction,
         the dimension of the spatial filter, defaults to 1.
     n_jobs : int
-        The number of CPU working cores, default is None.
+        The number of CPU working cores, default is None. The batched transform no longer dispatches
+        trials to joblib, the parameter is kept for compatibility.
 
     Attributes
     ----------
     Yf_ : ndarray
         The reference signal provided, defaults to None.
+    Qf_ : ndarray
+        Orthonormal bases of the centered reference signals, shape(n_fre, n_samples, 2*n_harmonics).
 
     Raises
     ----------
@@ -159,6 +217,7 @@ class SCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         Yf = np.reshape(Yf, (-1, *Yf.shape[-2:]))
         Yf = Yf - np.mean(Yf, axis=-1, keepdims=True)
         self.Yf_ = Yf
+        self.Qf_ = _orth_basis(Yf)
         return self
 
     def transform(self, X: ndarray):
@@ -178,12 +237,7 @@ class SCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         """
         X = np.reshape(X, (-1, *X.shape[-2:]))
         X = X - np.mean(X, axis=-1, keepdims=True)
-        Yf = self.Yf_
-        n_components = self.n_components
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(partial(_scca_feature, n_components=n_components))(a, Yf) for a in X
-        )
-        rhos = np.stack(rhos)
+        rhos = _scca_batch_feature(X, self.Qf_, n_components=self.n_components)
         return rhos
 
     def predict(self, X: ndarray):
@@ -298,24 +352,17 @@ def _itcca_feature(
     method: str = "itcca1",
 ):
     """
-    ItCCA feature extraction
+    ItCCA feature extraction of all trials, X: (n_trials, n_channels, n_samples)
     """
-    rhos = []
+    X = np.reshape(X, (-1, *X.shape[-2:]))
     if method == "itcca1":
-        for Xk in templates:
-            U, V = _scca_kernel(X, Xk)
-            a = U[:, :n_components].T @ X
-            b = V[:, :n_components].T @ Xk
-            a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-            rhos.append(pearsonr(a, b)[0])
+        rhos = _scca_batch_feature(X, _orth_basis(templates), n_components=n_components)
     elif method == "itcca2":
         Us = cast(ndarray, Us)
-        for Xk, U in zip(templates, Us):
-            a = U[:, :n_components].T @ X
-            b = U[:, :n_components].T @ Xk
-            a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-            rhos.append(pearsonr(a, b)[0])
-    return np.array(rhos)
+        rhos = pearson_features(X, templates, Us[..., :n_components])
+    else:
+        raise ValueError("not supported method type")
+    return rhos
 
 
 class ItCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
@@ -419,13 +466,7 @@ class ItCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         Us = None
         if method == "itcca2":
             Us = self.Us_
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(
-                partial(_itcca_feature, Us=Us, n_components=n_components, method=method)
-            )(a, templates)
-            for a in X
-        )
-        rhos = np.stack(rhos)
+        rhos = _itcca_feature(X, templates, Us=Us, n_components=n_components, method=method)
         return rhos
 
     def predict(self, X: ndarray):
@@ -536,13 +577,7 @@ class FBItCCA(FilterBankSSVEP, ClassifierMixin):
 
 
 def _mscca_feature(X: ndarray, templates: ndarray, U: ndarray, n_components: int = 1):
-    rhos = []
-    for Xk in zip(templates):
-        a = U[:, :n_components].T @ X
-        b = U[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rhos.append(pearsonr(a, b)[0])
-    return np.array(rhos)
+    return pearson_features(X, templates, U[:, :n_components])
 
 
 class MsCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
@@ -631,13 +666,7 @@ class MsCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         templates = self.templates_
         n_components = self.n_components
         U = self.U_
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(partial(_mscca_feature, U=U, n_components=n_components))(
-                a, templates
-            )
-            for a in X
-        )
-        rhos = np.stack(rhos)
+        rhos = _mscca_feature(X, templates, U, n_components=n_components)
         return rhos
 
     def predict(self, X: ndarray):
@@ -756,33 +785,23 @@ def _ecca_feature(
             *[_scca_kernel(templates[i], Yf[i]) for i in range(len(templates))]
         )
         Us = np.stack(Us_array)
-    rhos = []
-    for Xk, Y, U3 in zip(templates, Yf, Us):
-        rho_list = []
-        # 14a, 14d
-        U1, V1 = _scca_kernel(X, Y)
-        a = U1[:, :n_components].T @ X
-        b = V1[:, :n_components].T @ Y
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        a = U1[:, :n_components].T @ X
-        b = U1[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        # 14b
-        U2, _ = _scca_kernel(X, Xk)
-        a = U2[:, :n_components].T @ X
-        b = U2[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        # 14c
-        a = U3[:, :n_components].T @ X
-        b = U3[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        rho = np.array(rho_list)
-        rho = np.sum(np.sign(rho) * (rho**2))
-        rhos.append(rho)
+    Us = np.asarray(Us)
+    X = np.reshape(X, (-1, *X.shape[-2:]))
+    # 14a, 14d
+    U1, s1 = _scca_batch_kernel(X, Yf)
+    # 14b
+    U2, _ = _scca_batch_kernel(X, templates)
+    rho = np.stack(
+        [
+            _canonical_rhos(s1, n_components),
+            pearson_features(X, templates, U1[..., :n_components]),
+            pearson_features(X, templates, U2[..., :n_components]),
+            # 14c
+            pearson_features(X, templates, Us[..., :n_components]),
+        ],
+        axis=-1,
+    )
+    rhos = np.sum(np.sign(rho) * (rho**2), axis=-1)
     return rhos
 
 
@@ -871,13 +890,7 @@ class ECCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         Yf = self.Yf_
         Us = self.Us_
         n_components = self.n_components
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(partial(_ecca_feature, Us=Us, n_components=n_components))(
-                a, templates, Yf
-            )
-            for a in X
-        )
-        rhos = np.stack(rhos)
+        rhos = _ecca_feature(X, templates, Yf, Us=Us, n_components=n_components)
         return rhos
 
     def predict(self, X: ndarray):
@@ -1036,28 +1049,21 @@ def _ttcca_feature(
             *[_scca_kernel(templates[i], Yf[i]) for i in range(len(templates))]
         )
         Us = np.stack(Us_array)
-    rhos = []
-    for Xk, Y, U2 in zip(templates, Yf, Us):
-        rho_list = []
-        # rho1
-        U1, V1 = _scca_kernel(X, Y)
-        a = U1[:, :n_components].T @ X
-        b = V1[:, :n_components].T @ Y
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        # rho3
-        a = U1[:, :n_components].T @ X
-        b = U1[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        # rho2
-        a = U2[:, :n_components].T @ X
-        b = U2[:, :n_components].T @ Xk
-        a, b = np.reshape(a, (-1)), np.reshape(b, (-1))
-        rho_list.append(pearsonr(a, b)[0])
-        rho = np.array(rho_list)
-        rho = np.sum(np.sign(rho) * (rho**2))
-        rhos.append(rho)
+    Us = np.asarray(Us)
+    X = np.reshape(X, (-1, *X.shape[-2:]))
+    U1, s1 = _scca_batch_kernel(X, Yf)
+    rho = np.stack(
+        [
+            # rho1
+            _canonical_rhos(s1, n_components),
+            # rho3
+            pearson_features(X, templates, U1[..., :n_components]),
+            # rho2
+            pearson_features(X, templates, Us[..., :n_components]),
+        ],
+        axis=-1,
+    )
+    rhos = np.sum(np.sign(rho) * (rho**2), axis=-1)
     return rhos
 
 
@@ -1147,13 +1153,7 @@ class TtCCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         Yf = self.Yf_
         Us = self.Us_
         n_components = self.n_components
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(partial(_ttcca_feature, Us=Us, n_components=n_components))(
-                a, templates, Yf
-            )
-            for a in X
-        )
-        rhos = np.stack(rhos)
+        rhos = _ttcca_feature(X, templates, Yf, Us=Us, n_components=n_components)
         return rhos
 
     def predict(self, X: ndarray):
@@ -1705,13 +1705,20 @@ def _trca_kernel(X: ndarray):
     X: (n_trials, n_channels, n_samples)
     """
     X = np.reshape(X, (-1, *X.shape[-2:]))
-    M, C, N = X.shape
-    n_components = C
-    P = vstack([identity(N) for _ in range(M)])
-    P = P @ P.T
-    Z = np.hstack(X).T  # type: ignore
-    _, U = _ged_wong(Z, None, P, n_components=n_components)  # U for X
-    return U
+    # inter-trial covariance from the trial sum, equivalent to stacking
+    # identity projections but without any (M*N, M*N) operator
+    Xs = np.sum(X, axis=0)
+    S = Xs @ Xs.T
+    # within-trial covariance
+    Q = np.einsum("mcn,mdn->cd", X, X, optimize=True)
+    return _trca_ged(S, Q)
+
+
+def _trca_ged(S: ndarray, Q: ndarray):
+    """Solve S @ U = Q @ U @ D with eigenvectors sorted in descending order."""
+    D, U = eigh(S, Q)
+    ind = np.argsort(D)[::-1]
+    return U[:, ind]
 
 
 def _trca_feature(
@@ -1721,23 +1728,12 @@ def _trca_feature(
     n_components: int = 1,
     ensemble: bool = True,
 ):
-    rhos = []
     if not ensemble:
-        for Xk, U in zip(templates, Us):
-            a = U[:, :n_components].T @ X
-            b = U[:, :n_components].T @ Xk
-            a = np.reshape(a, (-1))
-            b = np.reshape(b, (-1))
-            rhos.append(pearsonr(a, b)[0])
+        rhos = pearson_features(X, templates, Us[..., :n_components])
     else:
         U = Us[:, :, :n_components]
         U = np.concatenate(U, axis=-1)
-        for Xk in templates:
-            a = U.T @ X
-            b = U.T @ Xk
-            a = np.reshape(a, (-1))
-            b = np.reshape(b, (-1))
-            rhos.append(pearsonr(a, b)[0])
+        rhos = pearson_features(X, templates, U)
     return rhos
 
 
@@ -1799,7 +1795,11 @@ class TRCA(BaseEstimator, TransformerMixin, ClassifierMixin):
             [np.mean(X[y == label], axis=0) for label in self.classes_]
         )
 
-        self.Us_ = np.stack([_trca_kernel(X[y == label]) for label in self.classes_])
+        self.Us_ = np.stack(
+            Parallel(n_jobs=self.n_jobs)(
+                delayed(_trca_kernel)(X[y == label]) for label in self.classes_
+            )
+        )
         return self
 
     def transform(self, X: ndarray):
@@ -1822,15 +1822,9 @@ class TRCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         templates = self.templates_
         Us = self.Us_
         ensemble = self.ensemble
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(
-                partial(
-                    _trca_feature, Us=Us, n_components=n_components, ensemble=ensemble
-                )
-            )(a, templates)
-            for a in X
+        rhos = _trca_feature(
+            X, templates, Us, n_components=n_components, ensemble=ensemble
         )
-        rhos = np.stack(rhos)
         return rhos
 
     def predict(self, X: ndarray):
@@ -1972,14 +1966,13 @@ def _trcar_kernel(X: ndarray, Yf: ndarray):
     Yf: (n_harmonics, n_samples)
     """
     X = np.reshape(X, (-1, *X.shape[-2:]))
-    M, C, N = X.shape
-    n_components = C
-    P = vstack([identity(N) for _ in range(M)])
     Q, R = qr(Yf.T, mode="economic")
-    P = P @ Q @ Q.T @ P.T
-    Z = np.hstack(X).T  # type: ignore
-    _, U = _ged_wong(Z, None, P, n_components=n_components)  # U for X
-    return U
+    # inter-trial covariance of the trial sum projected onto the reference subspace
+    Xs = np.sum(X, axis=0) @ Q
+    S = Xs @ Xs.T
+    # within-trial covariance
+    Q = np.einsum("mcn,mdn->cd", X, X, optimize=True)
+    return _trca_ged(S, Q)
 
 
 class TRCAR(BaseEstimator, TransformerMixin, ClassifierMixin):
@@ -2063,10 +2056,10 @@ class TRCAR(BaseEstimator, TransformerMixin, ClassifierMixin):
         self.Yf_ = Yf
 
         self.Us_ = np.stack(
-            [
-                _trcar_kernel(X[y == label], self.Yf_[i])
+            Parallel(n_jobs=self.n_jobs)(
+                delayed(_trcar_kernel)(X[y == label], self.Yf_[i])
                 for i, label in enumerate(self.classes_)
-            ]
+            )
         )
         return self
 
@@ -2090,15 +2083,9 @@ class TRCAR(BaseEstimator, TransformerMixin, ClassifierMixin):
         templates = self.templates_
         Us = self.Us_
         ensemble = self.ensemble
-        rhos = Parallel(n_jobs=self.n_jobs)(
-            delayed(
-                partial(
-                    _trca_feature, Us=Us, n_components=n_components, ensemble=ensemble
-                )
-            )(a, templates)
-            for a in X
+        rhos = _trca_feature(
+            X, templates, Us, n_components=n_components, ensemble=ensemble
         )
-        rhos = np.stack(rhos)
         return rhos
 
     def predict(self, X: ndarray):
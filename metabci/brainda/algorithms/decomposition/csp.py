@@ -49,14 +49,39 @@ def csp_kernel(X: ndarray, y: ndarray) -> Tuple[ndarray, ndarray, ndarray]:
     .. [1] Ramoser H, Muller-Gerking J, Pfurtscheller G. Optimal spatial filtering of single trial EEG during imagined hand
            movement[J]. IEEE transactions on rehabilitation engineering, 2000, 8(4): 441-446.
     """
-    X, y = np.copy(X), np.copy(y)
+    return csp_kernel_covariances(covariances(X), y)
+
+
+def csp_kernel_covariances(C: ndarray, y: ndarray) -> Tuple[ndarray, ndarray, ndarray]:
+    """The kernel in CSP algorithm computed from precomputed trial covariances.
+
+    Parameters
+    ----------
+    C: ndarray
+        trial covariances of eeg data, shape (n_trials, n_channels, n_channels), as returned by covariances.
+    y: ndarray
+        labels of C, shape (n_trials,).
+
+    Returns
+    -------
+    W: ndarray
+        Spatial filters, shape (n_channels, n_filters).
+    D: ndarray
+        Eigenvalues of spatial filters, shape (n_filters,).
+    A: ndarray
+        Spatial patterns, shape (n_channels, n_patterns).
+
+    See Also
+    --------
+    csp_kernel
+    """
+    y = np.asarray(y)
     labels = np.unique(y)
-    X = X - np.mean(X, axis=-1, keepdims=True)
     if len(labels) != 2:
         raise ValueError("the current kernel is for 2-class problem.")
 
-    C1 = covariances(X[y == labels[0]])
-    C2 = covariances(X[y == labels[1]])
+    C1 = C[y == labels[0]]
+    C2 = C[y == labels[1]]
 
     # # trace normalization
     # # this operation equals to trial normalization
@@ -106,22 +131,96 @@ def csp_feature(W: ndarray, X: ndarray, n_components: int = 2) -> ndarray:
     .. [1] Ramoser H, Muller-Gerking J, Pfurtscheller G. Optimal spatial filtering of single trial EEG during imagined hand
            movement[J]. IEEE transactions on rehabilitation engineering, 2000, 8(4): 441-446.
     """
-    W, X = np.copy(W), np.copy(X)
     max_components = W.shape[1]
     if n_components > max_components:
         raise ValueError("n_components should less than the number of channels")
 
-    eps = np.finfo(X.dtype).eps
+    X = np.asarray(X)
     X = X - np.mean(X, axis=-1, keepdims=True)
     # normalized variance
     features = np.mean(np.square(np.matmul(W[:, :n_components].T, X)), axis=-1)
+    return _log_variance(features)
+
+
+def csp_feature_covariances(W: ndarray, C: ndarray, n_components: int = 2) -> ndarray:
+    """Return CSP features computed from precomputed trial covariances.
+
+    The variance of the spatially filtered signal is diag(W^T C W), so the samples are not touched again.
+
+    Parameters
+    ----------
+    W : ndarray
+        spatial filters from csp_kernel, shape (n_channels, n_filters)
+    C : ndarray
+        trial covariances of eeg data, shape (n_trials, n_channels, n_channels), as returned by covariances.
+    n_components : int, optional
+        the first k components to use, usually even number, by default 2
+
+    Returns
+    -------
+    ndarray
+        features of shape (n_trials, n_features)
+
+    Raises
+    ------
+    ValueError
+        n_components should less than the number of channels
+
+    See Also
+    --------
+    csp_feature
+    """
+    max_components = W.shape[1]
+    if n_components > max_components:
+        raise ValueError("n_components should less than the number of channels")
+
+    W = W[:, :n_components]
+    features = np.sum(np.matmul(C, W) * W, axis=-2)
+    return _log_variance(features)
+
+
+def _log_variance(features: ndarray) -> ndarray:
+    """Normalize the variances of the filtered signals and take the log."""
+    eps = np.finfo(features.dtype).eps
     features = features / (np.sum(features, axis=-1, keepdims=True) + eps)
     # log-transformation
     features = np.log(np.clip(features, eps, None))
     return features
 
 
-def _rjd(X, eps=1e-9, n_iter_max=1000):
+def _jacobi_rounds(n_channels):
+    """Parallel (round-robin) ordering of the Jacobi pairs.
+
+    Each round holds disjoint pairs, so their rotations commute and can be applied at once,
+    and the rounds of a sweep cover every pair (p, q), p < q, exactly once.
+
+    Parameters
+    ----------
+    n_channels : int
+        Number of channels.
+
+    Returns
+    -------
+    rounds : list of (ndarray, ndarray)
+        Indices p and q of the pairs of each round.
+    """
+    idx = list(range(n_channels)) + ([-1] if n_channels % 2 else [])
+    n = len(idx)
+    rounds = []
+    for _ in range(n - 1):
+        pairs = [
+            (min(idx[i], idx[n - 1 - i]), max(idx[i], idx[n - 1 - i]))
+            for i in range(n // 2)
+            if idx[i] >= 0 and idx[n - 1 - i] >= 0
+        ]
+        if pairs:
+            p, q = np.array(pairs).T
+            rounds.append((p, q))
+        idx = [idx[0], idx[-1]] + idx[1:-1]
+    return rounds
+
+
+def _rjd(X, eps=1e-9, n_iter_max=1000, return_info=False):
     """Approximate joint diagonalization based on jacobi angle.
 
     Parameters
@@ -132,6 +231,8 @@ def _rjd(X, eps=1e-9, n_iter_max=1000):
         Tolerance for stopping criterion (default 1e-8).
     n_iter_max : int, optional
         The maximum number of iteration to reach convergence (default 1000).
+    return_info : bool, optional
+        Whether to also return the convergence information (default False).
 
     Returns
     -------
@@ -139,12 +240,15 @@ def _rjd(X, eps=1e-9, n_iter_max=1000):
         The diagonalizer, shape (n_channels, n_filters), usually n_filters == n_channels.
     D : ndarray
         The set of quasi diagonal matrices, shape (n_trials, n_channels, n_channels).
+    info : dict
+        Only if return_info is True, n_iter (number of sweeps) and converged.
 
     Notes
     -----
     This is a direct implementation of the Cardoso AJD algorithm [1]_ used in
     JADE. The code is a translation of the matlab code provided in the author
-    website.
+    website, the sweeps follow the parallel Jacobi ordering so that the rotations
+    of all the disjoint pairs of a round are computed and applied at once.
 
     References
     ----------
@@ -153,12 +257,13 @@ def _rjd(X, eps=1e-9, n_iter_max=1000):
 
     """
 
-    # reshape input matrix
-    A = np.concatenate(X, 0).T
+    # A[:, i*m:(i+1)*m] of the reference implementation is stored as A[i]
+    A = np.array(np.swapaxes(X, -1, -2), dtype=np.float64)
 
     # init variables
-    m, nm = A.shape
+    m = A.shape[-1]
     V = np.eye(m)
+    rounds = _jacobi_rounds(m)
     encore = True
     k = 0
 
@@ -167,39 +272,39 @@ def _rjd(X, eps=1e-9, n_iter_max=1000):
         k += 1
         if k > n_iter_max:
             break
-        for p in range(m - 1):
-            for q in range(p + 1, m):
-
-                Ip = np.arange(p, nm, m)
-                Iq = np.arange(q, nm, m)
-
-                # computation of Givens angle
-                g = np.array([A[p, Ip] - A[q, Iq], A[p, Iq] + A[q, Ip]])
-                gg = np.dot(g, g.T)
-                ton = gg[0, 0] - gg[1, 1]
-                toff = gg[0, 1] + gg[1, 0]
-                theta = 0.5 * np.arctan2(toff, ton + np.sqrt(ton * ton + toff * toff))
-                c = np.cos(theta)
-                s = np.sin(theta)
-                encore = encore | (np.abs(s) > eps)
-                if np.abs(s) > eps:
-                    tmp = A[:, Ip].copy()
-                    A[:, Ip] = c * A[:, Ip] + s * A[:, Iq]
-                    A[:, Iq] = c * A[:, Iq] - s * tmp
-
-                    tmp = A[p, :].copy()
-                    A[p, :] = c * A[p, :] + s * A[q, :]
-                    A[q, :] = c * A[q, :] - s * tmp
-
-                    tmp = V[:, p].copy()
-                    V[:, p] = c * V[:, p] + s * V[:, q]
-                    V[:, q] = c * V[:, q] - s * tmp
-
-    D = np.reshape(A, (m, int(nm / m), m)).transpose(1, 0, 2)
-    return V, D
-
-
-def _ajd_pham(X, eps=1e-9, n_iter_max=1000):
+        for p, q in rounds:
+            # computation of Givens angles
+            g0 = A[:, p, p] - A[:, q, q]
+            g1 = A[:, p, q] + A[:, q, p]
+            ton = np.sum(g0 * g0, axis=0) - np.sum(g1 * g1, axis=0)
+            toff = 2 * np.sum(g0 * g1, axis=0)
+            theta = 0.5 * np.arctan2(toff, ton + np.sqrt(ton * ton + toff * toff))
+            c = np.cos(theta)
+            s = np.sin(theta)
+            rotate = np.abs(s) > eps
+            if not np.any(rotate):
+                continue
+            encore = True
+            p, q, c, s = p[rotate], q[rotate], c[rotate], s[rotate]
+
+            Ap, Aq = A[:, :, p], A[:, :, q]
+            A[:, :, p] = c * Ap + s * Aq
+            A[:, :, q] = c * Aq - s * Ap
+
+            Ap, Aq = A[:, p, :], A[:, q, :]
+            A[:, p, :] = c[:, np.newaxis] * Ap + s[:, np.newaxis] * Aq
+            A[:, q, :] = c[:, np.newaxis] * Aq - s[:, np.newaxis] * Ap
+
+            Vp, Vq = V[:, p], V[:, q]
+            V[:, p] = c * Vp + s * Vq
+            V[:, q] = c * Vq - s * Vp
+
+    if return_info:
+        return V, A, {"n_iter": min(k, n_iter_max), "converged": not encore}
+    return V, A
+
+
+def _ajd_pham(X, eps=1e-9, n_iter_max=1000, return_info=False):
     """Approximate joint diagonalization based on pham's algorithm.
 
     Parameters
@@ -210,6 +315,8 @@ def _ajd_pham(X, eps=1e-9, n_iter_max=1000):
         Tolerance for stoping criterion (default 1e-6).
     n_iter_max : int, optional
         The maximum number of iteration to reach convergence (default 1000).
+    return_info : bool, optional
+        Whether to also return the convergence information (default False).
 
     Returns
     -------
@@ -217,10 +324,18 @@ def _ajd_pham(X, eps=1e-9, n_iter_max=1000):
         The diagonalizer, shape (n_channels, n_filters), usually n_filters == n_channels.
     D : ndarray
         The set of quasi diagonal matrices, shape (n_trials, n_channels, n_channels).
+    info : dict
+        Only if return_info is True, n_iter (number of sweeps), converged and decrease (criterion
+        decrease of the last sweep).
 
     Notes
     -----
-    This is a direct implementation of the PHAM's AJD algorithm [1]_.
+    This is a direct implementation of the PHAM's AJD algorithm [1]_, the sweeps follow the
+    parallel Jacobi ordering so that the transforms of all the disjoint pairs of a round are
+    computed and applied at once. The reference implementation visits the pairs (i, j), i < j,
+    one at a time in lexicographic order instead. Both orders converge to the same diagonalizer,
+    but only within eps and up to the order, sign and scale of the columns of V, so V and D are
+    not the values returned by versions using the sequential sweep.
 
     References
     ----------
@@ -231,60 +346,64 @@ def _ajd_pham(X, eps=1e-9, n_iter_max=1000):
     # Adapted from http://github.com/alexandrebarachant/pyRiemann
     n_epochs = X.shape[0]
 
-    # Reshape input matrix
-    A = np.concatenate(X, axis=0).T
+    # A[:, i*n:(i+1)*n] of the reference implementation is stored as A[i]
+    A = np.array(np.swapaxes(X, -1, -2), dtype=np.float64)
 
     # Init variables
-    n_times, n_m = A.shape
+    n_times = A.shape[-1]
     V = np.eye(n_times)
     epsilon = n_times * (n_times - 1) * eps
+    rounds = [(q, p) for p, q in _jacobi_rounds(n_times)]
+    converged = False
+    decr = 0
 
     for it in range(n_iter_max):
         decr = 0
-        for ii in range(1, n_times):
-            for jj in range(ii):
-                Ii = np.arange(ii, n_m, n_times)
-                Ij = np.arange(jj, n_m, n_times)
-
-                c1 = A[ii, Ii]
-                c2 = A[jj, Ij]
-
-                g12 = np.mean(A[ii, Ij] / c1)
-                g21 = np.mean(A[ii, Ij] / c2)
-
-                omega21 = np.mean(c1 / c2)
-                omega12 = np.mean(c2 / c1)
-                omega = np.sqrt(omega12 * omega21)
-
-                tmp = np.sqrt(omega21 / omega12)
-                tmp1 = (tmp * g12 + g21) / (omega + 1)
-                tmp2 = (tmp * g12 - g21) / max(omega - 1, 1e-9)
-
-                h12 = tmp1 + tmp2
-                h21 = np.conj((tmp1 - tmp2) / tmp)
-
-                decr += n_epochs * (g12 * np.conj(h12) + g21 * h21) / 2.0
-
-                tmp = 1 + 1.0j * 0.5 * np.imag(h12 * h21)
-                tmp = np.real(tmp + np.sqrt(tmp**2 - h12 * h21))
-                tau = np.array([[1, -h12 / tmp], [-h21 / tmp, 1]])
-
-                A[[ii, jj], :] = np.dot(tau, A[[ii, jj], :])
-                tmp = np.c_[A[:, Ii], A[:, Ij]]
-                tmp = np.reshape(tmp, (n_times * n_epochs, 2), order="F")
-                tmp = np.dot(tmp, tau.T)
-
-                tmp = np.reshape(tmp, (n_times, n_epochs * 2), order="F")
-                A[:, Ii] = tmp[:, :n_epochs]
-                A[:, Ij] = tmp[:, n_epochs:]
-                V[[ii, jj], :] = np.dot(tau, V[[ii, jj], :])
+        for ii, jj in rounds:
+            c1 = A[:, ii, ii]
+            c2 = A[:, jj, jj]
+            cij = A[:, ii, jj]
+
+            g12 = np.mean(cij / c1, axis=0)
+            g21 = np.mean(cij / c2, axis=0)
+
+            omega21 = np.mean(c1 / c2, axis=0)
+            omega12 = np.mean(c2 / c1, axis=0)
+            omega = np.sqrt(omega12 * omega21)
+
+            tmp = np.sqrt(omega21 / omega12)
+            tmp1 = (tmp * g12 + g21) / (omega + 1)
+            tmp2 = (tmp * g12 - g21) / np.maximum(omega - 1, 1e-9)
+
+            h12 = tmp1 + tmp2
+            h21 = np.conj((tmp1 - tmp2) / tmp)
+
+            decr += np.sum(n_epochs * (g12 * np.conj(h12) + g21 * h21) / 2.0)
+
+            tmp = 1 + 1.0j * 0.5 * np.imag(h12 * h21)
+            tmp = np.real(tmp + np.sqrt(tmp**2 - h12 * h21))
+            t12 = -h12 / tmp
+            t21 = -h21 / tmp
+
+            # rows ii and jj of the stacked matrices and of V: [[1, t12], [t21, 1]] @ rows
+            Ai, Aj = A[:, :, ii], A[:, :, jj]
+            A[:, :, ii] = Ai + t12 * Aj
+            A[:, :, jj] = t21 * Ai + Aj
+            Ai, Aj = A[:, ii, :], A[:, jj, :]
+            A[:, ii, :] = Ai + t12[:, np.newaxis] * Aj
+            A[:, jj, :] = t21[:, np.newaxis] * Ai + Aj
+            Vi, Vj = V[ii, :], V[jj, :]
+            V[ii, :] = Vi + t12[:, np.newaxis] * Vj
+            V[jj, :] = t21[:, np.newaxis] * Vi + Vj
         if decr < epsilon:
+            converged = True
             break
-    D = np.reshape(A, (n_times, -1, n_times)).transpose(1, 0, 2)
-    return V.T, D
+    if return_info:
+        return V.T, A, {"n_iter": it + 1, "converged": converged, "decrease": float(np.real(decr))}
+    return V.T, A
 
 
-def _uwedge(X, init=None, eps=1e-9, n_iter_max=1000):
+def _uwedge(X, init=None, eps=1e-9, n_iter_max=1000, return_info=False):
     """Approximate joint diagonalization algorithm UWEDGE.
 
     Parameters
@@ -297,6 +416,8 @@ def _uwedge(X, init=None, eps=1e-9, n_iter_max=1000):
         Tolerance for stoping criterion (default 1e-7).
     n_iter_max : int
         The maximum number of iteration to reach convergence (default 1000).
+    return_info : bool, optional
+        Whether to also return the convergence information (default False).
 
     Returns
     -------
@@ -304,12 +425,15 @@ def _uwedge(X, init=None, eps=1e-9, n_iter_max=1000):
         The diagonalizer, shape (n_filters, n_channels), usually n_filters == n_channels.
     D : ndarray
         The set of quasi diagonal matrices, shape (n_trials, n_channels, n_channels).
+    info : dict
+        Only if return_info is True, n_iter, converged and crit (off-diagonal criterion).
 
     Notes
     -----
     Uniformly Weighted Exhaustive Diagonalization using Gauss iteration
     (U-WEDGE). Implementation of the AJD algorithm by Tichavsky and Yeredor [1]_ [2]_.
-    This is a translation from the matlab code provided by the authors.
+    This is a translation from the matlab code provided by the authors, with the loops over
+    the matrices replaced by stacked matrix products.
 
     References
     ----------
@@ -321,59 +445,45 @@ def _uwedge(X, init=None, eps=1e-9, n_iter_max=1000):
     """
     L, d, _ = X.shape
 
-    # reshape input matrix
-    M = np.concatenate(X, 0).T
-
     # init variables
-    d, Md = M.shape
     iteration = 0
     improve = 10
 
     if init is None:
-        E, H = np.linalg.eig(M[:, 0:d])
+        E, H = np.linalg.eig(X[0].T)
         W_est = np.dot(np.diag(1.0 / np.sqrt(np.abs(E))), H.T)
     else:
         W_est = init
 
-    Ms = np.array(M)
-    Rs = np.zeros((d, L))
-
-    for k in range(L):
-        ini = k * d
-        Il = np.arange(ini, ini + d)
-        M[:, Il] = 0.5 * (M[:, Il] + M[:, Il].T)
-        Ms[:, Il] = np.dot(np.dot(W_est, M[:, Il]), W_est.T)
-        Rs[:, k] = np.diag(Ms[:, Il])
+    M = 0.5 * (X + np.swapaxes(X, -1, -2))
+    Ms = W_est @ M @ W_est.T
+    Rs = np.diagonal(Ms, axis1=-2, axis2=-1).T
 
     crit = np.sum(Ms**2) - np.sum(Rs**2)
     while (improve > eps) & (iteration < n_iter_max):
         B = np.dot(Rs, Rs.T)
-        C1 = np.zeros((d, d))
-        for i in range(d):
-            C1[:, i] = np.sum(Ms[:, i:Md:d] * Rs, axis=1)
+        C1 = np.einsum("kji,jk->ji", Ms, Rs)
 
         D0 = B * B.T - np.outer(np.diag(B), np.diag(B))
         A0 = (C1 * B - np.dot(np.diag(np.diag(B)), C1.T)) / (D0 + np.eye(d))
         A0 += np.eye(d)
         W_est = np.linalg.solve(A0, W_est)
 
-        Raux = np.dot(np.dot(W_est, M[:, 0:d]), W_est.T)
+        Raux = np.dot(np.dot(W_est, M[0]), W_est.T)
         aux = 1.0 / np.sqrt(np.abs(np.diag(Raux)))
         W_est = np.dot(np.diag(aux), W_est)
 
-        for k in range(L):
-            ini = k * d
-            Il = np.arange(ini, ini + d)
-            Ms[:, Il] = np.dot(np.dot(W_est, M[:, Il]), W_est.T)
-            Rs[:, k] = np.diag(Ms[:, Il])
+        Ms = W_est @ M @ W_est.T
+        Rs = np.diagonal(Ms, axis1=-2, axis2=-1).T
 
         crit_new = np.sum(Ms**2) - np.sum(Rs**2)
         improve = np.abs(crit_new - crit)
         crit = crit_new
         iteration += 1
 
-    D = np.reshape(Ms, (d, L, d)).transpose(1, 0, 2)
-    return W_est.T, D
+    if return_info:
+        return W_est.T, Ms, {"n_iter": iteration, "converged": bool(improve <= eps), "crit": crit}
+    return W_est.T, Ms
 
 
 ajd_methods = {"rjd": _rjd, "ajd_pham": _ajd_pham, "uwedge": _uwedge}
@@ -405,7 +515,7 @@ def _check_ajd_method(method):
     return method
 
 
-def ajd(X: ndarray, method: str = "uwedge") -> Tuple[ndarray, ndarray]:
+def ajd(X: ndarray, method: str = "uwedge", return_info: bool = False):
     """Wrapper of AJD methods.
 
     Parameters
@@ -414,6 +524,9 @@ def ajd(X: ndarray, method: str = "uwedge") -> Tuple[ndarray, ndarray]:
         Input covariance matrices, shape (n_trials, n_channels, n_channels)
     method : str, optional
         AJD method (default uwedge).
+    return_info : bool, optional
+        Whether to also return the convergence information of the method (default False),
+        a callable method must then accept return_info too.
 
     Returns
     -------
@@ -421,13 +534,20 @@ def ajd(X: ndarray, method: str = "uwedge") -> Tuple[ndarray, ndarray]:
         The diagonalizer, shape (n_channels, n_filters), usually n_filters == n_channels.
     D : ndarray
         The mean of quasi diagonal matrices, shape (n_channels,).
+    info : dict
+        Only if return_info is True, at least n_iter and converged.
     """
     method_func = _check_ajd_method(method)
-    V, D = method_func(X)
+    if return_info:
+        V, D, info = method_func(X, return_info=True)
+    else:
+        V, D = method_func(X)
     D = np.diag(np.mean(D, axis=0))
     ind = np.argsort(D)[::-1]
     D = D[ind]
     V = V[:, ind]
+    if return_info:
+        return V, D, info
     return V, D
 
 
@@ -461,16 +581,47 @@ def gw_csp_kernel(
     .. [1] Grosse-Wentrup, Moritz, and Martin Buss. "Multiclass common spatial patterns and information theoretic feature
            extraction." Biomedical Engineering, IEEE Transactions on 55, no. 8 (2008): 1991-2000.
     """
-    X, y = np.copy(X), np.copy(y)
+    return gw_csp_kernel_covariances(covariances(X), y, ajd_method=ajd_method)
+
+
+def gw_csp_kernel_covariances(
+    C: ndarray, y: ndarray, ajd_method: str = "uwedge"
+) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+    """Grosse-Wentrup AJD method computed from precomputed trial covariances.
+
+    Parameters
+    ----------
+    C : ndarray
+        trial covariances of eeg data, shape (n_trials, n_channels, n_channels), as returned by covariances.
+    y : ndarray
+        labels, shape (n_trials).
+    ajd_method : str, optional
+        ajd methods, 'uwedge' 'rjd' and 'ajd_pham', by default 'uwedge'.
+
+    Returns
+    -------
+    W: ndarray
+        Spatial filters, shape (n_channels, n_filters).
+    D: ndarray
+        Eigenvalues of spatial filters, shape (n_filters,).
+    A: ndarray
+        Spatial patterns, shape (n_channels, n_patterns).
+    mutual_info: ndarray
+        Mutual informaiton values, shape (n_filters).
+
+    See Also
+    --------
+    gw_csp_kernel
+    """
+    y = np.asarray(y)
     labels = np.unique(y)
-    X = X - np.mean(X, axis=-1, keepdims=True)
 
     Cx_list = []
     for label in labels:
-        C = covariances(X[y == label])
+        C_label = C[y == label]
         # trace normalization
-        C = C / np.trace(C, axis1=-1, axis2=-2)[:, np.newaxis, np.newaxis]
-        Cx_list.append(np.mean(C, axis=0))
+        C_label = C_label / np.trace(C_label, axis1=-1, axis2=-2)[:, np.newaxis, np.newaxis]
+        Cx_list.append(np.mean(C_label, axis=0))
     Cx = np.stack(Cx_list)
     W, D = ajd(Cx, method=ajd_method)
     # Ctot = np.mean(Cx, axis=0)
@@ -533,14 +684,21 @@ class CSP(BaseEstimator, TransformerMixin):
         Spatial pattern
     best_n_components : int
         If the number of spatial filters is not set, the optimal number of choices is calculated automatically.
+    precomputed : bool
+        If True, fit and transform take the trial covariances returned by covariances, shape
+        (n_trials, n_channels, n_channels), instead of the signals, by default False.
 
     """
 
     def __init__(
-        self, n_components: Optional[int] = None, max_components: Optional[int] = None
+        self,
+        n_components: Optional[int] = None,
+        max_components: Optional[int] = None,
+        precomputed: bool = False,
     ):
         self.n_components = n_components
         self.max_components = max_components
+        self.precomputed = precomputed
 
     def fit(self, X: ndarray, y: ndarray):
         """ model training
@@ -554,7 +712,10 @@ class CSP(BaseEstimator, TransformerMixin):
 
         """
         self.classes_ = np.unique(y)
-        self.W_, self.D_, self.A_ = csp_kernel(X, y)
+        if self.precomputed:
+            self.W_, self.D_, self.A_ = csp_kernel_covariances(X, y)
+        else:
+            self.W_, self.D_, self.A_ = csp_kernel(X, y)
         # resorting with 0.5 threshold
         self.D_ = np.abs(self.D_ - 0.5)
         ind = np.argsort(self.D_, axis=-1)[::-1]
@@ -562,7 +723,9 @@ class CSP(BaseEstimator, TransformerMixin):
 
         # auto-tuning
         if self.n_components is None:
-            estimator = make_pipeline(*[CSP(n_components=self.n_components), SVC()])
+            estimator = make_pipeline(
+                *[CSP(n_components=self.n_components, precomputed=self.precomputed), SVC()]
+            )
             if self.max_components is None:
                 params = {"csp__n_components": np.arange(1, self.W_.shape[1] + 1)}
             else:
@@ -601,6 +764,8 @@ class CSP(BaseEstimator, TransformerMixin):
         n_components = (
             self.best_n_components_ if self.n_components is None else self.n_components
         )
+        if self.precomputed:
+            return csp_feature_covariances(self.W_, X, n_components=n_components)
         return csp_feature(self.W_, X, n_components=n_components)
 
 
@@ -644,6 +809,9 @@ class MultiCSP(BaseEstimator, TransformerMixin):
         Spatial pattern
     best_n_components : int
         If the number of spatial filters is not set, the optimal number of choices is calculated automatically.
+    precomputed : bool
+        If True, fit and transform take the trial covariances returned by covariances, shape
+        (n_trials, n_channels, n_channels), instead of the signals, by default False.
 
     Raises
     ----------
@@ -663,11 +831,13 @@ class MultiCSP(BaseEstimator, TransformerMixin):
         max_components: Optional[int] = None,
         multiclass: str = "ovr",
         ajd_method: str = "uwedge",
+        precomputed: bool = False,
     ):
         self.n_components = n_components
         self.max_components = max_components
         self.multiclass = multiclass
         self.ajd_method = ajd_method
+        self.precomputed = precomputed
 
     def fit(self, X: ndarray, y: ndarray):
         """ model training
@@ -689,6 +859,7 @@ class MultiCSP(BaseEstimator, TransformerMixin):
                         CSP(
                             n_components=self.n_components,
                             max_components=self.max_components,
+                            precomputed=self.precomputed,
                         ),
                         SVC(),
                     ]
@@ -704,6 +875,7 @@ class MultiCSP(BaseEstimator, TransformerMixin):
                         CSP(
                             n_components=self.n_components,
                             max_components=self.max_components,
+                            precomputed=self.precomputed,
                         ),
                         SVC(),
                     ]
@@ -717,7 +889,8 @@ class MultiCSP(BaseEstimator, TransformerMixin):
             self.estimator_.fit(X, y)
 
         elif self.multiclass == "grosse-wentrup":
-            self.W_, _, self.A_, self.mutualinfo_values_ = gw_csp_kernel(
+            kernel = gw_csp_kernel_covariances if self.precomputed else gw_csp_kernel
+            self.W_, _, self.A_, self.mutualinfo_values_ = kernel(
                 X, y, ajd_method=self.ajd_method
             )
             if self.n_components is None:
@@ -727,6 +900,7 @@ class MultiCSP(BaseEstimator, TransformerMixin):
                             n_components=self.n_components,
                             multiclass="grosse-wentrup",
                             ajd_method=self.ajd_method,
+                            precomputed=self.precomputed,
                         ),
                         SVC(),
                     ]
@@ -777,7 +951,10 @@ class MultiCSP(BaseEstimator, TransformerMixin):
                 if self.n_components is None
                 else self.n_components
             )
-            features = csp_feature(self.W_, X, n_components=n_components)
+            if self.precomputed:
+                features = csp_feature_covariances(self.W_, X, n_components=n_components)
+            else:
+                features = csp_feature(self.W_, X, n_components=n_components)
         else:
             features = np.concatenate(
                 [est[0].transform(X) for est in self.estimator_.estimators_], axis=-1
@@ -884,7 +1061,40 @@ class SPoC(BaseEstimator, TransformerMixin):
         return csp_feature(self.W_, X, n_components=n_components)
 
 
-class FBCSP(FilterBank):
+class _SharedCovariancesFilterBank(FilterBank):
+    """ Filter bank base shared by FBCSP and FBMultiCSP.
+
+    If the estimator's shared_covariances is True, the trial covariances of each band are computed once and the
+    spatial filters, the log-variance features diag(W^T C W) and the mutual information selection are all derived
+    from them instead of each step recomputing them from the subband signals.
+
+    """
+
+    shared_covariances: bool
+
+    def transform_bands(self, X: ndarray):
+        """ Filter X through the filter bank, and compute the trial covariances of each band once if
+        shared_covariances is True.
+
+        Parameters
+        ----------
+        X: ndarray
+            Test signal, shape(n_trials, n_channels, n_samples).
+
+        Returns
+        -------
+        Xs: ndarray
+            Subband components, shape(Nfb, n_trials, n_channels, n_samples), or their covariances,
+            shape(Nfb, n_trials, n_channels, n_channels).
+
+        """
+        Xs = self.transform_filterbank(X)
+        if self.shared_covariances:
+            Xs = covariances(Xs)
+        return Xs
+
+
+class FBCSP(_SharedCovariancesFilterBank):
     """
     FBCSP.
 
@@ -907,6 +1117,8 @@ class FBCSP(FilterBank):
         Multiple classification strategy, one to many.
     filterbank : Optional, [List,[ndarray]]
         Spatial filter band division range.
+    shared_covariances : bool
+        If True, fit and transform on the trial covariances of each band, see transform_bands, by default False.
 
     Attributes
     ----------
@@ -950,13 +1162,19 @@ class FBCSP(FilterBank):
         max_components: Optional[int] = None,
         n_mutualinfo_components: Optional[int] = None,
         filterbank: List[ndarray] = [],
+        shared_covariances: bool = False,
     ):
         self.n_components = n_components
         self.max_components = max_components
         self.n_mutualinfo_components = n_mutualinfo_components
         self.filterbank = filterbank
+        self.shared_covariances = shared_covariances
         super().__init__(
-            CSP(n_components=n_components, max_components=max_components),
+            CSP(
+                n_components=n_components,
+                max_components=max_components,
+                precomputed=shared_covariances,
+            ),
             filterbank=filterbank,
         )
 
@@ -971,8 +1189,9 @@ class FBCSP(FilterBank):
             Label, default is None.
 
         """
-        super().fit(X, y)
-        features = super().transform(X)
+        Xs = self.transform_bands(X)
+        self.fit_subbands(Xs, y)
+        features = self.transform_subbands(Xs)
         if self.n_mutualinfo_components is None:
             estimator = make_pipeline(
                 *[SelectKBest(score_func=mutual_info_classif, k="all"), SVC()]
@@ -1017,12 +1236,12 @@ class FBCSP(FilterBank):
             Find feature model, shape(n_trials, n_components).
 
         """
-        features = super().transform(X)
+        features = self.transform_subbands(self.transform_bands(X))
         features = self.selector_.transform(features)
         return features
 
 
-class FBMultiCSP(FilterBank):
+class FBMultiCSP(_SharedCovariancesFilterBank):
     """
     FBMultiCSP.
 
@@ -1046,6 +1265,8 @@ class FBMultiCSP(FilterBank):
         Multiple classification strategy, one to many.
     filterbank : Optional, [List,[ndarray]]
         Spatial filter band division range.
+    shared_covariances : bool
+        If True, fit and transform on the trial covariances of each band, see transform_bands, by default False.
 
     Attributes
     ----------
@@ -1090,6 +1311,7 @@ class FBMultiCSP(FilterBank):
         ajd_method: str = "uwedge",
         n_mutualinfo_components: Optional[int] = None,
         filterbank: List[ndarray] = [],
+        shared_covariances: bool = False,
     ):
         self.n_components = n_components
         self.max_components = max_components
@@ -1098,12 +1320,14 @@ class FBMultiCSP(FilterBank):
         self.n_mutualinfo_components = n_mutualinfo_components
         self.filterbank = filterbank
         self.n_mutualinfo_components = n_mutualinfo_components
+        self.shared_covariances = shared_covariances
         super().__init__(
             MultiCSP(
                 n_components=n_components,
                 max_components=max_components,
                 multiclass=multiclass,
                 ajd_method=ajd_method,
+                precomputed=shared_covariances,
             ),
             filterbank=filterbank,
         )
@@ -1119,8 +1343,9 @@ class FBMultiCSP(FilterBank):
             Label, default is None.
 
         """
-        super().fit(X, y)
-        features = super().transform(X)
+        Xs = self.transform_bands(X)
+        self.fit_subbands(Xs, y)
+        features = self.transform_subbands(Xs)
         if self.n_mutualinfo_components is None:
             estimator = make_pipeline(
                 *[SelectKBest(score_func=mutual_info_classif, k="all"), SVC()]
@@ -1165,6 +1390,6 @@ class FBMultiCSP(FilterBank):
             Find feature model, shape(n_trials, n_components).
 
         """
-        features = super().transform(X)
+        features = self.transform_subbands(self.transform_bands(X))
         features = self.selector_.transform(features)
         return features
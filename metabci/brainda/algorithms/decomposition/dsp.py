@@ -13,7 +13,7 @@ from numpy import ndarray
 from ..utils.covariance import nearestPD
 from sklearn.base import BaseEstimator, TransformerMixin, ClassifierMixin
 
-from .base import robust_pattern
+from .base import robust_pattern, pearson_features
 from .cca import FilterBankSSVEP
 
 
@@ -284,17 +284,7 @@ class DSP(BaseEstimator, TransformerMixin, ClassifierMixin):
         corr : ndarray
             pearson correlation coefficient, shape(n_trials, n_classes)
         """
-        X = np.reshape(X, (-1, *X.shape[-2:]))
-        templates = np.reshape(templates, (-1, *templates.shape[-2:]))
-        X = X - np.mean(X, axis=-1, keepdims=True)
-        templates = templates - np.mean(templates, axis=-1, keepdims=True)
-        X = np.reshape(X, (X.shape[0], -1))
-        templates = np.reshape(templates, (templates.shape[0], -1))
-        istd_X = 1 / np.std(X, axis=-1, keepdims=True)
-        istd_templates = 1 / np.std(templates, axis=-1, keepdims=True)
-        corr = (X @ templates.T) / (templates.shape[1] - 1)
-        corr = istd_X * corr * istd_templates.T
-        return corr
+        return pearson_features(X, templates)
 
     def predict(self, X: ndarray):
         """
@@ -624,34 +614,3 @@ class DCPM(DSP, ClassifierMixin):
             [self.classes_[self.classes_ == self.classes_[labels[i]]] for i in range(labels.shape[0])], axis=0
         )
         return labels
-
-
-# pearson correlation coefficient
-def pearson_features(X, templates):
-    '''
-    Calculate pearson correlation coefficient.
-
-    Parameters
-    ----------
-    X : ndarray
-        features of test data after spatial filters, shape(n_trials, n_components, n_samples)
-    templates : ndarray
-        templates of train data, shape(n_classes, n_components, n_samples)
-
-    Returns
-    -------
-    corr : ndarray
-        pearson correlation coefficient, shape(n_trials, n_classes)
-    '''
-
-    X = np.reshape(X, (-1, *X.shape[-2:]))
-    templates = np.reshape(templates, (-1, *templates.shape[-2:]))
-    X = X - np.mean(X, axis=-1, keepdims=True)
-    templates = templates - np.mean(templates, axis=-1, keepdims=True)
-    X = np.reshape(X, (X.shape[0], -1))
-    templates = np.reshape(templates, (templates.shape[0], -1))
-    istd_X = 1 / np.std(X, axis=-1, keepdims=True)
-    istd_templates = 1 / np.std(templates, axis=-1, keepdims=True)
-    corr = (X @ templates.T) / (templates.shape[1] - 1)
-    corr = istd_X * corr * istd_templates.T
-    return corr
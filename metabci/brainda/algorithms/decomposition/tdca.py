@@ -10,10 +10,10 @@ from typing import Optional, List
 
 import numpy as np
 from scipy.linalg import qr
-from scipy.stats import pearsonr
 from numpy import ndarray
 from sklearn.base import BaseEstimator, TransformerMixin, ClassifierMixin
 
+from .base import pearson_features
 from .cca import FilterBankSSVEP
 from .dsp import xiang_dsp_kernel, xiang_dsp_feature
 
@@ -63,10 +63,9 @@ def tdca_feature(
             aug_2(X, P.shape[0], padding_len, P, training=training),
             n_components=n_components,
         )
-        b = Xk[:n_components, :]
-        a = np.reshape(a, (-1))
-        b = np.reshape(b, (-1))
-        rhos.append(pearsonr(a, b)[0])
+        b = Xk[np.newaxis, :n_components, :]
+        rhos.append(pearson_features(a, b)[:, 0])
+    rhos = np.stack(rhos, axis=-1)
     return rhos
 
 
@@ -117,19 +116,15 @@ class TDCA(BaseEstimator, TransformerMixin, ClassifierMixin):
         n_components = self.n_components
         X -= np.mean(X, axis=-1, keepdims=True)
         X = X.reshape((-1, *X.shape[-2:]))
-        rhos = [
-            tdca_feature(
-                tmp,
-                self.templates_,
-                self.W_,
-                self.M_,
-                self.Ps_,
-                self.padding_len,
-                n_components=n_components,
-            )
-            for tmp in X
-        ]
-        rhos = np.stack(rhos)
+        rhos = tdca_feature(
+            X,
+            self.templates_,
+            self.W_,
+            self.M_,
+            self.Ps_,
+            self.padding_len,
+            n_components=n_components,
+        )
         return rhos
 
     def predict(self, X: ndarray):
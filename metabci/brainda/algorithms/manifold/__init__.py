@@ -3,7 +3,9 @@ from .riemann import (
     expmap,
     geodesic,
     distance_riemann,
+    distance_riemann_centroids,
     mean_riemann,
+    update_mean_riemann,
     vectorize,
     unvectorize,
     tangent_space,
@@ -6,7 +6,7 @@
 """
 Riemannian Geometry for BCI.
 """
-from typing import Optional
+from typing import Optional, Sequence
 import numpy as np
 from numpy import ndarray
 from sklearn.base import BaseEstimator, TransformerMixin, ClassifierMixin
@@ -14,7 +14,7 @@ from sklearn.utils.extmath import softmax
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.linear_model import LogisticRegression
 from joblib import Parallel, delayed
-from scipy.linalg import eigvalsh, pinv
+from scipy.linalg import pinv
 
 from ..utils.covariance import covariances, sqrtm, invsqrtm, logm, expm, powm
 
@@ -112,12 +112,16 @@ def distance_riemann(A: ndarray, B: ndarray, n_jobs: Optional[int] = None):
         d = {\left( \sum_i \log(\lambda_i)^2 \\right)}^{-1/2}
     where :math:`\lambda_i` are the joint eigenvalues of A and B.
 
+    The joint eigenvalues are the eigenvalues of A whitened by B, all the pairs are solved with one stacked eigvalsh.
+
     Parameters
     ----------
     A : ndarray
         First positive-definite matrix, shape (n_trials, n_channels, n_channels) or (n_channels, n_channels).
     B : ndarray
         Second positive-definite matrix.
+    n_jobs: int, optional
+        the number of jobs to use.
 
     Returns
     -------
@@ -125,24 +129,36 @@ def distance_riemann(A: ndarray, B: ndarray, n_jobs: Optional[int] = None):
         Riemannian distance between A and B.
 
     """
-
-    def _single_distance_riemann(A, B):
-        dist = np.sqrt(np.sum(np.log(eigvalsh(A, B)) ** 2))
-        return dist
-
     A = A.reshape((-1, *A.shape[-2:]))
     B = B.reshape((-1, *B.shape[-2:]))
 
-    if A.shape[0] == 1:
-        A = np.broadcast_to(A, B.shape)
-    elif B.shape[0] == 1:
-        B = np.broadcast_to(B, A.shape)
+    iB12 = invsqrtm(B, n_jobs=n_jobs)
+    return _whitened_distance(np.matmul(np.matmul(iB12, A), iB12))
 
-    d = Parallel(n_jobs=n_jobs)(
-        delayed(_single_distance_riemann)(a, b) for a, b in zip(A, B)
-    )
-    d = np.array(d)
-    return d
+
+def _whitened_distance(wA: ndarray):
+    """Riemannian distance of whitened matrices to the identity, shape (..., n_channels, n_channels) -> (...)."""
+    eigvals = np.linalg.eigvalsh(wA)
+    return np.sqrt(np.sum(np.log(eigvals) ** 2, axis=-1))
+
+
+def distance_riemann_centroids(Cx: ndarray, iC12s: ndarray):
+    """Riemannian distances of covariance matrices to several centroids.
+
+    Parameters
+    ----------
+    Cx : ndarray
+        Covariance matrices, shape (n_trials, n_channels, n_channels).
+    iC12s : ndarray
+        Inverse square roots of the centroids, shape (n_class, n_channels, n_channels), usually computed once at fit.
+
+    Returns
+    -------
+    ndarray
+        Riemannian distances, shape (n_trials, n_class).
+    """
+    Cx = Cx.reshape((-1, 1, *Cx.shape[-2:]))
+    return _whitened_distance(np.matmul(np.matmul(iC12s, Cx), iC12s))
 
 
 def _get_sample_weight(sample_weight, N):
@@ -158,8 +174,17 @@ def _get_sample_weight(sample_weight, N):
     return sample_weight
 
 
+def _sqrtm_invsqrtm(C: ndarray):
+    """Square root and inverse square root of one SPD matrix from a single eigendecomposition."""
+    eigvals, eigvects = np.linalg.eigh(C)
+    C12 = (eigvects * np.sqrt(eigvals)) @ eigvects.T
+    iC12 = (eigvects * (1.0 / np.sqrt(eigvals))) @ eigvects.T
+    return C12, iC12
+
+
 def mean_riemann(
-        covmats, tol=1e-11, maxiter=300, init=None, sample_weight=None, n_jobs=None
+        covmats, tol=1e-11, maxiter=300, init=None, sample_weight=None, n_jobs=None,
+        method="gradient", return_info=False
 ):
     """Return the mean covariance matrix according to the Riemannian metric.
 
@@ -180,16 +205,28 @@ def mean_riemann(
         The maximum number of iteration (default 50).
     init : None|ndarray, optional
         A covariance matrix used to initialize the gradient descent (default None), if None the arithmetic mean is used.
+        A previous mean of similar data, e.g. of the last session, is a warm start that saves most iterations.
     sample_weight : None|ndarray, optional
         The weight of each sample (efault None), if None weights are 1 otherwise weights are normalized.
+    n_jobs: int, optional
+        the number of jobs used by the batched logm of each iteration.
+    method : str, optional
+        'gradient' (default), the step is shrunk at every iteration, or 'fixed_point', the Karcher flow with
+        a unit step which is only halved when the gradient norm increases, it usually needs fewer iterations.
+    return_info : bool, optional
+        Whether to also return the convergence information (default False).
 
     Returns
     -------
     C : ndarray
         The Riemannian mean covariance matrix.
-
+    info : dict
+        Only if return_info is True, n_iter (number of iterations), residuals (Frobenius norm of the
+        gradient at each iteration), step (final step size) and converged (whether tol was reached).
 
     """
+    if method not in ("gradient", "fixed_point"):
+        raise ValueError("non-supported method {}.".format(method))
     # init
     sample_weight = _get_sample_weight(sample_weight, len(covmats))
     Nt, Ne, Ne = covmats.shape
@@ -201,26 +238,69 @@ def mean_riemann(
     nu = 1.0
     tau = np.finfo(np.float64).max
     crit = np.finfo(np.float64).max
+    residuals = []
     # stop when J<10^-9 or max iteration = 50
     while (crit > tol) and (k < maxiter) and (nu > tol):
         k = k + 1
-        C12 = sqrtm(C, n_jobs=1)
-        iC12 = invsqrtm(C, n_jobs=1)
+        C12, iC12 = _sqrtm_invsqrtm(C)
 
         J = logm(np.matmul(np.matmul(iC12, covmats), iC12), n_jobs=n_jobs)
         J = np.sum(sample_weight[:, np.newaxis, np.newaxis] * J, axis=0)
         crit = np.linalg.norm(J, ord="fro")
-        h = nu * crit
+        residuals.append(crit)
+        h = nu * crit if method == "gradient" else crit
 
         C = C12 @ expm(nu * J, n_jobs=1) @ C12
         if h < tau:
-            nu = 0.95 * nu
+            if method == "gradient":
+                nu = 0.95 * nu
             tau = h
         else:
             nu = 0.5 * nu
+    if return_info:
+        info = {
+            "n_iter": k,
+            "residuals": np.array(residuals),
+            "step": nu,
+            "converged": bool(crit <= tol),
+        }
+        return C, info
     return C
 
 
+def update_mean_riemann(C: Optional[ndarray], covmats: ndarray, n_tracked: int = 0):
+    """Incremental Riemannian mean of streaming covariance matrices.
+
+    Each new matrix moves the mean along the geodesic towards it by 1/(n_tracked+1), so the mean is
+    updated in constant time and memory instead of being recomputed from all the matrices.
+
+    Parameters
+    ----------
+    C : None|ndarray
+        Current mean, shape (n_channels, n_channels), ignored if n_tracked is 0.
+    covmats : ndarray
+        New covariance matrices, shape (n_trials, n_channels, n_channels) or (n_channels, n_channels).
+    n_tracked : int, optional
+        Number of matrices already averaged in C (default 0).
+
+    Returns
+    -------
+    C : ndarray
+        The updated mean.
+    n_tracked : int
+        Number of matrices averaged in the updated mean.
+    """
+    covmats = np.reshape(covmats, (-1, *np.shape(covmats)[-2:]))
+    for Ci in covmats:
+        n_tracked += 1
+        if n_tracked == 1 or C is None:
+            C = np.copy(Ci)
+            continue
+        C12, iC12 = _sqrtm_invsqrtm(C)
+        C = C12 @ powm(iC12 @ Ci @ iC12, 1 / n_tracked) @ C12
+    return C, n_tracked
+
+
 def vectorize(Si: ndarray):
     """vectorize tangent space points.
 
@@ -312,7 +392,8 @@ def untangent_space(vSi: ndarray, P: ndarray, n_jobs: Optional[int] = None):
 
 
 def mdrm_kernel(
-        X: ndarray, y: ndarray, sample_weight: Optional[ndarray] = None, n_jobs: int = 1
+        X: ndarray, y: ndarray, sample_weight: Optional[ndarray] = None, n_jobs: int = 1,
+        init: Optional[ndarray] = None, return_info: bool = False
 ):
     """Minimum Distance to Riemannian Mean.
 
@@ -326,22 +407,34 @@ def mdrm_kernel(
         sample weights, by default None
     n_jobs : int
         the number of jobs to use, by default 1
+    init : Optional[ndarray], optional
+        centroids to warm start the means from, shape (n_class, n_channels, n_channels), by default None
+    return_info : bool
+        whether to also return the convergence information of each class mean, by default False
 
     Returns
     -------
     ndarray
         centroids of each class, shape (n_class, n_channels, n_channels).
+    list of dict
+        only if return_info is True, convergence information of each class, see mean_riemann.
     """
     X, y = np.copy(X), np.copy(y)
     labels = np.unique(y)
     Cx = covariances(X, estimator="lwf", n_jobs=n_jobs)
     sample_weight = np.ones((len(X))) if sample_weight is None else sample_weight
+    inits: Sequence[Optional[ndarray]] = [None] * len(labels) if init is None else list(init)
 
-    Centroids = Parallel(n_jobs=n_jobs)(
-        delayed(mean_riemann)(Cx[y == label], sample_weight=sample_weight[y == label])
-        for label in labels
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(mean_riemann)(
+            Cx[y == label], init=C0, sample_weight=sample_weight[y == label], return_info=True
+        )
+        for label, C0 in zip(labels, inits)
     )
-    return np.stack(Centroids)
+    Centroids = np.stack([C for C, _ in results])
+    if return_info:
+        return Centroids, [info for _, info in results]
+    return Centroids
 
 
 class FGDA(BaseEstimator, TransformerMixin):
@@ -445,12 +538,19 @@ class MDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
         ----------
         n_jobs:int
            n_jobs the default is None,meaning it will utilize all available CPUs.
+        warm_start:bool
+           whether a refit on the same classes starts the class means from the previous centroids,
+           the default is False
         Attributes
         ----------
         classes_:ndarray,shape(int)
             class labels
         centroids_:ndarray,shape(int,float,float)
             Riemannian centroid of two classes
+        n_iter_:ndarray,shape(int)
+            number of iterations of the Riemannian mean of each class
+        iC12s_:ndarray,shape(int,float,float)
+            inverse square roots of the centroids, used to whiten the test covariances
 
         References
         ----------
@@ -469,8 +569,9 @@ class MDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
 
     """
 
-    def __init__(self, n_jobs: int = 1):
+    def __init__(self, n_jobs: int = 1, warm_start: bool = False):
         self.n_jobs = n_jobs
+        self.warm_start = warm_start
 
     def fit(self, X: ndarray, y: ndarray, sample_weight: Optional[ndarray] = None):
         """
@@ -491,10 +592,19 @@ class MDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
         -------
         self:the model
         """
-        self.classes_ = np.unique(y)
-        self.centroids_ = mdrm_kernel(
-            X, y, sample_weight=sample_weight, n_jobs=self.n_jobs
+        classes = np.unique(y)
+        init = None
+        if (self.warm_start and hasattr(self, "centroids_")
+                and np.array_equal(classes, self.classes_)
+                and self.centroids_.shape[-1] == X.shape[-2]):
+            init = self.centroids_
+        self.classes_: ndarray = classes
+        centroids, infos = mdrm_kernel(
+            X, y, sample_weight=sample_weight, n_jobs=self.n_jobs, init=init, return_info=True
         )
+        self.centroids_: ndarray = centroids
+        self.n_iter_ = np.array([info["n_iter"] for info in infos])
+        self.iC12s_ = invsqrtm(self.centroids_)
         return self
 
     def _transform_distance(self, X: ndarray):
@@ -513,12 +623,7 @@ class MDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
         """
 
         Cx = covariances(X, estimator="lwf", n_jobs=self.n_jobs)
-        dist = np.stack(
-            [
-                distance_riemann(Cx, centroid, n_jobs=self.n_jobs)
-                for centroid in self.centroids_
-            ]
-        ).T
+        dist = distance_riemann_centroids(Cx, self.iC12s_)
         return dist
 
     def transform(self, X: ndarray):
@@ -604,6 +709,8 @@ class FgMDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
         the class of samples
     centroids_:ndarray,shape(int,float,float)
         Riemannian centroid of two classes
+    iC12s_:ndarray,shape(int,float,float)
+        inverse square roots of the centroids, used to whiten the test covariances
     fgda_:algorithms.mainfold.riemann.FGDA
         Fisher Geodesic Discriminate Analysis(FGDA)
 
@@ -654,6 +761,7 @@ class FgMDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
             for label in self.classes_
         )
         self.centroids_ = np.stack(Centroids)
+        self.iC12s_ = invsqrtm(self.centroids_)
         return self
 
     def _transform_distance(self, X: ndarray):
@@ -671,12 +779,7 @@ class FgMDRM(BaseEstimator, TransformerMixin, ClassifierMixin):
            Riemann distance
         """
         Cx = self.fgda_.transform(X)
-        dist = np.stack(
-            [
-                distance_riemann(Cx, centroid, n_jobs=self.n_jobs)
-                for centroid in self.centroids_
-            ]
-        ).T
+        dist = distance_riemann_centroids(Cx, self.iC12s_)
         return dist
 
     def transform(self, X: ndarray):
@@ -853,6 +956,8 @@ class Alignment(BaseEstimator, TransformerMixin):
        choose the alignment method:'riemann' or 'euclid'
     cov_method:str
        covariance estimators:'lwf'
+    warm_start:bool
+       whether a refit starts the Riemann center from the previous one, the default is False
 
     Attributes
     ----------
@@ -862,8 +967,12 @@ class Alignment(BaseEstimator, TransformerMixin):
        choose the alignment method:'riemann' or 'euclid'
     cov_method:str
        covariance estimators:'lwf'
+    C_:ndarray,shape(int,int)
+       Riemann/Euclidean center
     iC12_:ndarray,shape(int,int)
        aligned Riemann/Euclidean center
+    n_iter_:int
+       number of iterations of the Riemannian mean, 0 for 'euclid'
 
     References
     ----------
@@ -890,10 +999,12 @@ class Alignment(BaseEstimator, TransformerMixin):
             align_method: str = "euclid",
             cov_method: str = "lwf",
             n_jobs: Optional[int] = None,
+            warm_start: bool = False,
     ):
         self.align_method = align_method
         self.cov_method = cov_method
         self.n_jobs = n_jobs
+        self.warm_start = warm_start
 
     def fit(self, X: ndarray, y: Optional[ndarray] = None):
         """
@@ -956,6 +1067,7 @@ class Alignment(BaseEstimator, TransformerMixin):
         """
         Cs = covariances(X, estimator=self.cov_method, n_jobs=self.n_jobs)
         C = np.mean(Cs, axis=0)
+        self.C_, self.n_iter_ = C, 0
         return invsqrtm(C)
 
     def _riemann_center(self, X):
@@ -974,7 +1086,11 @@ class Alignment(BaseEstimator, TransformerMixin):
 
         """
         Cs = covariances(X, estimator=self.cov_method, n_jobs=self.n_jobs)
-        C = mean_riemann(Cs, n_jobs=self.n_jobs)
+        init = None
+        if self.warm_start and getattr(self, "C_", None) is not None and self.C_.shape == Cs.shape[1:]:
+            init = self.C_
+        C, info = mean_riemann(Cs, init=init, n_jobs=self.n_jobs, return_info=True)
+        self.C_, self.n_iter_ = C, info["n_iter"]
         return invsqrtm(C)
 
 
@@ -1013,6 +1129,8 @@ class RecursiveAlignment(BaseEstimator, TransformerMixin):
        covariance estimators:'lwf'
     iC12_:ndarray,shape(int,int)
        aligned Riemann/Euclidean center
+    C12_:ndarray,shape(int,int)
+       square root of the center
     n_tracked:int
        the number of iterations
     C_:ndarray
@@ -1033,6 +1151,12 @@ class RecursiveAlignment(BaseEstimator, TransformerMixin):
        from metabci.brainda.algorithms.manifold import RecursiveAlignment
        estimator = RecursiveAlignment(align_method='riemann')
        filterX = estimator.fit(X).transform(X)
+
+       # streaming session, one trial covariance at a time
+       for C in stream:
+           aligned_C = estimator.transform_one(C)
+       state = estimator.get_state()
+       estimator.set_state(state)
     """
 
     def __init__(
@@ -1078,13 +1202,113 @@ class RecursiveAlignment(BaseEstimator, TransformerMixin):
         X = np.reshape(X, (-1, *X.shape[-2:]))
         X = X - np.mean(X, axis=-1, keepdims=True)
         Cs = covariances(X, estimator=self.cov_method, n_jobs=self.n_jobs)
-        if not hasattr(self, "iC12_"):
-            self.iC12_ = np.eye(X.shape[1])
-            self.C_ = np.eye(X.shape[1])
-            self.n_tracked = 0
         X = self._recursive_fit_transform(X, Cs)
         return X
 
+    def partial_fit(self, C):
+        """
+        Update the center with the covariance matrices of new trials, in constant time and memory per trial
+
+        Parameters
+        ----------
+        C:ndarray,shape(n_trails,n_channels,n_channels) or shape(n_channels,n_channels)
+            covariance matrices of new trials
+
+        Returns
+        -------
+        self
+        """
+        C = np.reshape(C, (-1, *np.shape(C)[-2:]))
+        for Ci in C:
+            self._update_center(Ci)
+        return self
+
+    def transform_one(self, C):
+        """
+        Update the center with the covariance matrix of one new trial and return it aligned
+
+        Parameters
+        ----------
+        C:ndarray,shape(n_channels,n_channels)
+            covariance matrix of the new trial
+
+        Returns
+        -------
+        C:ndarray,shape(n_channels,n_channels)
+            aligned covariance matrix
+        """
+        self._update_center(C)
+        return self.iC12_ @ C @ self.iC12_
+
+    def get_state(self):
+        """
+        Checkpoint of the streaming state
+
+        Returns
+        -------
+        state:dict
+            copies of C_, C12_, iC12_ and n_tracked, empty before the first trial
+        """
+        if not hasattr(self, "C_"):
+            return {}
+        return {
+            "C_": np.copy(self.C_),
+            "C12_": np.copy(self.C12_),
+            "iC12_": np.copy(self.iC12_),
+            "n_tracked": self.n_tracked,
+        }
+
+    def set_state(self, state):
+        """
+        Restore the streaming state from a checkpoint of get_state
+
+        Parameters
+        ----------
+        state:dict
+            checkpoint of get_state
+
+        Returns
+        -------
+        self
+        """
+        for key, value in state.items():
+            setattr(self, key, np.copy(value) if key != "n_tracked" else value)
+        return self
+
+    def _init_center(self, n_channels):
+        """
+        Start the center from the identity matrix
+
+        Parameters
+        ----------
+        n_channels:int
+           number of channels
+        """
+        self.iC12_ = np.eye(n_channels)
+        self.C12_ = np.eye(n_channels)
+        self.C_ = np.eye(n_channels)
+        self.n_tracked = 0
+
+    def _update_center(self, C):
+        """
+        Move the center towards the covariance matrix of a new trial
+
+        Parameters
+        ----------
+        C:ndarray
+           the covariance matrix of the new trial
+        """
+        if not hasattr(self, "iC12_"):
+            self._init_center(C.shape[-1])
+        elif not hasattr(self, "C12_"):
+            self.C12_, self.iC12_ = _sqrtm_invsqrtm(self.C_)
+        if self.align_method == "euclid":
+            self._recursive_euclid_center(C)
+        elif self.align_method == "riemann":
+            self._recursive_riemann_center(C)
+        else:
+            raise ValueError("non-supported aligning method.")
+
     def _recursive_fit_transform(self, X, Cs):
         """
         obtain the subject's data after recursive alignment
@@ -1103,12 +1327,7 @@ class RecursiveAlignment(BaseEstimator, TransformerMixin):
 
         """
         for i in range(len(X)):
-            if self.align_method == "euclid":
-                self._recursive_euclid_center(Cs[i])
-            elif self.align_method == "riemann":
-                self._recursive_riemann_center(Cs[i])
-            else:
-                raise ValueError("non-supported aligning method.")
+            self._update_center(Cs[i])
             if self.n_tracked == 1:
                 X[i] = X[i] / np.std(X[i], axis=(-2, -1), keepdims=True)
             else:
@@ -1122,25 +1341,29 @@ class RecursiveAlignment(BaseEstimator, TransformerMixin):
         Parameters
         ----------
         C:ndarray
-           the euclid center calculated in the offline period
+           covariance of the new trial, shape (n_channels, n_channels)
 
         """
         self.n_tracked += 1
         alpha = 1 / (self.n_tracked)
         self.C_ = (1 - alpha) * self.C_ + alpha * C
-        self.iC12_ = invsqrtm(self.C_)
+        self.C12_, self.iC12_ = _sqrtm_invsqrtm(self.C_)
 
     def _recursive_riemann_center(self, C):
         """
         Calculate the riemann center after recursive alignment
 
+        The geodesic step from the center to C reuses the stored square roots of the center, so each trial
+        costs two eigendecompositions.
+
         Parameters
         ----------
         C:ndarray
-           the riemann center calculated in the offline period
+           covariance of the new trial, shape (n_channels, n_channels)
 
         """
         self.n_tracked += 1
         alpha = 1 / (self.n_tracked)
-        self.C_ = geodesic(self.C_, C, alpha, n_jobs=1)
-        self.iC12_ = invsqrtm(self.C_)
+        eigvals, eigvects = np.linalg.eigh(self.iC12_ @ C @ self.iC12_)
+        self.C_ = self.C12_ @ ((eigvects * eigvals**alpha) @ eigvects.T) @ self.C12_
+        self.C12_, self.iC12_ = _sqrtm_invsqrtm(self.C_)
@@ -1,4 +1,5 @@
 from .mekt import MEKT, choose_multiple_subjects
 from .lst import LST
+from .store import SourceFeatureStore
 from .same import SAME
 from .same import MSSAME
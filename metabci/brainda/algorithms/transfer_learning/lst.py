@@ -13,11 +13,13 @@ devices and subjects, reducing BCI system calibration time.
 souce paper of LST: https://iopscience.iop.org/article/10.1088/1741-2552/abcb6e.
 
 """
+from typing import Optional
+
 import numpy as np
 from numpy import ndarray
 from scipy.linalg import pinv
 from sklearn.base import BaseEstimator, TransformerMixin
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
 
 
 def lst_kernel(S: ndarray, T: ndarray):
@@ -41,6 +43,27 @@ def lst_kernel(S: ndarray, T: ndarray):
     return P
 
 
+def lst_source_kernel(S: ndarray):
+    """Calculate the target independent part of the LST transformation, S.T @ pinv(S @ S.T).
+
+    lst_kernel(S, T) equals T @ lst_source_kernel(S), so it can be computed once per source trial
+    and reused for every target.
+
+    Parameters
+    ----------
+    S:ndarray
+        source trials, shape (..., n_channels, n_samples).
+
+    Returns
+    -------
+    K: ndarray
+        source kernel, shape (..., n_samples, n_channels).
+
+    """
+    St = np.swapaxes(S, -1, -2)
+    return St @ np.linalg.pinv(S @ St, hermitian=True)
+
+
 class LST(BaseEstimator, TransformerMixin):
     """LST converter [1]_.
 
@@ -121,7 +144,7 @@ class LST(BaseEstimator, TransformerMixin):
         self.T_ = [np.mean(X[y == label], axis=0) for label in self.classes_]
         return self
 
-    def transform(self, X: ndarray, y: ndarray):
+    def transform(self, X: ndarray, y: ndarray, source_kernel: Optional[ndarray] = None):
         """ Obtain transformed source data.
 
         Parameters
@@ -130,22 +153,35 @@ class LST(BaseEstimator, TransformerMixin):
             EEG data, shape(n_trials, n_channels, n_samples).
         y: ndarray
             Label, shape(n_trials,).
+        source_kernel: ndarray, optional
+            lst_source_kernel(X), shape(n_trials, n_samples, n_channels). When the same source data are
+            transformed for several targets or folds, computing it once avoids the pseudo-inverses.
 
         Returns
         -------
         X : ndarray
             Data after LST conversion, shape(n_trials, n_channels, n_samples).
 
+        Raises
+        ------
+        ValueError
+            If y contains labels that were not seen in fit.
+
         """
-        X = np.copy(X)
         X = X.reshape((-1, *X.shape[-2:]))  # n_trials, n_channels, n_samples
-        Ts = np.zeros_like(X)
-        for i, label in enumerate(self.classes_):
-            Ts[y == label] = self.T_[i]
-        P = np.stack(
-            Parallel(n_jobs=self.n_jobs)(
-                delayed(lst_kernel)(S, T) for S, T in zip(X, Ts)
+        y = np.asarray(y).reshape(-1)
+        unseen = np.setdiff1d(y, self.classes_)
+        if len(unseen) > 0:
+            raise ValueError("labels {} were not seen in fit.".format(unseen.tolist()))
+        if source_kernel is None:
+            source_kernel = np.concatenate(
+                Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                    delayed(lst_source_kernel)(S)
+                    for S in np.array_split(X, max(1, effective_n_jobs(self.n_jobs)))
+                )
             )
-        )
+        P = np.empty((len(X), X.shape[-2], X.shape[-2]), dtype=np.result_type(X, source_kernel))
+        for i, label in enumerate(self.classes_):
+            P[y == label] = self.T_[i] @ source_kernel[y == label]
         X = P @ X
         return X
@@ -28,11 +28,13 @@ souce code of MEKT: https://github.com/chamwen/MEKT.git
 """
 import numpy as np
 from scipy.linalg import block_diag, eigh
+from scipy.sparse import csr_matrix, diags
 from scipy.stats import f_oneway
 from scipy.spatial.distance import pdist, squareform
 from sklearn.base import BaseEstimator, TransformerMixin
-from sklearn.preprocessing import OneHotEncoder
+from sklearn.neighbors import NearestNeighbors
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from joblib import Parallel, delayed
 
 from ..manifold import tangent_space, mean_riemann
 from ..utils.covariance import Covariance, invsqrtm
@@ -109,7 +111,7 @@ def source_discriminability(Xs, ys):
     return Sw, Sb
 
 
-def graph_laplacian(Xs, k=10, t=1):
+def graph_laplacian(Xs, k=10, t=1, sparse=False):
     """Graph Laplacian Matrix.
 
     Currently with heat kernel implemented.
@@ -122,16 +124,37 @@ def graph_laplacian(Xs, k=10, t=1):
         k nearest neighbors, by default 10.
     t: int
         heat kernel parameter, by default 1.
+    sparse: bool
+        if True, the kNN graph is built with a neighbors search and L and D are returned as
+        scipy sparse matrices with O(n_trials * k) entries, by default False.
 
     Returns
     -------
-    L: ndarray
+    L: ndarray or sparse matrix
         unnormalized laplacian kernel, shape (n_trials, n_trials).
-    D: ndarray
+    D: ndarray or sparse matrix
         degree matrix, L = D - W, shape (n_trials, n_trials).
 
     """
 
+    n_trials = Xs.shape[0]
+    if sparse:
+        # knn, self-connection included as the nearest neighbor of each trial
+        dist, ix = (
+            NearestNeighbors(n_neighbors=min(k + 1, n_trials)).fit(Xs).kneighbors(Xs)
+        )
+        # heat kernel
+        heat_W = np.exp(-np.square(dist) / (2 * np.square(t)))
+        W = csr_matrix(
+            (heat_W.ravel(), (np.repeat(np.arange(n_trials), ix.shape[1]), ix.ravel())),
+            shape=(n_trials, n_trials),
+        )
+        W = W.maximum(W.T)
+
+        D = diags(np.asarray(W.sum(axis=-1)).ravel(), format="csr")
+        L = D - W
+        return L, D
+
     # compute pairwise distance
     pair_dist = squareform(pdist(Xs, metric="euclidean"))
 
@@ -141,7 +164,7 @@ def graph_laplacian(Xs, k=10, t=1):
 
     # heat kernel
     heat_W = np.exp(-np.square(pair_dist) / (2 * np.square(t)))
-    W = np.zeros((Xs.shape[0], Xs.shape[0]))
+    W = np.zeros((n_trials, n_trials))
 
     for i, ind in enumerate(ix):
         W[i, ind] = heat_W[i, ind]
@@ -212,7 +235,7 @@ def dte(Xs, Xt, ys):
     return dis, dif
 
 
-def choose_multiple_subjects(Xs, Xt, ys, y_subjects, k=1):
+def choose_multiple_subjects(Xs, Xt, ys, y_subjects, k=1, n_jobs=None):
     """choose k most appropriate subjects according to dte.
 
     Parameters
@@ -227,6 +250,8 @@ def choose_multiple_subjects(Xs, Xt, ys, y_subjects, k=1):
         subject labels, shape (n_trials*n_subjects,).
     k : int
         k subjects, by default 1.
+    n_jobs: int
+        the number of threads scoring the subjects, by default None.
 
     Returns
     -------
@@ -238,15 +263,18 @@ def choose_multiple_subjects(Xs, Xt, ys, y_subjects, k=1):
     """
 
     subjects = np.unique(y_subjects)
-    ranks = []
-    for subject in subjects:
+
+    def score(subject):
         dis, dif = dte(Xs[y_subjects == subject], Xt, ys[y_subjects == subject])
         # Note: original code map dif to [1, 0], dis to [0, 1] and  multiply them
-        r = dis / (dif + np.finfo(np.float).resolution)
-        ranks.append(r)
+        return dis / (dif + np.finfo(np.float64).resolution)
+
+    ranks = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(score)(subject) for subject in subjects
+    )
 
     ranks = np.argsort(ranks)[::-1]
-    subject_ix = np.zeros((len(y_subjects)), dtype=np.bool)
+    subject_ix = np.zeros((len(y_subjects)), dtype=bool)
     selected_subjects = subjects[ranks[:k]]
     for subject in selected_subjects:
         subject_ix = np.logical_or(subject_ix, y_subjects == subject)
@@ -284,7 +312,14 @@ def mekt_feature(X, covariance_type):
     return featureX
 
 
-def mekt_kernel(Xs, Xt, ys, d=10, max_iter=5, alpha=0.01, beta=0.1, rho=20, k=10, t=1):
+def _class_sums(X, y, classes):
+    """Sum of the features of each class, shape (n_features, n_classes)."""
+    return np.stack([np.sum(X[y == c], axis=0) for c in classes], axis=-1)
+
+
+def mekt_kernel(
+    Xs, Xt, ys, d=10, max_iter=5, alpha=0.01, beta=0.1, rho=20, k=10, t=1, scatter=None
+):
     """Find the projection matrix to make the distribution of the source
        and target domains as close as possible after projection.
 
@@ -310,6 +345,8 @@ def mekt_kernel(Xs, Xt, ys, d=10, max_iter=5, alpha=0.01, beta=0.1, rho=20, k=10
         number of nearest neighbors.
     t: int
         heat kernel parameter.
+    scatter: tuple of ndarray, optional
+        precomputed source_discriminability(Xs, ys), e.g. from SourceFeatureStore.source_data.
 
     Returns
     -------
@@ -324,17 +361,16 @@ def mekt_kernel(Xs, Xt, ys, d=10, max_iter=5, alpha=0.01, beta=0.1, rho=20, k=10
     nt_samples, nt_features = Xt.shape
 
     # source domain discriminability
-    Sw, Sb = source_discriminability(Xs, ys)
+    Sw, Sb = source_discriminability(Xs, ys) if scatter is None else scatter
     P = np.zeros((2 * ns_features, 2 * ns_features))
     P[:ns_features, :ns_features] = Sw
     P0 = np.zeros((2 * ns_features, 2 * ns_features))
     P0[:ns_features, :ns_features] = Sb
 
-    # target locality
-    L, D = graph_laplacian(Xt, k=k, t=t)  # should be (n_samples, n_samples)
-    iD12 = invsqrtm(D)
-    L = iD12 @ L @ iD12
-    L = block_diag(np.zeros((ns_features, ns_features)), Xt.T @ L @ Xt)
+    # target locality, Xt.T @ iD12 @ L @ iD12 @ Xt with the sparse kNN graph
+    L, D = graph_laplacian(Xt, k=k, t=t, sparse=True)
+    iD12Xt = Xt / np.sqrt(D.diagonal())[:, np.newaxis]
+    L = block_diag(np.zeros((ns_features, ns_features)), iD12Xt.T @ (L @ iD12Xt))
 
     Q = np.block(
         [
@@ -343,28 +379,27 @@ def mekt_kernel(Xs, Xt, ys, d=10, max_iter=5, alpha=0.01, beta=0.1, rho=20, k=10
         ]
     )
 
-    Ht = np.eye(nt_samples) - (1 / nt_samples) * np.ones((nt_samples, 1)) @ np.ones(
-        (1, nt_samples)
-    )
-    S = block_diag(np.zeros((ns_features, ns_features)), Xt.T @ Ht @ Xt)
+    # target variance, Xt.T @ Ht @ Xt with the centering matrix Ht
+    Xt_centered = Xt - np.mean(Xt, axis=0, keepdims=True)
+    S = block_diag(np.zeros((ns_features, ns_features)), Xt_centered.T @ Xt_centered)
 
     classes = np.sort(np.unique(ys))
-    onehot_enc = OneHotEncoder(categories=[classes], sparse=False)
-    Ns = onehot_enc.fit_transform(np.reshape(ys, (-1, 1))) / len(ys)
+    # class sums, Xs.T @ Ns with Ns the one-hot labels divided by the number of trials
+    Ps = _class_sums(Xs, ys, classes) / len(ys)
 
     clf = LinearDiscriminantAnalysis(solver="lsqr", shrinkage="auto")
     yt = clf.fit(Xs, ys).predict(Xt)  # initial predict label
 
-    X = block_diag(Xs, Xt)
     Emin_temp = alpha * P + beta * L + rho * Q
     Emax = S + alpha * P0 + 1e-3 * np.eye(ns_features + nt_features)
     for _ in range(max_iter):
         # update fake yt
-        Nt = onehot_enc.fit_transform(np.reshape(yt, (-1, 1))) / len(yt)
+        Pt = _class_sums(Xt, yt, classes) / len(yt)
 
-        # calculate R: joint probability distribution shift
-        M = np.block([[Ns @ Ns.T, -Ns @ Nt.T], [-Nt @ Ns.T, Nt @ Nt.T]])
-        R = X.T @ M @ X
+        # calculate R: joint probability distribution shift, X.T @ M @ X with X = block_diag(Xs, Xt)
+        # and M = [[Ns @ Ns.T, -Ns @ Nt.T], [-Nt @ Ns.T, Nt @ Nt.T]]
+        Pst = np.concatenate((Ps, -Pt), axis=0)
+        R = Pst @ Pst.T
 
         # generalized eigen-decompostion
         Emin = Emin_temp + R
@@ -519,3 +554,49 @@ class MEKT(BaseEstimator, TransformerMixin):
         source_features = featureXs @ self.A_
         target_features = featureXt @ self.B_
         return source_features, target_features
+
+    def fit_transform_store(self, store, Xt, subjects=None, n_subjects=None):
+        """Obtain source and target domain features after MEKT transformation, with the source subjects
+        taken from a SourceFeatureStore instead of being processed again.
+
+        Parameters
+        ----------
+        store: SourceFeatureStore
+            Store of the source subjects, its covariance_type is used for the target too.
+        Xt: ndarray
+            Target of EEG data, shape(n_trials, n_channels, n_samples).
+        subjects: list, optional
+            Source subjects, by default all stored subjects.
+        n_subjects: int, optional
+            If given, only the n_subjects most appropriate subjects according to dte are used.
+
+        Returns
+        -------
+        source_features: ndarray
+            source domain features, shape(n_trials, n_features).
+        target_features: ndarray
+            target domain features, shape(n_trials, n_features).
+
+        """
+        featureXt = mekt_feature(Xt, store.covariance_type)
+        subjects = store.subjects if subjects is None else subjects
+        if n_subjects is not None:
+            subjects = store.choose_subjects(featureXt, k=n_subjects, subjects=subjects)
+        self.subjects_ = subjects
+        featureXs, ys, scatter = store.source_data(subjects)
+        self.A_, self.B_ = mekt_kernel(
+            featureXs,
+            featureXt,
+            ys,
+            d=self.subspace_dim,
+            max_iter=self.max_iter,
+            alpha=self.alpha,
+            beta=self.beta,
+            rho=self.rho,
+            k=self.k,
+            t=self.t,
+            scatter=scatter,
+        )
+        source_features = featureXs @ self.A_
+        target_features = featureXt @ self.B_
+        return source_features, target_features
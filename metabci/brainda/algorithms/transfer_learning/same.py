@@ -20,6 +20,8 @@ souce code of SAME: https://github.com/RuixinLuo/Source-Aliasing-Matrix-Estimati
        Journal of Neural Engineering, 2023. DOI: 10.1088/1741-2552/ad0b8f
 """
 
+from typing import Optional
+
 import numpy as np
 from numpy import ndarray
 from sklearn.base import BaseEstimator, TransformerMixin
@@ -133,6 +135,138 @@ def get_augment_noiseAfter(fs, f, Nh, n_Aug, mean_temp, alpha=0.05):
     return data_aug
 
 
+def sine_cosine_references(fs, f_list, phi_list, Nh, n_times):
+    """Sine-cosine references of several frequencies, the Yf of get_augment_noiseAfter(_ms) stacked.
+
+    Parameters
+    ----------
+    fs : int
+        Sampling rate.
+    f_list : list
+        Frequencies, shape(n_events,).
+    phi_list : list
+        Phases in units of pi, shape(n_events,).
+    Nh: int
+        The number of harmonics.
+    n_times: int
+        The number of samples.
+
+    Returns
+    -------
+    Yf : ndarray
+        References, sine and cosine interleaved by harmonic, shape(n_events, 2*Nh, n_times).
+
+    """
+    t = np.arange(n_times) / fs
+    harmonics = np.arange(1, Nh + 1)[:, np.newaxis]
+    f = np.asarray(f_list, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    phi = np.asarray(phi_list, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    phase = 2 * np.pi * f * harmonics * t + harmonics * np.pi * phi
+    Yf = np.empty((len(f_list), 2 * Nh, n_times))
+    Yf[:, 0::2] = np.sin(phase)
+    Yf[:, 1::2] = np.cos(phase)
+    return Yf
+
+
+def _neighbor_windows(n_events, n_Templates):
+    """Neighboring events used for each event by msSAME, the same windows as get_augment_noiseAfter_ms.
+
+    Returns
+    -------
+    mask : ndarray
+        mask[i, j] is True if event j is a neighbor of event i, shape(n_events, n_events).
+
+    """
+    mask = np.zeros((n_events, n_events), dtype=bool)
+    if n_Templates == 0 or n_Templates == 1:  # Original SAME
+        np.fill_diagonal(mask, True)
+        return mask
+    if n_Templates > n_events:
+        raise ValueError("the number of neighboring frequencies exceeds the number of events.")
+    d0 = int(n_Templates / 2)
+    d1 = n_events
+    for iEvent in range(n_events):
+        n = iEvent + 1
+        if n <= d0:
+            template_st, template_ed = 1, n_Templates
+        elif (n > d0) & (n < (d1 - d0 + 1)):
+            template_st, template_ed = n - d0, n + (n_Templates - d0 - 1)
+        else:
+            template_st, template_ed = d1 - n_Templates + 1, d1
+        mask[iEvent, int(template_st - 1):int(template_ed)] = True
+    return mask
+
+
+def same_augment(fs, f_list, phi_list, Nh, n_Aug, mean_temp_all, n_Templates=1, alpha=0.05,
+                 random_state=None, dtype=None, out=None):
+    """Artificially generated signals of all events by SAME or msSAME in one batched pass.
+
+    The source aliasing matrices of all events are estimated at once from the sums of the reference
+    and template products over the neighboring events, and the noise of each event is drawn into
+    the output in place.
+
+    Parameters
+    ----------
+    fs : int
+        Sampling rate.
+    f_list : list
+        Frequency of all events.
+    phi_list : list, optional
+        Phase of all events, in units of pi. None uses zero phases (SAME).
+    Nh: int
+        The number of harmonics.
+    n_Aug: int
+        The number of generated signals per event.
+    mean_temp_all: ndarray
+        Average template of all events, shape(n_events, n_channels, n_times).
+    n_Templates: int
+        The number of neighboring frequencies, 0 or 1 for SAME, default 1.
+    alpha: float
+        Intensity of noise, default 0.05.
+    random_state: int or numpy.random.Generator, optional
+        Seed or generator of the noise, default None.
+    dtype: str or numpy dtype, optional
+        Data type of the generated signals, e.g. 'float32', default float64, ignored if out is given.
+    out: ndarray, optional
+        Preallocated array or memmap receiving the signals, shape(n_events*n_Aug, n_channels, n_times).
+
+    Returns
+    -------
+    data_aug : ndarray
+        Artificially generated signals, the n_Aug signals of each event in turn,
+        shape(n_events*n_Aug, n_channels, n_times).
+
+    """
+    mean_temp_all = np.asarray(mean_temp_all, dtype=np.float64)
+    n_events, n_channels, n_times = mean_temp_all.shape
+    if phi_list is None:
+        phi_list = np.zeros(n_events)
+    rng = np.random.default_rng(random_state)
+    if out is None:
+        out = np.empty((n_events * n_Aug, n_channels, n_times), dtype=np.float64 if dtype is None else dtype)
+
+    # least squares aliasing matrices over the neighboring events, lst_kernel of the concatenation
+    Yf = sine_cosine_references(fs, f_list[:n_events], phi_list[:n_events], Nh, n_times)
+    Yt = np.swapaxes(Yf, -1, -2)
+    mask = _neighbor_windows(n_events, n_Templates).astype(np.float64)
+    YY = np.einsum("ij,jab->iab", mask, Yf @ Yt)
+    TY = np.einsum("ij,jab->iab", mask, mean_temp_all @ Yt)
+    PT = TY @ np.linalg.pinv(YY, hermitian=True)
+    Z = PT @ Yf
+    # noise of each channel, scaled by the variance of the source signals
+    scale = alpha * np.std(Z, axis=-1)
+
+    for i in range(n_events):
+        block = out[i * n_Aug:(i + 1) * n_Aug]
+        if block.flags.c_contiguous and block.dtype in (np.float32, np.float64):
+            rng.standard_normal(dtype=block.dtype, out=block)
+        else:
+            block[:] = rng.standard_normal(block.shape)
+        block *= scale[i][:, np.newaxis]
+        block += Z[i]
+    return out
+
+
 class SAME(BaseEstimator, TransformerMixin):
     """
     source aliasing matrix estimation (SAME) [1]_.
@@ -158,6 +292,10 @@ class SAME(BaseEstimator, TransformerMixin):
         The number of generated signals.
     alpha: float
         Intensity of noise, default 0.05.
+    random_state: int or numpy.random.Generator, optional
+        Seed or generator of the noise, default None.
+    dtype: str or numpy dtype, optional
+        Data type of the augmentation data, e.g. 'float32', default float64.
 
     Attributes
     ----------
@@ -200,13 +338,17 @@ class SAME(BaseEstimator, TransformerMixin):
                  flist=None,
                  Nh=5,
                  n_Aug=5,
-                 alpha=0.05):
+                 alpha=0.05,
+                 random_state=None,
+                 dtype=None):
         self.n_jobs = n_jobs
         self.fs = fs
         self.Nh = Nh
         self.n_Aug = n_Aug
         self.flist = flist
         self.alpha = alpha
+        self.random_state = random_state
+        self.dtype = dtype
 
     def fit(self, X: ndarray, y: ndarray):
         """ Model training.
@@ -224,9 +366,15 @@ class SAME(BaseEstimator, TransformerMixin):
         self.T_ = [np.mean(X[y == label], axis=0) for label in self.classes_]
         return self
 
-    def augment(self):
+    def augment(self, out: Optional[ndarray] = None):
         """ Calculating augmentation signals.
 
+        Parameters
+        ----------
+        out: ndarray, optional
+            Preallocated array or memmap receiving the augmentation data,
+            shape(n_events*n_aug, n_channels, n_samples).
+
         Returns
         -------
         X_aug: ndarray
@@ -235,25 +383,18 @@ class SAME(BaseEstimator, TransformerMixin):
             Label of augmentation data, shape(n_events*n_aug,).
         """
 
-        X_aug = []
-        y_aug = []
-        for i, label in enumerate(self.classes_):
-            temp = self.T_[i]
-            f = self.flist[i]
-            data_aug = get_augment_noiseAfter(
-                fs=self.fs,
-                f=f,
-                Nh=self.Nh,
-                n_Aug=self.n_Aug,
-                mean_temp=temp,
-                alpha=self.alpha)
-            # n_aug, n_channel, n_times
-            data_aug = np.transpose(data_aug, [2, 0, 1])
-            X_aug.append(data_aug)
-            y_aug.append(np.ones(self.n_Aug, dtype=np.int32) * label)
-
-        X_aug = np.concatenate(X_aug, axis=0)
-        y_aug = np.concatenate(y_aug, axis=0)
+        X_aug = same_augment(
+            fs=self.fs,
+            f_list=self.flist,
+            phi_list=None,
+            Nh=self.Nh,
+            n_Aug=self.n_Aug,
+            mean_temp_all=np.stack(self.T_),
+            alpha=self.alpha,
+            random_state=self.random_state,
+            dtype=self.dtype,
+            out=out)
+        y_aug = np.repeat(self.classes_, self.n_Aug).astype(np.int32)
         return X_aug, y_aug
 
 
@@ -413,6 +554,10 @@ class MSSAME(BaseEstimator, TransformerMixin):
         The number of neighborhood frequency
     alpha: float
         Intensity of noise, default 0.05.
+    random_state: int or numpy.random.Generator, optional
+        Seed or generator of the noise, default None.
+    dtype: str or numpy dtype, optional
+        Data type of the augmentation data, e.g. 'float32', default float64.
 
     Attributes
     ----------
@@ -448,7 +593,8 @@ class MSSAME(BaseEstimator, TransformerMixin):
 
     """
 
-    def __init__(self, n_jobs=None, fs=250, flist=None, plist=None, Nh=5, n_Aug=5, n_Neig=12, alpha=0.05):
+    def __init__(self, n_jobs=None, fs=250, flist=None, plist=None, Nh=5, n_Aug=5, n_Neig=12, alpha=0.05,
+                 random_state=None, dtype=None):
         self.n_jobs = n_jobs
         self.fs = fs
         self.Nh = Nh
@@ -457,6 +603,8 @@ class MSSAME(BaseEstimator, TransformerMixin):
         self.plist = plist
         self.n_Neig = n_Neig
         self.alpha = alpha
+        self.random_state = random_state
+        self.dtype = dtype
 
     def fit(self, X: ndarray, y: ndarray):
         """ model training
@@ -474,9 +622,15 @@ class MSSAME(BaseEstimator, TransformerMixin):
         self.T_ = [np.mean(X[y == label], axis=0) for label in self.classes_]
         return self
 
-    def augment(self):
+    def augment(self, out: Optional[ndarray] = None):
         """ Calculating augmentation signals.
 
+        Parameters
+        ----------
+        out: ndarray, optional
+            Preallocated array or memmap receiving the augmentation data,
+            shape(n_events*n_aug, n_channels, n_samples).
+
         Returns
         -------
         X_aug: ndarray
@@ -485,22 +639,17 @@ class MSSAME(BaseEstimator, TransformerMixin):
             Label of augmentation data, shape(n_events*n_aug,).
         """
 
-        X_aug = []
-        y_aug = []
-        n_channel, n_times = np.shape(self.T_[0])
-        n_event = len(self.classes_)
-        temp = np.zeros((n_channel, n_times, n_event))  # n_channel * n_times * n_events
-        for n in range(n_event):
-            temp[:, :, n] = self.T_[n]
-        # generated signals
-        for i, label in enumerate(self.classes_):
-            data_aug = get_augment_noiseAfter_ms(fs=self.fs, f_list=self.flist, phi_list=self.plist,
-                                                 Nh=self.Nh, n_Aug=self.n_Aug, mean_temp_all=temp, iEvent=i,
-                                                 n_Templates=self.n_Neig, alpha=self.alpha)
-            data_aug = np.transpose(data_aug, [2, 0, 1])  # n_aug, n_channel, n_times
-            X_aug.append(data_aug)
-            y_aug.append(np.ones(self.n_Aug, dtype=np.int32) * label)
-
-        X_aug = np.concatenate(X_aug, axis=0)
-        y_aug = np.concatenate(y_aug, axis=0)
+        X_aug = same_augment(
+            fs=self.fs,
+            f_list=self.flist,
+            phi_list=self.plist,
+            Nh=self.Nh,
+            n_Aug=self.n_Aug,
+            mean_temp_all=np.stack(self.T_),
+            n_Templates=self.n_Neig,
+            alpha=self.alpha,
+            random_state=self.random_state,
+            dtype=self.dtype,
+            out=out)
+        y_aug = np.repeat(self.classes_, self.n_Aug).astype(np.int32)
         return X_aug, y_aug
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Source-domain feature store for transfer learning.
+
+Transferring to a new target subject only needs the target data to be processed: the tangent-space
+features of the source subjects (see mekt_feature), their class statistics for the source
+discriminability of MEKT, and the target independent part of the LST transformation
+(see lst_source_kernel), are computed once per subject and persisted to disk. The store is keyed by
+the preprocessing config, so features computed with different settings never mix.
+
+"""
+import hashlib
+import json
+import os
+from typing import Optional, List, Dict, Any
+
+import numpy as np
+from numpy import ndarray
+from joblib import Parallel, delayed
+
+from .mekt import mekt_feature, scatter_matrix
+from .lst import lst_source_kernel
+
+
+class SourceFeatureStore:
+    """Persistent per-subject store of source-domain features and statistics.
+
+    Each subject is aligned to its own Riemannian mean by mekt_feature, as recommended by MEKT, and
+    stored in <path>/<key>/<subject>.npz with its tangent-space features, labels,
+    and per-class counts, means and scatter matrices. If lst is True, the source trials and their LST
+    source kernels are also stored as .npy files, which are loaded memory-mapped.
+
+    Parameters
+    ----------
+    path : str
+        Root directory of the store.
+    covariance_type : str
+        Covariance category of mekt_feature, by default 'lwf'.
+    config : dict, optional
+        Other preprocessing settings the stored data depend on (e.g. srate, filter band, time window),
+        they are part of the store key, by default None.
+    lst : bool
+        Whether to also store the data needed by LST, by default False.
+    n_jobs : int, optional
+        The number of threads used to add and score subjects, by default None.
+
+    Attributes
+    ----------
+    key : str
+        Digest of the preprocessing config.
+    root : str
+        Directory of the subjects stored with this config.
+
+    Tip
+    ----
+    .. code-block:: python
+       :linenos:
+       :caption: Onboarding a new target subject with MEKT
+
+       from metabci.brainda.algorithms.transfer_learning import MEKT, SourceFeatureStore
+       store = SourceFeatureStore('~/mekt_store', config={'srate': 128, 'band': [8, 30]})
+       for subject, (Xs, ys) in source_data.items():
+           if subject not in store:
+               store.add(subject, Xs, ys)
+       source_features, target_features = MEKT().fit_transform_store(store, Xt, n_subjects=10)
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        covariance_type: str = "lwf",
+        config: Optional[Dict[str, Any]] = None,
+        lst: bool = False,
+        n_jobs: Optional[int] = None,
+    ):
+        self.path = os.path.expanduser(path)
+        self.covariance_type = covariance_type
+        self.config = config
+        self.lst = lst
+        self.n_jobs = n_jobs
+
+        full_config = dict(config or {})
+        full_config["covariance_type"] = covariance_type
+        config_json = json.dumps(full_config, sort_keys=True, default=str)
+        self.key = hashlib.blake2b(config_json.encode("utf-8"), digest_size=8).hexdigest()
+        self.root = os.path.join(self.path, self.key)
+        os.makedirs(self.root, exist_ok=True)
+        config_file = os.path.join(self.root, "config.json")
+        if not os.path.exists(config_file):
+            with open(config_file, "w") as f:
+                f.write(config_json)
+
+    def _file(self, subject, suffix=".npz"):
+        return os.path.join(self.root, "{}{}".format(subject, suffix))
+
+    def __contains__(self, subject):
+        return os.path.exists(self._file(subject))
+
+    @property
+    def subjects(self) -> List[str]:
+        """Stored subjects, sorted."""
+        return sorted(
+            os.path.splitext(f)[0] for f in os.listdir(self.root) if f.endswith(".npz")
+        )
+
+    def add(self, subject, X: ndarray, y: ndarray, overwrite: bool = False):
+        """Compute and store the features and statistics of a source subject.
+
+        Parameters
+        ----------
+        subject : str or int
+            Subject id.
+        X : ndarray
+            EEG data, shape (n_trials, n_channels, n_samples).
+        y : ndarray
+            Labels, shape (n_trials,).
+        overwrite : bool
+            Whether to recompute a subject already in the store, by default False.
+
+        Returns
+        -------
+        self : SourceFeatureStore
+        """
+        if subject in self and not overwrite:
+            return self
+        y = np.asarray(y)
+        features = mekt_feature(X, self.covariance_type)
+        classes = np.unique(y)
+        counts = np.array([np.sum(y == c) for c in classes])
+        class_means = np.stack([np.mean(features[y == c], axis=0) for c in classes])
+        class_scatter = np.stack(
+            [
+                (features[y == c] - m).T @ (features[y == c] - m)
+                for c, m in zip(classes, class_means)
+            ]
+        )
+        # discriminability term of dte, independent of the target
+        dis = np.linalg.norm(scatter_matrix(features, y), 1)
+
+        if self.lst:
+            np.save(self._file(subject, "_X.npy"), X)
+            np.save(self._file(subject, "_lst_kernel.npy"), lst_source_kernel(X))
+        # npz is written last, a subject is in the store once it exists
+        np.savez(
+            self._file(subject),
+            features=features,
+            y=y,
+            classes=classes,
+            counts=counts,
+            class_means=class_means,
+            class_scatter=class_scatter,
+            dis=dis,
+        )
+        return self
+
+    def add_subjects(self, data: Dict[Any, tuple], overwrite: bool = False):
+        """Store several source subjects concurrently.
+
+        Parameters
+        ----------
+        data : dict
+            Subject id to (X, y).
+        overwrite : bool
+            Whether to recompute subjects already in the store, by default False.
+
+        Returns
+        -------
+        self : SourceFeatureStore
+        """
+        Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(self.add)(subject, X, y, overwrite=overwrite)
+            for subject, (X, y) in data.items()
+        )
+        return self
+
+    def load(self, subject) -> Dict[str, ndarray]:
+        """Load a stored subject.
+
+        Parameters
+        ----------
+        subject : str or int
+            Subject id.
+
+        Returns
+        -------
+        data : dict
+            features, y, classes, counts, class_means, class_scatter and dis, and memory-mapped X and
+            lst_kernel if the store has lst enabled.
+        """
+        with np.load(self._file(subject)) as f:
+            data = {k: f[k] for k in f.files}
+        if self.lst:
+            data["X"] = np.load(self._file(subject, "_X.npy"), mmap_mode="r")
+            data["lst_kernel"] = np.load(self._file(subject, "_lst_kernel.npy"), mmap_mode="r")
+        return data
+
+    def choose_subjects(self, featureXt: ndarray, k: int = 1, subjects: Optional[List] = None):
+        """Choose the k most appropriate stored subjects for a target according to dte.
+
+        The same ranking as choose_multiple_subjects, computed from the stored statistics, with the
+        subjects scored concurrently.
+
+        Parameters
+        ----------
+        featureXt : ndarray
+            Target features from mekt_feature, shape (n_trials, n_features).
+        k : int
+            k subjects, by default 1.
+        subjects : list, optional
+            Candidate subjects, by default all stored subjects.
+
+        Returns
+        -------
+        selected_subjects : list
+            Selected subject ids, best first.
+        """
+        subjects = self.subjects if subjects is None else [str(s) for s in subjects]
+        mean_t = np.mean(featureXt, axis=0)
+        n_t = len(featureXt)
+
+        def score(subject):
+            with np.load(self._file(subject)) as f:
+                counts, class_means, dis = f["counts"], f["class_means"], f["dis"]
+            n_s = np.sum(counts)
+            mean_s = counts @ class_means / n_s
+            dif = np.linalg.norm(_domain_difference(mean_s, n_s, mean_t, n_t), 1)
+            return dis / (dif + np.finfo(np.float64).resolution)
+
+        ranks = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(score)(subject) for subject in subjects
+        )
+        ranks = np.argsort(ranks)[::-1]
+        return [subjects[i] for i in ranks[:k]]
+
+    def source_data(self, subjects: List):
+        """Concatenated features and labels of stored subjects, with their pooled scatter matrices.
+
+        Parameters
+        ----------
+        subjects : list
+            Subject ids.
+
+        Returns
+        -------
+        features : ndarray
+            Source features, shape (n_trials, n_features).
+        y : ndarray
+            Source labels, shape (n_trials,).
+        scatter : tuple of ndarray
+            Within-class and between-class scatter matrices of the concatenated features, the same
+            as source_discriminability(features, y).
+        """
+        data = [self.load(subject) for subject in subjects]
+        features = np.concatenate([d["features"] for d in data], axis=0)
+        y = np.concatenate([d["y"] for d in data], axis=0)
+        classes = np.unique(y)
+        n_features = features.shape[-1]
+
+        n_c = np.zeros(len(classes))
+        sums = np.zeros((len(classes), n_features))
+        for d in data:
+            ix = np.searchsorted(classes, d["classes"])
+            n_c[ix] += d["counts"]
+            sums[ix] += d["counts"][:, np.newaxis] * d["class_means"]
+        means = sums / n_c[:, np.newaxis]
+        mean_total = sums.sum(axis=0) / n_c.sum()
+
+        Sw = np.zeros((n_features, n_features))
+        for d in data:
+            ix = np.searchsorted(classes, d["classes"])
+            diff = d["class_means"] - means[ix]
+            Sw += np.sum(d["class_scatter"], axis=0)
+            Sw += (d["counts"][:, np.newaxis] * diff).T @ diff
+        diff = means - mean_total
+        Sb = (n_c[:, np.newaxis] * diff).T @ diff
+        return features, y, (Sw, Sb)
+
+
+def _domain_difference(mean_s, n_s, mean_t, n_t):
+    """scatter_matrix(concatenate((Xs, Xt)), domain labels) of dte from the domain means."""
+    M = (n_s * mean_s + n_t * mean_t) / (n_s + n_t)
+    Sb = np.zeros((len(M), len(M)))
+    for n, mean in ((n_s, mean_s), (n_t, mean_t)):
+        diff = (np.mean(mean) - M)[np.newaxis, :]
+        Sb += n * diff.T @ diff
+    return Sb
@@ -9,8 +9,7 @@ import numpy as np
 from numpy import ndarray
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.covariance import oas, ledoit_wolf, fast_mcd, empirical_covariance
-from joblib import Parallel, delayed
-from scipy.linalg import eigh
+from joblib import Parallel, delayed, effective_n_jobs
 
 estimator = Callable[[ndarray], ndarray]
 
@@ -167,6 +166,89 @@ def _mcd(X: ndarray) -> ndarray:
     return C
 
 
+def _batch_cov(X: ndarray) -> ndarray:
+    """Batched sample covariance estimator, same as _cov on each trial.
+
+    Parameters
+    ----------
+    X : ndarray
+        EEG signal, shape (n_trials, n_channels, n_samples).
+
+    Returns
+    -------
+    C : ndarray
+        Estimated covariances, shape (n_trials, n_channels, n_channels).
+    """
+    X = X - np.mean(X, axis=-1, keepdims=True)
+    return X @ np.swapaxes(X, -1, -2) / X.shape[-1]
+
+
+def _batch_shrink(C: ndarray, shrinkage: ndarray) -> ndarray:
+    """Shrink covariances towards the scaled identity, (1 - shrinkage) * C + shrinkage * mu * I."""
+    n_channels = C.shape[-1]
+    mu = np.trace(C, axis1=-2, axis2=-1) / n_channels
+    C = (1 - shrinkage)[:, np.newaxis, np.newaxis] * C
+    C[:, np.arange(n_channels), np.arange(n_channels)] += (shrinkage * mu)[:, np.newaxis]
+    return C
+
+
+def _batch_lwf(X: ndarray) -> ndarray:
+    """Batched ledoit wolf covariance estimator, same as _lwf on each trial.
+
+    Parameters
+    ----------
+    X : ndarray
+        EEG signal, shape (n_trials, n_channels, n_samples).
+
+    Returns
+    -------
+    C : ndarray
+        Estimated covariances, shape (n_trials, n_channels, n_channels).
+    """
+    n_channels, n_samples = X.shape[-2:]
+    X = X - np.mean(X, axis=-1, keepdims=True)
+    C = X @ np.swapaxes(X, -1, -2) / n_samples
+    if n_channels == 1:
+        return C
+    # closed-form shrinkage of sklearn.covariance.ledoit_wolf_shrinkage
+    mu = np.trace(C, axis1=-2, axis2=-1) / n_channels
+    beta_ = np.sum(np.sum(X**2, axis=-2) ** 2, axis=-1)
+    delta_ = np.sum(C**2, axis=(-2, -1))
+    beta = (beta_ / n_samples - delta_) / (n_channels * n_samples)
+    delta = (delta_ - n_channels * mu**2) / n_channels
+    beta = np.minimum(beta, delta)
+    shrinkage = np.divide(beta, delta, out=np.zeros_like(beta), where=beta != 0)
+    return _batch_shrink(C, shrinkage)
+
+
+def _batch_oas(X: ndarray) -> ndarray:
+    """Batched oas covariance estimator, same as _oas on each trial.
+
+    Parameters
+    ----------
+    X : ndarray
+        EEG signal, shape (n_trials, n_channels, n_samples).
+
+    Returns
+    -------
+    C : ndarray
+        Estimated covariances, shape (n_trials, n_channels, n_channels).
+    """
+    n_channels, n_samples = X.shape[-2:]
+    C = _batch_cov(X)
+    if n_channels == 1:
+        return C
+    # closed-form shrinkage of sklearn.covariance.oas
+    alpha = np.mean(C**2, axis=(-2, -1))
+    mu = np.trace(C, axis1=-2, axis2=-1) / n_channels
+    num = alpha + mu**2
+    den = (n_samples + 1) * (alpha - mu**2 / n_channels)
+    shrinkage = np.ones_like(num)
+    np.divide(num, den, out=shrinkage, where=den != 0)
+    shrinkage = np.minimum(shrinkage, 1.0)
+    return _batch_shrink(C, shrinkage)
+
+
 estimators = {
     "cov": _cov,
     "lwf": _lwf,
@@ -174,6 +256,13 @@ estimators = {
     "mcd": _mcd,
 }
 
+# estimators computing all the trials at once, the others run trial by trial
+batch_estimators = {
+    "cov": _batch_cov,
+    "lwf": _batch_lwf,
+    "oas": _batch_oas,
+}
+
 
 def _check_est(est: Union[str, estimator]) -> estimator:
     """Check if a given estimator is valid.
@@ -224,7 +313,8 @@ def covariances(
 
             `mcd`: minimum covariance determinant covariance estimator
     n_jobs : int or None, optional
-        The number of CPUs to use to do the computation (the default is 1, -1 for all processors).
+        The number of CPUs to use to do the computation (the default is 1, -1 for all processors),
+        only used by the estimators computed trial by trial, `cov`, `lwf` and `oas` are batched.
 
     Returns
     -------
@@ -240,9 +330,12 @@ def covariances(
     shape = X.shape
     X = np.reshape(X, (-1, shape[-2], shape[-1]))
 
-    parallel = Parallel(n_jobs=n_jobs)
-    est = _check_est(estimator)
-    covmats = parallel(delayed(est)(x) for x in X)
+    if isinstance(estimator, str) and estimator in batch_estimators:
+        covmats = batch_estimators[estimator](X)
+    else:
+        parallel = Parallel(n_jobs=n_jobs)
+        est = _check_est(estimator)
+        covmats = parallel(delayed(est)(x) for x in X)
 
     covmats = np.reshape(covmats, (*shape[:-2], shape[-2], shape[-2]))
     return covmats
@@ -312,30 +405,45 @@ class Covariance(BaseEstimator, TransformerMixin):
         return covmats
 
 
+def _batch_matrix_operator(Ci: ndarray, operator: estimator) -> ndarray:
+    """Apply operator to a stack of symmetric matrices, shape (n_matrices, N, N)."""
+    eigvals, eigvects = np.linalg.eigh(Ci)
+    return (eigvects * operator(eigvals)[..., np.newaxis, :]) @ np.swapaxes(
+        eigvects, -1, -2
+    )
+
+
+# below this number of matrices one stacked eigh is faster than dispatching jobs
+_PARALLEL_MIN_MATRICES = 1024
+
+
 def matrix_operator(
-    Ci: ndarray, operator: estimator, n_jobs: Optional[int] = None
+    Ci: ndarray,
+    operator: estimator,
+    n_jobs: Optional[int] = None,
+    dtype: Optional[str] = None,
 ) -> ndarray:
     """Apply operator to any matrix.
 
+    All the matrices are decomposed by one stacked eigh and rebuilt with broadcasting, joblib threads
+    are only used to split the stack into chunks when there are many matrices.
+
     Parameters
     ----------
     Ci : ndarray
-        Input positive definite matrix.
+        Input positive definite matrix, shape (..., N, N).
     operator : callable object
-        Operator function or callable object.
+        Operator function or callable object, applied elementwise to the eigenvalues.
     n_jobs: int, optional
-        the number of jobs to use.
+        the number of jobs to use, only used for more than 1024 matrices.
+    dtype: str, optional
+        Computation precision, e.g. float32 for speed, by default the precision of Ci.
 
     Returns
     -------
     Co : ndarray
         Operated matrix.
 
-    Raises
-    ------
-    ValueError
-        If Ci is not positive definite.
-
     Notes
     -----
     .. math::
@@ -345,30 +453,35 @@ def matrix_operator(
     where :math:`\mathbf{\Lambda}` is the diagonal matrix of eigenvalues
     and :math:`\mathbf{V}` the eigenvectors of :math:`\mathbf{Ci}`.
     """
-
-    def _single_matrix_operator(Ci: ndarray, operator: estimator) -> ndarray:
-        eigvals, eigvects = eigh(Ci, check_finite=False)
-        eigvals = np.diag(operator(eigvals))
-        Co = eigvects @ eigvals @ eigvects.T
-        return Co
-
+    Ci = np.asarray(Ci)
     ori_shape = Ci.shape
-    Ci = Ci.reshape((-1, *ori_shape[-2:]))
-    Co = Parallel(n_jobs=n_jobs)(
-        delayed(_single_matrix_operator)(C, operator) for C in Ci
+    Ci = Ci.reshape((-1, *ori_shape[-2:])).astype(
+        np.result_type(Ci.dtype, np.float32) if dtype is None else dtype, copy=False
     )
-    Co = np.stack(Co)
+    n_matrices = len(Ci)
+    if n_jobs in (None, 1) or n_matrices < _PARALLEL_MIN_MATRICES:
+        Co = _batch_matrix_operator(Ci, operator)
+    else:
+        n_chunks = min(effective_n_jobs(n_jobs), n_matrices)
+        chunks = np.array_split(np.arange(n_matrices), n_chunks)
+        Co = np.concatenate(
+            Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(_batch_matrix_operator)(Ci[chunk], operator) for chunk in chunks
+            )
+        )
     Co = Co.reshape((*ori_shape,))
     return Co
 
 
-def sqrtm(Ci: ndarray, n_jobs: Optional[int] = None):
+def sqrtm(Ci: ndarray, n_jobs: Optional[int] = None, dtype: Optional[str] = None):
     """Return the matrix square root of a covariance matrix.
 
     Parameters
     ----------
     Ci : ndarray
         Input positive-definite matrix.
+    dtype : str, optional
+        Computation precision, e.g. float32, see matrix_operator.
 
     Returns
     -------
@@ -383,16 +496,18 @@ def sqrtm(Ci: ndarray, n_jobs: Optional[int] = None):
     where :math:`\mathbf{\Lambda}` is the diagonal matrix of eigenvalues
     and :math:`\mathbf{V}` the eigenvectors of :math:`\mathbf{Ci}`.
     """
-    return matrix_operator(Ci, np.sqrt, n_jobs=n_jobs)
+    return matrix_operator(Ci, np.sqrt, n_jobs=n_jobs, dtype=dtype)
 
 
-def logm(Ci: ndarray, n_jobs: Optional[int] = None):
+def logm(Ci: ndarray, n_jobs: Optional[int] = None, dtype: Optional[str] = None):
     """Return the matrix logrithm of a covariance matrix.
 
     Parameters
     ----------
     Ci : ndarray
         Input positive-definite matrix.
+    dtype : str, optional
+        Computation precision, e.g. float32, see matrix_operator.
 
     Returns
     -------
@@ -407,16 +522,18 @@ def logm(Ci: ndarray, n_jobs: Optional[int] = None):
     where :math:`\mathbf{\Lambda}` is the diagonal matrix of eigenvalues
     and :math:`\mathbf{V}` the eigenvectors of :math:`\mathbf{Ci}`.
     """
-    return matrix_operator(Ci, np.log, n_jobs=n_jobs)
+    return matrix_operator(Ci, np.log, n_jobs=n_jobs, dtype=dtype)
 
 
-def expm(Ci: ndarray, n_jobs: Optional[int] = None):
+def expm(Ci: ndarray, n_jobs: Optional[int] = None, dtype: Optional[str] = None):
     """Return the matrix exponential of a covariance matrix.
 
     Parameters
     ----------
     Ci : ndarray
         Input positive-definite matrix.
+    dtype : str, optional
+        Computation precision, e.g. float32, see matrix_operator.
 
     Returns
     -------
@@ -431,16 +548,18 @@ def expm(Ci: ndarray, n_jobs: Optional[int] = None):
     where :math:`\mathbf{\Lambda}` is the diagonal matrix of eigenvalues
     and :math:`\mathbf{V}` the eigenvectors of :math:`\mathbf{Ci}`.
     """
-    return matrix_operator(Ci, np.exp, n_jobs=n_jobs)
+    return matrix_operator(Ci, np.exp, n_jobs=n_jobs, dtype=dtype)
 
 
-def invsqrtm(Ci: ndarray, n_jobs: Optional[int] = None):
+def invsqrtm(Ci: ndarray, n_jobs: Optional[int] = None, dtype: Optional[str] = None):
     """Return the inverse matrix square root of a covariance matrix.
 
     Parameters
     ----------
     Ci : ndarray
         Input positive-definite matrix.
+    dtype : str, optional
+        Computation precision, e.g. float32, see matrix_operator.
 
     Returns
     -------
@@ -459,10 +578,10 @@ def invsqrtm(Ci: ndarray, n_jobs: Optional[int] = None):
     def isqrt(x):
         return 1.0 / np.sqrt(x)
 
-    return matrix_operator(Ci, isqrt, n_jobs=n_jobs)
+    return matrix_operator(Ci, isqrt, n_jobs=n_jobs, dtype=dtype)
 
 
-def powm(Ci: ndarray, alpha: float, n_jobs: Optional[int] = None):
+def powm(Ci: ndarray, alpha: float, n_jobs: Optional[int] = None, dtype: Optional[str] = None):
     """Return the matrix power of a covariance matrix.
 
     Parameters
@@ -471,6 +590,8 @@ def powm(Ci: ndarray, alpha: float, n_jobs: Optional[int] = None):
         Input positive-definite matrix.
     alpha : float
         Exponent.
+    dtype : str, optional
+        Computation precision, e.g. float32, see matrix_operator.
 
     Returns
     -------
@@ -486,4 +607,4 @@ def powm(Ci: ndarray, alpha: float, n_jobs: Optional[int] = None):
     and :math:`\mathbf{V}` the eigenvectors of :math:`\mathbf{Ci}`.
     """
     power = partial(lambda x, alpha=None: x**alpha, alpha=alpha)
-    return matrix_operator(Ci, power, n_jobs=n_jobs)
+    return matrix_operator(Ci, power, n_jobs=n_jobs, dtype=dtype)
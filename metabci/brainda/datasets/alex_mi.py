@@ -98,6 +98,7 @@ class AlexMI(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ]
         ]
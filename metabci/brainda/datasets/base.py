@@ -9,16 +9,79 @@ Basic elements to describe a BCI dataset.
 Modified from https://github.com/NeuroTechX/moabb
 """
 from abc import ABCMeta, abstractmethod
-from typing import Union, Optional, Dict, List, Tuple
+from typing import Union, Optional, Dict, List, Tuple, NamedTuple
 from pathlib import Path
 
-from mne.io import Raw
-from mne.utils import verbose
+import numpy as np
+from numpy import ndarray
+from joblib import Parallel, delayed, hash as joblib_hash
+from mne import Info
+from mne.io import Raw, RawArray
+from mne.utils import verbose, logger
+
+from ..utils.download import DownloadReport
+
+
+class EpochsArray(NamedTuple):
+    """Trials of a pre-epoched run, as returned by the optional get_epochs_array of a dataset.
+
+    Datasets stored as epochs can implement
+
+        get_epochs_array(subject) -> {'session_id': {'run_id': EpochsArray}}
+
+    with the same sessions and runs as get_data, then paradigms cut the epochs from these arrays with
+    NumPy indexing instead of epoching the continuous Raw objects with MNE.
+
+    Attributes
+    ----------
+    data : ndarray
+        trials in volt, possibly a strided view, shape (n_trials, n_channels, n_times)
+    ch_names : List[str]
+        channel names of data, uppercase
+    labels : ndarray
+        event id of each trial, in trial order, shape (n_trials,)
+    onset : int
+        sample index of the event in each trial
+    """
+
+    data: ndarray
+    ch_names: List[str]
+    labels: ndarray
+    onset: int
+
+
+def epochs_array_to_raw(epochs: EpochsArray, info: Info) -> RawArray:
+    """Concatenate the trials of a pre-epoched run into a continuous RawArray.
+
+    Parameters
+    ----------
+    epochs : EpochsArray
+        trials of the run
+    info : Info
+        info of the channels of epochs followed by a stim channel
+
+    Returns
+    -------
+    RawArray
+        continuous data, with the labels written on the last stim channel at the onset of each trial
+    """
+    n_trials, n_channels, n_times = epochs.data.shape
+    data = np.zeros((n_channels + 1, n_trials * n_times))
+    data[:-1] = np.reshape(np.transpose(epochs.data, (1, 0, 2)), (n_channels, -1))
+    data[-1, epochs.onset::n_times] = epochs.labels
+    return RawArray(data=data, info=info)
 
 
 class BaseDataset(metaclass=ABCMeta):
     """BaseDataset for all datasets."""
 
+    # expected hashes of the downloaded files, 'sha256:<hex>' keyed by url or file name, checked by
+    # mne_data_path, files without an entry are only recorded in the manifest of the dataset folder
+    _KNOWN_HASHES: Dict[str, str] = {}
+
+    # public instance attributes that do not change the loaded data, e.g. local paths, left out of cache_key
+    _CACHE_KEY_EXCLUDE: Tuple[str, ...] = ()
+
     def __init__(
             self,
             dataset_code: str,
@@ -70,6 +133,24 @@ class BaseDataset(metaclass=ABCMeta):
         self.srate = srate
         self.paradigm = paradigm
 
+    def cache_key(self) -> str:
+        """Identify the data loaded by this instance, used by the epoch cache of the paradigms.
+
+        Datasets may share a dataset_code and still load different data, e.g. PhysionetMI and PhysionetME.
+        The key is the qualified name of the class and the hash of the public instance attributes, except
+        those in _CACHE_KEY_EXCLUDE. Override it if the loaded data depend on other state.
+
+        Returns
+        -------
+        str
+            module.qualname:digest
+        """
+        options = {
+            name: value for name, value in vars(self).items()
+            if not name.startswith("_") and name not in self._CACHE_KEY_EXCLUDE
+        }
+        return "{}.{}:{}".format(type(self).__module__, type(self).__qualname__, joblib_hash(options))
+
     @abstractmethod
     def data_path(
             self,
@@ -136,6 +217,7 @@ class BaseDataset(metaclass=ABCMeta):
     def get_data(
             self,
             subjects: List[Union[int, str]],
+            n_jobs: Optional[int] = None,
             verbose: Optional[Union[bool, str, int]] = None,
     ) -> Dict[Union[int, str], Dict[str, Dict[str, Raw]]]:
         """Get raw data.
@@ -144,6 +226,8 @@ class BaseDataset(metaclass=ABCMeta):
         ----------
         subjects : List[Union[int, str]]
             subjects whose data should be returned
+        n_jobs : Optional[int], optional
+            the number of threads reading subjects concurrently, by default None, one at a time
 
         Returns
         -------
@@ -162,12 +246,14 @@ class BaseDataset(metaclass=ABCMeta):
         if subjects is None:
             subjects = self.subjects
 
-        data = dict()
         for subject in subjects:
             if subject not in self.subjects:
                 raise ValueError("Invalid subject {} given".format(subject))
-            data[subject] = self._get_single_subject_data(subject)
-        return data
+        # reading and parsing files is mostly I/O and C code, threads are enough
+        results = Parallel(n_jobs=n_jobs, prefer="threads")(
+            delayed(self._get_single_subject_data)(subject) for subject in subjects
+        )
+        return dict(zip(subjects, results))
 
     def __str__(self):
         event_info = "\n".join(
@@ -193,10 +279,13 @@ class BaseDataset(metaclass=ABCMeta):
             path: Optional[Union[str, Path]] = None,
             force_update: bool = False,
             proxies: Optional[Dict[str, str]] = None,
+            n_jobs: Optional[int] = None,
             verbose: Optional[Union[bool, str, int]] = None,
-    ):
+    ) -> DownloadReport:
         """Download all files.
 
+        Files already downloaded and intact are skipped, see mne_data_path.
+
         Parameters
         ----------
         path : Optional[Union[str, Path]], optional
@@ -209,17 +298,29 @@ class BaseDataset(metaclass=ABCMeta):
             force update of the dataset even if a local copy exists, by default False
         proxies: Optional[Union[bool, str, int]], optional
             proxies if needed
+        n_jobs : Optional[int], optional
+            the number of subjects downloaded concurrently, by default None, one at a time
         verbose : Optional[Union[bool, str, int]], optional
             [description], by default None
+
+        Returns
+        -------
+        DownloadReport
+            number of files and bytes downloaded, and throughput
         """
-        for subject in self.subjects:
-            self.data_path(
-                subject,
-                path=path,
-                proxies=proxies,
-                force_update=force_update,
-                update_path=True,
+        with DownloadReport() as report:
+            Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(self.data_path)(
+                    subject,
+                    path=path,
+                    proxies=proxies,
+                    force_update=force_update,
+                    update_path=True,
+                )
+                for subject in self.subjects
             )
+        logger.info("{:s}: {}".format(self.dataset_code, report))
+        return report
 
 
 class BaseTimeEncodingDataset(BaseDataset):
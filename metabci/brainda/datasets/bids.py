@@ -56,6 +56,7 @@ class matchingpennies(BaseDataset):
     _CHANNELS = [
         'FC5', 'FC1', 'C3', 'CP5', 'CP1', 'FC2', 'FC6', 'C4', 'CP2', 'CP6'
     ]
+    _CACHE_KEY_EXCLUDE = ("data_dest",)
 
     def __init__(self):
         super().__init__(
@@ -73,6 +74,7 @@ class matchingpennies(BaseDataset):
             force_update=False,
             update_path=None,
             proxies=None,
+            known_hash=self._KNOWN_HASHES,
             verbose=None
         )
         # check if the data_dest is a folder
@@ -16,7 +16,7 @@ from mne.channels import make_standard_montage
 from .base import BaseDataset
 from ..utils.download import mne_data_path
 from ..utils.channels import upper_ch_names
-from ..utils.io import loadmat
+from ..utils.io import load_mat_files
 
 BNCI_URL = "http://bnci-horizon-2020.eu/database/data-sets/"
 
@@ -130,6 +130,7 @@ class BNCI2014001(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ],
             [
@@ -140,6 +141,7 @@ class BNCI2014001(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ],
         ]
@@ -155,9 +157,12 @@ class BNCI2014001(BaseDataset):
         )
         # montage.ch_names = [ch_name.upper() for ch_name in montage.ch_names]
 
+        sess_mats = load_mat_files(
+            [run_dests[0] for run_dests in dests], variable_names=["data"]
+        )
         sess = dict()
-        for isess, run_dests in enumerate(dests):
-            run_arrays = loadmat(run_dests[0])["data"]
+        for isess, sess_mat in enumerate(sess_mats):
+            run_arrays = sess_mat["data"]
             runs = dict()
             for irun, run_array in enumerate(run_arrays):
                 X = run_array.X.T * 1e-6  # volt
@@ -292,6 +297,7 @@ class BNCI2014004(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ],
             [
@@ -302,6 +308,7 @@ class BNCI2014004(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ],
         ]
@@ -317,7 +324,8 @@ class BNCI2014004(BaseDataset):
         )
         # montage.ch_names = [ch_name.upper() for ch_name in montage.ch_names]
 
-        sess_arrays = np.append(loadmat(dests[0][0])["data"], loadmat(dests[1][0])["data"])
+        sess_mats = load_mat_files([dests[0][0], dests[1][0]], variable_names=["data"])
+        sess_arrays = np.append(sess_mats[0]["data"], sess_mats[1]["data"])
 
         sess = dict()
         for isess, sess_array in enumerate(sess_arrays):
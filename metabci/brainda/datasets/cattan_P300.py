@@ -223,6 +223,7 @@ class Cattan_P300(BaseTimeEncodingDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ]
         ]
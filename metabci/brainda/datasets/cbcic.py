@@ -14,7 +14,7 @@ from mne.io import Raw, RawArray, read_raw_edf
 from mne.channels import make_standard_montage
 from .base import BaseDataset, BaseTimeEncodingDataset
 from ..utils.channels import upper_ch_names
-from ..utils.io import loadmat
+from ..utils.io import load_mat_files
 
 # no available links now
 CBCIC2019001_URL = "file:///CBCIC2019001"
@@ -142,6 +142,7 @@ class CBCIC2019001(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ]
         ]
@@ -160,8 +161,9 @@ class CBCIC2019001(BaseDataset):
         sess = dict()
         for isess, run_dests in enumerate(dests):
             runs = dict()
-            for irun, run_file in enumerate(run_dests):
-                raw_mat = loadmat(run_file)["EEG"]
+            run_mats = load_mat_files(run_dests, variable_names=["EEG"])
+            for irun, run_mat in enumerate(run_mats):
+                raw_mat = run_mat["EEG"]
                 epoch_data = raw_mat["data"][:-5] * 1e-6
                 stim = np.zeros((1, epoch_data.shape[-1]))
                 for event in raw_mat["event"]:
@@ -300,6 +302,7 @@ class CBCIC2019004(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             )
 
@@ -319,8 +322,8 @@ class CBCIC2019004(BaseDataset):
         sess = dict()
         for isess, run_dests in enumerate(dests):
             runs = dict()
-            for irun, run_file in enumerate(run_dests):
-                raw_mat = loadmat(run_file)
+            run_mats = load_mat_files(run_dests, variable_names=["data"])
+            for irun, raw_mat in enumerate(run_mats):
                 epoch_data = raw_mat["data"][:-6] * 1e-6
                 stims = raw_mat["data"][-1][np.newaxis, :]
                 data = np.concatenate((epoch_data, stims), axis=0)
@@ -16,7 +16,7 @@ from mne.channels import make_standard_montage
 from .base import BaseDataset
 from ..utils.download import mne_data_path
 from ..utils.channels import upper_ch_names
-from ..utils.io import loadmat
+from ..utils.io import load_mat_files
 
 GIGA_URL = "ftp://penguin.genomics.cn/pub/10.5524/100001_101000/100295/mat_data/"
 
@@ -163,6 +163,7 @@ class Cho2017(BaseDataset):
             proxies=proxies,
             force_update=force_update,
             update_path=update_path,
+            known_hash=self._KNOWN_HASHES,
         )
         dests = [[file_dest]]
 
@@ -181,8 +182,9 @@ class Cho2017(BaseDataset):
         sess = dict()
         for isess, run_dests in enumerate(dests):
             runs = dict()
-            for irun, run_file in enumerate(run_dests):
-                raw_mat = loadmat(run_file)["eeg"]
+            run_mats = load_mat_files(run_dests, variable_names=["eeg"])
+            for irun, run_mat in enumerate(run_mats):
+                raw_mat = run_mat["eeg"]
                 eeg_data_l = np.concatenate(
                     (
                         raw_mat["imagery_left"] * 1e-6,
@@ -100,6 +100,7 @@ class MunichMI(BaseDataset):
             proxies=proxies,
             force_update=force_update,
             update_path=update_path,
+            known_hash=self._KNOWN_HASHES,
         )
 
         url = "{:s}subject{:d}.set".format(MUNICH_URL, subject)
@@ -112,6 +113,7 @@ class MunichMI(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             ]
         ]
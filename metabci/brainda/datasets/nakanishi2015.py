@@ -11,9 +11,9 @@ from pathlib import Path
 
 import numpy as np
 from mne import create_info
-from mne.io import RawArray, Raw
+from mne.io import Raw
 from mne.channels import make_standard_montage
-from .base import BaseDataset
+from .base import BaseDataset, EpochsArray, epochs_array_to_raw
 from ..utils.download import mne_data_path
 from ..utils.channels import upper_ch_names
 from ..utils.io import loadmat
@@ -89,11 +89,37 @@ class Nakanishi2015(BaseDataset):
             proxies=proxies,
             force_update=force_update,
             update_path=update_path,
+            known_hash=self._KNOWN_HASHES,
         )
 
         dests = [[file_dest]]
         return dests
 
+    def get_epochs_array(
+        self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
+    ) -> Dict[str, Dict[str, EpochsArray]]:
+        dests = self.data_path(subject)
+        raw_mat = loadmat(dests[0][0], variable_names=["eeg"])
+        n_samples, n_channels, n_trials = 1114, 8, 15
+        n_classes = 12
+
+        data = np.transpose(raw_mat["eeg"], axes=(0, 3, 1, 2))
+        data = np.reshape(data, newshape=(-1, n_channels, n_samples))
+        data = data - data.mean(axis=2, keepdims=True)
+        labels = np.array([n_trials * [i + 1] for i in range(n_classes)]).flatten()
+
+        buff = (data.shape[0], n_channels, 50)
+        data = np.concatenate([np.zeros(buff), 1e-6 * data, np.zeros(buff)], axis=2)
+
+        epochs = EpochsArray(
+            data=data,
+            ch_names=[ch_name.upper() for ch_name in self._CHANNELS],
+            labels=labels,
+            onset=50 + 38,
+        )
+        sess = {"session_0": {"run_0": epochs}}
+        return sess
+
     def _get_single_subject_data(
         self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
     ) -> Dict[str, Dict[str, Raw]]:
@@ -103,27 +129,12 @@ class Nakanishi2015(BaseDataset):
         )
         # montage.ch_names = [ch_name.upper() for ch_name in montage.ch_names]
 
-        dests = self.data_path(subject)
-        raw_mat = loadmat(dests[0][0])
-        n_samples, n_channels, n_trials = 1114, 8, 15
-        n_classes = 12
-
-        data = np.transpose(raw_mat["eeg"], axes=(0, 3, 1, 2))
-        data = np.reshape(data, newshape=(-1, n_channels, n_samples))
-        data = data - data.mean(axis=2, keepdims=True)
-        raw_events = np.zeros((data.shape[0], 1, n_samples))
-        raw_events[:, 0, 38] = np.array(
-            [n_trials * [i + 1] for i in range(n_classes)]
-        ).flatten()
-        data = np.concatenate([1e-6 * data, raw_events], axis=1)
-
-        buff = (data.shape[0], n_channels + 1, 50)
-        data = np.concatenate([np.zeros(buff), data, np.zeros(buff)], axis=2)
+        epochs = self.get_epochs_array(subject)["session_0"]["run_0"]
         ch_names = self._CHANNELS + ["stim"]
         ch_types = ["eeg"] * len(self._CHANNELS) + ["stim"]
 
         info = create_info(ch_names=ch_names, ch_types=ch_types, sfreq=self.srate)
-        raw = RawArray(data=np.concatenate(list(data), axis=1), info=info)
+        raw = epochs_array_to_raw(epochs, info)
         raw = upper_ch_names(raw)
         raw.set_montage(montage)
 
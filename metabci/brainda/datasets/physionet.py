@@ -201,6 +201,7 @@ class BasePhysionet(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
             )
         return [dests]
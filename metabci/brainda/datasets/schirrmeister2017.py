@@ -231,6 +231,7 @@ class Schirrmeister2017(BaseDataset):
                     proxies=proxies,
                     force_update=force_update,
                     update_path=update_path,
+                    known_hash=self._KNOWN_HASHES,
                 )
                 for t in ["train", "test"]
             ]
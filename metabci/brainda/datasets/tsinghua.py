@@ -14,10 +14,10 @@ from pathlib import Path
 import numpy as np
 import py7zr
 from mne import create_info
-from mne.io import RawArray, Raw
+from mne.io import Raw
 from mne.channels import make_standard_montage
 
-from .base import BaseDataset
+from .base import BaseDataset, EpochsArray, epochs_array_to_raw
 from ..utils.download import mne_data_path
 from ..utils.io import loadmat
 
@@ -33,6 +33,43 @@ BETA_URL = "http://bci.med.tsinghua.edu.cn/upload/liubingchuan/"  # 403 error
 # BETA_URL = 'https://figshare.com/articles/The_BETA_database/12264401'
 
 
+def _recorded_channels(channels: List[str]) -> List[str]:
+    """All the 64 recorded channels, including M1, M2, CB1 and CB2."""
+    ch_names = [ch_name.upper() for ch_name in channels]
+    ch_names.insert(32, "M1")
+    ch_names.insert(42, "M2")
+    ch_names.insert(59, "CB1")
+    ch_names = ch_names + ["CB2"]
+    return ch_names
+
+
+def _epochs_array_to_raws(
+    sess: Dict[str, Dict[str, EpochsArray]], srate: float
+) -> Dict[str, Dict[str, Raw]]:
+    montage = make_standard_montage("standard_1005")
+    montage.rename_channels(
+        {ch_name: ch_name.upper() for ch_name in montage.ch_names}
+    )
+    epochs = next(iter(next(iter(sess.values())).values()))
+    ch_names = list(epochs.ch_names) + ["STI 014"]
+    ch_types = ["eeg"] * 65
+    ch_types[59] = "misc"
+    ch_types[63] = "misc"
+    ch_types[-1] = "stim"
+
+    info = create_info(ch_names=ch_names,
+                       ch_types=ch_types, sfreq=srate)
+
+    raw_sess: Dict[str, Dict[str, Raw]] = dict()
+    for session, runs in sess.items():
+        raw_sess[session] = dict()
+        for run, epochs in runs.items():
+            raw = epochs_array_to_raw(epochs, info)
+            raw.set_montage(montage)
+            raw_sess[session][run] = raw
+    return raw_sess
+
+
 class Wang2016(BaseDataset):
     """SSVEP dataset from Yijun Wang.
 
@@ -151,6 +188,7 @@ class Wang2016(BaseDataset):
             proxies=proxies,
             force_update=force_update,
             update_path=update_path,
+            known_hash=self._KNOWN_HASHES,
         )
 
         subject_file = file_dest[:-3]
@@ -161,48 +199,34 @@ class Wang2016(BaseDataset):
         dests = [[subject_file]]
         return dests
 
-    def _get_single_subject_data(
+    def get_epochs_array(
         self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
-    ) -> Dict[str, Dict[str, Raw]]:
+    ) -> Dict[str, Dict[str, EpochsArray]]:
         dests = self.data_path(subject)
-        raw_mat = loadmat(dests[0][0])
+        raw_mat = loadmat(dests[0][0], variable_names=["data"])
+        # electrode, time, target, block
         epoch_data = raw_mat["data"] * 1e-6
-        stim = np.zeros((1, *epoch_data.shape[1:]))
-        # insert event label at stimulus-onset
-        # 0.5s latency
-        stim[0, 125] = np.tile(
-            np.arange(1, 41)[:, np.newaxis], (1, epoch_data.shape[-1])
-        )
-        epoch_data = np.concatenate((epoch_data, stim), axis=0)
-        data = np.transpose(epoch_data, (0, 3, 2, 1))
-
-        montage = make_standard_montage("standard_1005")
-        montage.rename_channels(
-            {ch_name: ch_name.upper() for ch_name in montage.ch_names}
-        )
-        ch_names = [ch_name.upper() for ch_name in self._CHANNELS]
-        ch_names.insert(32, "M1")
-        ch_names.insert(42, "M2")
-        ch_names.insert(59, "CB1")
-        ch_names = ch_names + ["CB2", "STI 014"]
-        ch_types = ["eeg"] * 65
-        ch_types[59] = "misc"
-        ch_types[63] = "misc"
-        ch_types[-1] = "stim"
-
-        info = create_info(ch_names=ch_names,
-                           ch_types=ch_types, sfreq=self.srate)
+        ch_names = _recorded_channels(self._CHANNELS)
+        labels = np.arange(1, epoch_data.shape[-2] + 1)
 
         runs = dict()
-        for i in range(data.shape[1]):
-            raw_data = np.reshape(data[:, i, ...], (data.shape[0], -1))
-            raw = RawArray(data=raw_data, info=info)
-            raw.set_montage(montage)
-            runs["run_{:d}".format(i)] = raw
+        for i in range(epoch_data.shape[-1]):
+            # event label at stimulus-onset, 0.5s latency
+            runs["run_{:d}".format(i)] = EpochsArray(
+                data=np.transpose(epoch_data[..., i], (2, 0, 1)),
+                ch_names=ch_names,
+                labels=labels,
+                onset=125,
+            )
 
         sess = {"session_0": runs}
         return sess
 
+    def _get_single_subject_data(
+        self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
+    ) -> Dict[str, Dict[str, Raw]]:
+        return _epochs_array_to_raws(self.get_epochs_array(subject), self.srate)
+
     def get_freq(self, event: str):
         return self._FREQS[self._EVENTS[event][0] - 1]
 
@@ -313,6 +337,7 @@ class BETA(BaseDataset):
             proxies=proxies,
             force_update=force_update,
             update_path=update_path,
+            known_hash=self._KNOWN_HASHES,
         )
 
         parent_dir = Path(file_dest).parent
@@ -325,45 +350,34 @@ class BETA(BaseDataset):
         dests: List[List[Union[str, Path]]] = [[subject_file]]
         return dests
 
-    def _get_single_subject_data(
+    def get_epochs_array(
         self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
-    ) -> Dict[str, Dict[str, Raw]]:
+    ) -> Dict[str, Dict[str, EpochsArray]]:
         dests = self.data_path(subject)
-        raw_mat = loadmat(dests[0][0])
+        raw_mat = loadmat(dests[0][0], variable_names=["data"])
+        # channel, time, block, condition
         epoch_data = raw_mat["data"]["EEG"] * 1e-6
-        stim = np.zeros((1, *epoch_data.shape[1:]))
-        # 0.5s latency
-        stim[0, 125] = np.tile(np.arange(1, 41), (epoch_data.shape[-2], 1))
-        epoch_data = np.concatenate((epoch_data, stim), axis=0)
-        data = np.transpose(epoch_data, (0, 3, 2, 1))
-
-        montage = make_standard_montage("standard_1005")
-        montage.rename_channels(
-            {ch_name: ch_name.upper() for ch_name in montage.ch_names}
-        )
-        ch_names = [ch_name.upper() for ch_name in self._CHANNELS]
-        ch_names.insert(32, "M1")
-        ch_names.insert(42, "M2")
-        ch_names.insert(59, "CB1")
-        ch_names = ch_names + ["CB2", "STI 014"]
-        ch_types = ["eeg"] * 65
-        ch_types[59] = "misc"
-        ch_types[63] = "misc"
-        ch_types[-1] = "stim"
-
-        info = create_info(ch_names=ch_names,
-                           ch_types=ch_types, sfreq=self.srate)
+        ch_names = _recorded_channels(self._CHANNELS)
+        labels = np.arange(1, epoch_data.shape[-1] + 1)
 
         runs = dict()
-        for i in range(data.shape[-2]):
-            raw_data = np.reshape(data[..., i, :], (data.shape[0], -1))
-            raw = RawArray(data=raw_data, info=info)
-            raw.set_montage(montage)
-            runs["run_{:d}".format(i)] = raw
+        for i in range(epoch_data.shape[-2]):
+            # 0.5s latency
+            runs["run_{:d}".format(i)] = EpochsArray(
+                data=np.transpose(epoch_data[..., i, :], (2, 0, 1)),
+                ch_names=ch_names,
+                labels=labels,
+                onset=125,
+            )
 
         sess = {"session_0": runs}
         return sess
 
+    def _get_single_subject_data(
+        self, subject: Union[str, int], verbose: Optional[Union[bool, str, int]] = None
+    ) -> Dict[str, Dict[str, Raw]]:
+        return _epochs_array_to_raws(self.get_epochs_array(subject), self.srate)
+
     def get_freq(self, event: str):
         return self._FREQS[self._EVENTS[event][0] - 1]
 
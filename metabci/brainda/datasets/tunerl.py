@@ -20,7 +20,7 @@ from mne.channels import make_standard_montage
 from .base import BaseDataset
 from ..utils.download import mne_data_path
 from ..utils.channels import upper_ch_names
-from ..utils.io import loadmat
+from ..utils.io import load_mat_files
 
 Weibo2014_URLs = [
     "https://dataverse.harvard.edu/api/access/datafile/2499178",
@@ -173,6 +173,7 @@ class Weibo2014(BaseDataset):
                 proxies=proxies,
                 force_update=force_update,
                 update_path=update_path,
+                known_hash=self._KNOWN_HASHES,
             )
         elif subject in range(5, 8):
             sub_names = ["ls", "ry", "wcf"]
@@ -184,6 +185,7 @@ class Weibo2014(BaseDataset):
                 proxies=proxies,
                 force_update=force_update,
                 update_path=update_path,
+                known_hash=self._KNOWN_HASHES,
             )
         else:
             sub_names = ["wx", "yyx", "zd"]
@@ -195,6 +197,7 @@ class Weibo2014(BaseDataset):
                 proxies=proxies,
                 force_update=force_update,
                 update_path=update_path,
+                known_hash=self._KNOWN_HASHES,
             )
 
         parent_dir = Path(file_dest).parent
@@ -228,8 +231,8 @@ class Weibo2014(BaseDataset):
         sess = dict()
         for isess, run_dests in enumerate(dests):
             runs = dict()
-            for irun, run_file in enumerate(run_dests):
-                raw_mat = loadmat(run_file)
+            run_mats = load_mat_files(run_dests, variable_names=["data", "label"])
+            for irun, raw_mat in enumerate(run_mats):
                 epoch_data = raw_mat["data"] * 1e-6
                 label = raw_mat["label"]
 
@@ -7,18 +7,28 @@
 Base Paradigm Design.
 
 """
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import types
 from abc import ABCMeta, abstractmethod
-from typing import Union, Dict, List, Optional, Tuple
+from typing import Union, Dict, List, Optional, Tuple, cast
 
 import numpy as np
 import pandas as pd
 import mne
 from mne.utils import verbose
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs, hash as joblib_hash
 from ..utils import pick_channels
 from ..datasets.base import BaseDataset, BaseTimeEncodingDataset
 
 
+# bump when the cached content of _get_single_subject_data changes
+_EPOCH_CACHE_VERSION = 1
+
+
 def label_encoder(y, labels):
     new_y = y.copy()
     for i, label in enumerate(labels):
@@ -27,6 +37,74 @@ def label_encoder(y, labels):
     return new_y
 
 
+def _hook_state(value):
+    """Hashable digest of a value a hook depends on, arrays are hashed by their full content."""
+    if isinstance(value, types.ModuleType):
+        return ("module", value.__name__)
+    if isinstance(value, types.CodeType):
+        return ("code", value.co_code, _hook_state(value.co_consts), value.co_names)
+    if isinstance(value, types.FunctionType):
+        # functions called by a hook are identified by their code, not by their own globals
+        return ("function", value.__module__, value.__qualname__, _hook_state(value.__code__))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hook_state(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(
+            (repr(k), _hook_state(v)) for k, v in sorted(value.items(), key=lambda item: repr(item[0]))
+        )
+    try:
+        return joblib_hash(value)
+    except Exception:
+        # not picklable
+        return repr(value)
+
+
+def _hook_identity(hook):
+    """Identify a hook by its qualified name and the digest of its code, constants, closure values and
+    the globals its code refers to.
+
+    Values are hashed with joblib.hash, so arrays are identified by their full content. Functions among
+    the globals are identified by their code, the globals they refer to in turn are ignored.
+    """
+    if hook is None:
+        return None
+    func = getattr(hook, "__func__", hook)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        # callable object, identified by its class and attributes
+        func = type(hook)
+        content = getattr(hook, "__dict__", {})
+    else:
+        closure = [cell.cell_contents for cell in (func.__closure__ or [])]
+        global_values = {
+            name: func.__globals__[name] for name in code.co_names if name in func.__globals__
+        }
+        content = (code, closure, global_values)
+    digest = joblib_hash(_hook_state(content))
+    return "{}.{}:{}".format(func.__module__, func.__qualname__, digest)
+
+
+def _collect_data(Xs, ys, metas, event_name, X, y, meta):
+    """Append the epochs of a run to the lists of an event, concatenated once by _concat_data."""
+    Xs.setdefault(event_name, []).append(X)
+    ys.setdefault(event_name, []).append(y)
+    metas.setdefault(event_name, []).append(meta)
+
+
+def _concat_data(Xs, ys, metas):
+    """Concatenate the collected runs of each event, a single run is returned as is."""
+    for event_name in Xs.keys():
+        if len(Xs[event_name]) > 1:
+            Xs[event_name] = np.concatenate(Xs[event_name], axis=0)
+            ys[event_name] = np.concatenate(ys[event_name], axis=0)
+            metas[event_name] = pd.concat(metas[event_name], axis=0, ignore_index=True)
+        else:
+            Xs[event_name] = Xs[event_name][0]
+            ys[event_name] = ys[event_name][0]
+            metas[event_name] = metas[event_name][0]
+    return Xs, ys, metas
+
+
 class BaseParadigm(metaclass=ABCMeta):
     """Abstract Base Paradigm."""
 
@@ -62,6 +140,7 @@ class BaseParadigm(metaclass=ABCMeta):
         self._raw_hook = None
         self._epochs_hook = None
         self._data_hook = None
+        self._cache_path: Optional[str] = None
 
     @abstractmethod
     def is_valid(self, dataset: BaseDataset) -> bool:
@@ -175,6 +254,193 @@ class BaseParadigm(metaclass=ABCMeta):
         """Register data hook before return data."""
         self._data_hook = None
 
+    def register_cache(self, path: str):
+        """Register an on-disk epoch cache for get_data.
+
+        The epochs of each subject are stored under path once extracted, keyed by the dataset cache_key
+        (its class and options), the subject, the paradigm class, the channels, events, intervals and srate,
+        and the identity of the raw, epochs and data hooks. Later calls load X and y memory-mapped (copy-on-write) instead of
+        reading and epoching the raw data again. Entries are never invalidated implicitly, e.g. when the
+        dataset files change, call clear_cache then.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the cache.
+        """
+        self._cache_path = os.path.expanduser(path)
+
+    def unregister_cache(self):
+        """Unregister the epoch cache, its content is kept on disk."""
+        self._cache_path = None
+
+    def clear_cache(
+            self,
+            dataset: Optional[BaseDataset] = None,
+            subjects: Optional[List[Union[int, str]]] = None
+    ):
+        """Remove cached epochs of every config.
+
+        Parameters
+        ----------
+        dataset : Optional[BaseDataset], optional
+            only remove the epochs of this dataset, by default None removes the whole cache
+        subjects : Optional[List[Union[int, str]]], optional
+            only remove the epochs of these subjects of dataset, by default None
+        """
+        if self._cache_path is None:
+            return
+        if dataset is None:
+            paths = [self._cache_path]
+        elif subjects is None:
+            paths = [os.path.join(self._cache_path, str(dataset.dataset_code))]
+        else:
+            paths = [
+                os.path.join(self._cache_path, str(dataset.dataset_code), str(subject))
+                for subject in subjects
+            ]
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _cache_config(self, dataset: BaseDataset, subject_id: Union[int, str]):
+        used_events, used_intervals = self._map_events_intervals(dataset)
+        channels = (
+            dataset.channels if self.select_channels is None else self.select_channels
+        )
+        hooks = [
+            self._raw_hook or getattr(dataset, "raw_hook", None),
+            self._epochs_hook or getattr(dataset, "epochs_hook", None),
+            self._data_hook or getattr(dataset, "data_hook", None),
+        ]
+        return {
+            "version": _EPOCH_CACHE_VERSION,
+            "paradigm": "{}.{}".format(type(self).__module__, type(self).__qualname__),
+            "dataset": dataset.cache_key(),
+            "subject": subject_id,
+            "channels": channels,
+            "events": used_events,
+            "intervals": used_intervals,
+            "srate": self.srate,
+            "hooks": [_hook_identity(hook) for hook in hooks],
+        }
+
+    def _cache_dir(self, dataset: BaseDataset, subject_id: Union[int, str]):
+        config = json.dumps(self._cache_config(dataset, subject_id), sort_keys=True, default=str)
+        digest = hashlib.blake2b(config.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(cast(str, self._cache_path), str(dataset.dataset_code), str(subject_id), digest)
+
+    def _load_cache(self, dataset: BaseDataset, subject_id: Union[int, str]):
+        """Load the cached data of a subject, None if not cached."""
+        cache_dir = self._cache_dir(dataset, subject_id)
+        if not os.path.exists(os.path.join(cache_dir, "meta.pkl")):
+            return None
+        metas = pd.read_pickle(os.path.join(cache_dir, "meta.pkl"))
+        Xs, ys = {}, {}
+        for i, event_name in enumerate(metas.keys()):
+            Xs[event_name] = np.load(os.path.join(cache_dir, "X_{:d}.npy".format(i)), mmap_mode="c")
+            ys[event_name] = np.load(os.path.join(cache_dir, "y_{:d}.npy".format(i)))
+        return Xs, ys, metas
+
+    def _save_cache(self, dataset: BaseDataset, subject_id: Union[int, str], Xs, ys, metas):
+        cache_dir = self._cache_dir(dataset, subject_id)
+        parent = os.path.dirname(cache_dir)
+        os.makedirs(parent, exist_ok=True)
+        # written aside and renamed, concurrent readers never see a partial entry
+        tmp_dir = tempfile.mkdtemp(dir=parent)
+        try:
+            for i, event_name in enumerate(metas.keys()):
+                np.save(os.path.join(tmp_dir, "X_{:d}.npy".format(i)), Xs[event_name])
+                np.save(os.path.join(tmp_dir, "y_{:d}.npy".format(i)), ys[event_name])
+            pd.to_pickle(metas, os.path.join(tmp_dir, "meta.pkl"))
+            with open(os.path.join(tmp_dir, "config.json"), "w") as f:
+                json.dump(self._cache_config(dataset, subject_id), f, default=str)
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _use_epochs_array(self, dataset: BaseDataset) -> bool:
+        """Whether epochs can be cut from the pre-epoched arrays of the dataset.
+
+        Raw and epochs hooks need MNE objects, and resampling is left to MNE.
+        """
+        if not hasattr(dataset, "get_epochs_array"):
+            return False
+        if self._raw_hook or hasattr(dataset, "raw_hook"):
+            return False
+        if self._epochs_hook or hasattr(dataset, "epochs_hook"):
+            return False
+        return not self.srate or self.srate == dataset.srate
+
+    def _get_single_subject_epochs_array(
+        self, dataset, subject_id, used_events, used_intervals
+    ):
+        """Cut epochs from dataset.get_epochs_array with NumPy indexing.
+
+        Gives the same X, y and meta as epoching the continuous data with MNE. Returns None if an
+        interval exceeds the trials, which is left to MNE as the epochs then span adjacent trials.
+        """
+        if subject_id not in dataset.subjects:
+            raise ValueError("Invalid subject {} given".format(subject_id))
+        data = dataset.get_epochs_array(subject_id)
+        srate = dataset.srate
+
+        channels = (
+            dataset.channels
+            if self.select_channels is None
+            else self.select_channels
+        )
+        windows = {}
+        for event_name, (tmin, tmax) in used_intervals.items():
+            start = int(round(tmin * srate))
+            stop = int(round((tmax - 1.0 / srate) * srate)) + 1
+            windows[event_name] = (start, stop)
+
+        for runs in data.values():
+            for epochs in runs.values():
+                n_times = epochs.data.shape[-1]
+                for start, stop in windows.values():
+                    if epochs.onset + start < 0 or epochs.onset + stop > n_times:
+                        return None
+
+        Xs = {}
+        ys = {}
+        metas = {}
+        for session, runs in data.items():
+            for run, epochs in runs.items():
+                caches = {}
+                picks = pick_channels(epochs.ch_names, channels, ordered=True)
+                labels = np.asarray(epochs.labels)
+                for event_name, event_id in used_events.items():
+                    trial_ids = np.flatnonzero(labels == event_id)
+                    if len(trial_ids) == 0:
+                        continue
+                    start, stop = windows[event_name]
+                    # slice time first, only the selected trials and channels are copied
+                    X = epochs.data[..., epochs.onset + start:epochs.onset + stop]
+                    X = X[np.ix_(trial_ids, picks)]
+                    X *= 1e6  # micro-volt default
+                    y = labels[trial_ids].astype(np.int64)
+                    meta = pd.DataFrame(
+                        {
+                            "subject": [subject_id] * len(X),
+                            "session": [session] * len(X),
+                            "run": [run] * len(X),
+                            "event": [event_name] * len(X),
+                            "trial_id": trial_ids,
+                            "dataset": [dataset.dataset_code] * len(X),
+                        }
+                    )
+
+                    # do data hook
+                    if self._data_hook:
+                        X, y, meta, caches = self._data_hook(X, y, meta, caches)
+                    elif hasattr(dataset, "data_hook"):
+                        X, y, meta, caches = dataset.data_hook(X, y, meta, caches)
+
+                    _collect_data(Xs, ys, metas, event_name, X, y, meta)
+        return _concat_data(Xs, ys, metas)
+
     @verbose
     def _get_single_subject_data(self, dataset, subject_id, verbose=False):
         """Return data in micro-volt."""
@@ -188,6 +454,13 @@ class BaseParadigm(metaclass=ABCMeta):
         # # events, interval checking
         used_events, used_intervals = self._map_events_intervals(dataset)
 
+        if self._use_epochs_array(dataset):
+            result = self._get_single_subject_epochs_array(
+                dataset, subject_id, used_events, used_intervals
+            )
+            if result is not None:
+                return result
+
         Xs = {}
         ys = {}
         metas = {}
@@ -296,27 +569,179 @@ class BaseParadigm(metaclass=ABCMeta):
                                 X, y, meta, caches)
 
                         # collecting data
-                        pre_X = Xs.get(event_name)
-                        if pre_X is not None:
-                            Xs[event_name] = np.concatenate((pre_X, X), axis=0)
-                        else:
-                            Xs[event_name] = X
+                        _collect_data(Xs, ys, metas, event_name, X, y, meta)
+        return _concat_data(Xs, ys, metas)
 
-                        pre_y = ys.get(event_name)
-                        if pre_y is not None:
-                            ys[event_name] = np.concatenate((pre_y, y), axis=0)
-                        else:
-                            ys[event_name] = y
+    def _iter_subject_data(self, dataset, subjects, n_jobs, verbose, batch_size=None):
+        """Yield the epoched data of the subjects in order, batch_size subjects at a time.
+
+        Cached subjects are loaded memory-mapped in the parent, only the others are epoched.
+        """
+        if batch_size is None:
+            batch_size = max(len(subjects), 1)
+        with Parallel(n_jobs=n_jobs) as parallel:
+            for i in range(0, len(subjects), batch_size):
+                batch = subjects[i:i + batch_size]
+                if self._cache_path is not None:
+                    results = [self._load_cache(dataset, sub_id) for sub_id in batch]
+                else:
+                    results = [None] * len(batch)
+                missing = [j for j, result in enumerate(results) if result is None]
+                if missing:
+                    computed = parallel(
+                        delayed(self._get_single_subject_data)(
+                            dataset, batch[j], verbose=verbose)
+                        for j in missing
+                    )
+                    for j, result in zip(missing, computed):
+                        if self._cache_path is not None:
+                            self._save_cache(dataset, batch[j], *result)
+                        results[j] = result
+                yield from results
+
+    def _merge_data(self, dataset, used_events, results, label_encode, return_concat):
+        """Concatenate the data of subjects by event, events missing in all subjects are skipped."""
+        Xs = {}
+        ys = {}
+        metas = {}
+        X, y, meta = zip(*results)
+
+        for event_name in used_events.keys():
+            event_X = [X[i][event_name]
+                       for i in range(len(results)) if event_name in X[i]]
+            if len(event_X) == 0:
+                continue
+            # a single memory-mapped array is returned as is
+            Xs[event_name] = (
+                event_X[0] if len(event_X) == 1 else np.concatenate(event_X, axis=0)
+            )
+            ys[event_name] = np.concatenate(
+                [y[i][event_name]
+                 for i in range(len(results)) if event_name in y[i]],
+                axis=0,
+            )
+            metas[event_name] = pd.concat(
+                [
+                    meta[i][event_name]
+                    for i in range(len(results))
+                    if event_name in meta[i]
+                ],
+                axis=0,
+                ignore_index=True,
+            )
+
+        if label_encode:
+            event_list = list(used_events.keys())
+            event_id = [dataset.events[e][0] for e in event_list]
+            for event_name in ys.keys():
+                ys[event_name] = label_encoder(ys[event_name], event_id)
+
+        # python gaurante values in insert order.
+        if return_concat:
+            Xs = list(Xs.values())
+            Xs = Xs[0] if len(Xs) == 1 else np.concatenate(Xs, axis=0)
+            ys = np.concatenate(list(ys.values()), axis=0)
+            metas = pd.concat(list(metas.values()), axis=0, ignore_index=True)
 
-                        pre_meta = metas.get(event_name)
-                        if pre_meta is not None:
-                            metas[event_name] = pd.concat(
-                                (pre_meta, meta), axis=0, ignore_index=True
-                            )
-                        else:
-                            metas[event_name] = meta
         return Xs, ys, metas
 
+    def iter_data(
+            self,
+            dataset: BaseDataset,
+            subjects: List[Union[int, str]] = [],
+            label_encode: bool = True,
+            return_concat: bool = False,
+            n_jobs: int = 1,
+            verbose: Optional[bool] = None,
+    ):
+        """Iterate over the data of selected subjects, one subject at a time.
+
+        Only n_jobs subjects are epoched at the same time, so the memory used is bounded by the data
+        of a few subjects instead of the whole dataset.
+
+        Parameters
+        ----------
+        dataset : BaseDataset
+            dataset
+        subjects : List[Union[int, str]],
+            selected subjects, by default empty
+        label_encode: bool, optional,
+            if True, return y in label encode way
+        return_concat : bool, optional
+            if True, yield concated ndarray object, otherwise yield dict of events, by default False
+        n_jobs : int, optional
+            Parallel jobs, by default 1
+        verbose : Optional[bool], optional
+            verbose, by default None
+
+        Yields
+        ------
+        Tuple[Union[Dict[str, Union[np.ndarray, pd.DataFrame]], Union[np.ndarray, pd.DataFrame]], ...]
+            Xs, ys, metas of a subject, in the same format as get_data
+
+        Raises
+        ------
+        TypeError
+            raise error if dataset is not avaliable for the paradigm
+        """
+        if not self.is_valid(dataset):
+            raise TypeError(
+                "Dataset {:s} is not valid for the current paradigm. Check your events and channels settings".format(
+                    dataset.dataset_code
+                )
+            )
+        used_events, used_intervals = self._map_events_intervals(dataset)
+
+        for result in self._iter_subject_data(
+            dataset, subjects, n_jobs, verbose, batch_size=effective_n_jobs(n_jobs)
+        ):
+            yield self._merge_data(
+                dataset, used_events, [result], label_encode, return_concat)
+
+    def data_shape(
+            self,
+            dataset: BaseDataset,
+            subjects: List[Union[int, str]] = [],
+            n_jobs: int = 1,
+            verbose: Optional[bool] = None,
+    ) -> Tuple[Tuple[int, ...], Dict[str, int]]:
+        """Shape of the concatenated X of selected subjects, to preallocate the out array of get_data.
+
+        The subjects are epoched one at a time with iter_data. Register a cache first, then the
+        following get_data only loads the memory-mapped entries stored by this pass.
+
+        Parameters
+        ----------
+        dataset : BaseDataset
+            dataset
+        subjects : List[Union[int, str]],
+            selected subjects, by default empty
+        n_jobs : int, optional
+            Parallel jobs, by default 1
+        verbose : Optional[bool], optional
+            verbose, by default None
+
+        Returns
+        -------
+        shape : Tuple[int, ...]
+            (n_trials, n_channels, n_samples)
+        event_counts : Dict[str, int]
+            number of trials of each event, in the order of get_data, pass it to get_data with out
+        """
+        used_events, _ = self._map_events_intervals(dataset)
+        counts: Dict[str, int] = {}
+        trial_shape: Tuple[int, ...] = ()
+        for Xs, _, _ in self.iter_data(
+            dataset, subjects, label_encode=False, n_jobs=n_jobs, verbose=verbose
+        ):
+            for event_name, X in Xs.items():
+                counts[event_name] = counts.get(event_name, 0) + len(X)
+                trial_shape = X.shape[1:]
+        event_counts = {
+            event_name: counts[event_name] for event_name in used_events if event_name in counts
+        }
+        return (sum(event_counts.values()), *trial_shape), event_counts
+
     @verbose
     def get_data(
             self,
@@ -325,6 +750,8 @@ class BaseParadigm(metaclass=ABCMeta):
             label_encode: bool = True,
             return_concat: bool = False,
             n_jobs: int = -1,
+            out: Optional[np.ndarray] = None,
+            event_counts: Optional[Dict[str, int]] = None,
             verbose: Optional[bool] = None,
     ) -> Tuple[
         Union[
@@ -347,6 +774,14 @@ class BaseParadigm(metaclass=ABCMeta):
             if True, return concated ndarray object, otherwise return dict of events, by default False
         n_jobs : int, optional
             Parallel jobs, by default -1
+        out : Optional[np.ndarray], optional
+            preallocated array, e.g. a np.memmap, the data are written into subject by subject with at
+            most n_jobs subjects in memory, see data_shape. Implies return_concat, with the same trial
+            order. By default None
+        event_counts : Optional[Dict[str, int]], optional
+            number of trials of each event returned by data_shape, used with out to write each event at
+            its offset. If None, data_shape is called, which epochs the data a second time unless a
+            cache is registered. By default None
         verbose : Optional[bool], optional
             verbose, by default None
 
@@ -359,6 +794,8 @@ class BaseParadigm(metaclass=ABCMeta):
         ------
         TypeError
             raise error if dataset is not avaliable for the paradigm
+        ValueError
+            raise error if out is too small or event_counts does not match the data
         """
         if not self.is_valid(dataset):
             raise TypeError(
@@ -369,52 +806,51 @@ class BaseParadigm(metaclass=ABCMeta):
         # events, interval checking
         used_events, used_intervals = self._map_events_intervals(dataset)
 
-        Xs = {}
-        ys = {}
-        metas = {}
-
-        X, y, meta = zip(
-            *Parallel(n_jobs=n_jobs)(
-                delayed(self._get_single_subject_data)(
-                    dataset, sub_id, verbose=verbose)
-                for sub_id in subjects
-            )
-        )
+        if out is None:
+            results = list(self._iter_subject_data(dataset, subjects, n_jobs, verbose))
+            return self._merge_data(
+                dataset, used_events, results, label_encode, return_concat)
 
+        if event_counts is None:
+            _, event_counts = self.data_shape(dataset, subjects, n_jobs=n_jobs, verbose=verbose)
+        # events are laid out one after another, in the order of get_data without out
+        offsets = {}
+        n_trials = 0
         for event_name in used_events.keys():
-            Xs[event_name] = np.concatenate(
-                [X[i][event_name]
-                 for i in range(len(subjects)) if event_name in X[i]],
-                axis=0,
-            )
-            ys[event_name] = np.concatenate(
-                [y[i][event_name]
-                 for i in range(len(subjects)) if event_name in y[i]],
-                axis=0,
-            )
-            metas[event_name] = pd.concat(
-                [
-                    meta[i][event_name]
-                    for i in range(len(subjects))
-                    if event_name in meta[i]
-                ],
+            if event_name in event_counts:
+                offsets[event_name] = n_trials
+                n_trials += event_counts[event_name]
+        if n_trials > len(out):
+            raise ValueError(
+                "out has {:d} trials, {:d} are needed, see data_shape".format(len(out), n_trials))
+
+        positions = dict(offsets)
+        ys: Dict[str, List[np.ndarray]] = {event_name: [] for event_name in offsets}
+        metas: Dict[str, List[pd.DataFrame]] = {event_name: [] for event_name in offsets}
+        for Xs, y, meta in self.iter_data(
+            dataset, subjects, label_encode=label_encode, n_jobs=n_jobs, verbose=verbose
+        ):
+            for event_name, X in Xs.items():
+                start = positions.get(event_name)
+                if start is None or start + len(X) > offsets[event_name] + event_counts[event_name]:
+                    raise ValueError("event_counts does not match the data, see data_shape")
+                out[start:start + len(X)] = X
+                positions[event_name] += len(X)
+                ys[event_name].append(y[event_name])
+                metas[event_name].append(meta[event_name])
+        for event_name in offsets:
+            if positions[event_name] != offsets[event_name] + event_counts[event_name]:
+                raise ValueError("event_counts does not match the data, see data_shape")
+
+        return (
+            out[:n_trials],
+            np.concatenate([y for event_name in offsets for y in ys[event_name]], axis=0),
+            pd.concat(
+                [meta for event_name in offsets for meta in metas[event_name]],
                 axis=0,
                 ignore_index=True,
-            )
-
-        if label_encode:
-            event_list = list(used_events.keys())
-            event_id = [dataset.events[e][0] for e in event_list]
-            for event_name in used_events.keys():
-                ys[event_name] = label_encoder(ys[event_name], event_id)
-
-        # python gaurante values in insert order.
-        if return_concat:
-            Xs = np.concatenate(list(Xs.values()), axis=0)
-            ys = np.concatenate(list(ys.values()), axis=0)
-            metas = pd.concat(list(metas.values()), axis=0, ignore_index=True)
-
-        return Xs, ys, metas
+            ),
+        )
 
     def __str__(self):
         desc = "{}".format(self.__class__.__name__)
@@ -492,6 +928,39 @@ class BaseTimeEncodingParadigm(BaseParadigm):
 
         return used_events, used_intervals, used_minor_events, used_minor_intervals, encode_loop, encode_dict
 
+    def iter_data(self, *args, **kwargs):
+        """Not supported by time-encoding paradigms, use get_data.
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        raise NotImplementedError(
+            "iter_data is not supported by {:s}".format(self.__class__.__name__)
+        )
+
+    def data_shape(self, *args, **kwargs):
+        """Not supported by time-encoding paradigms, use get_data.
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        raise NotImplementedError(
+            "data_shape is not supported by {:s}".format(self.__class__.__name__)
+        )
+
+    def register_cache(self, path: str):
+        """Not supported, get_data of time-encoding paradigms always epochs the raw data.
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        raise NotImplementedError(
+            "The epoch cache is not supported by {:s}".format(self.__class__.__name__)
+        )
+
     def register_trial_hook(self, hook):
         """Register trial hook before trial operation.
 
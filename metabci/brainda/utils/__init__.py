@@ -1,3 +1,3 @@
 from .channels import pick_channels, upper_ch_names
-from .download import mne_data_path
-from .io import loadmat
+from .download import mne_data_path, DownloadReport
+from .io import loadmat, load_mat_files
@@ -5,16 +5,184 @@
 # Date: 2020/12/07
 # License: MIT License
 from mne.datasets.utils import _get_path, _do_path_update
-from mne.utils import verbose
+from mne.utils import verbose, logger
 
+import hashlib
+import json
 import os
 import shutil
-from typing import Union, Optional, Dict
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Union, Optional, Dict, DefaultDict, List, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
 from urllib.request import url2pathname
 
-from pooch import retrieve, HTTPDownloader, FTPDownloader
+import requests
+from tqdm import tqdm
+from pooch import retrieve, FTPDownloader
+
+# name of the per-dataset manifest, stored in the MNE-<sign>-data folder
+MANIFEST_NAME = "manifest.sha256.json"
+_CHUNK_SIZE = 1024 * 1024
+# small enough that little is lost when a connection drops mid-chunk
+_HTTP_CHUNK_SIZE = 64 * 1024
+
+# one download per destination, one writer per manifest and for the mne config, within a process
+_locks: DefaultDict[str, threading.Lock] = defaultdict(threading.Lock)
+_locks_lock = threading.Lock()
+_reports: List["DownloadReport"] = []
+
+
+def _lock(key: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks[key]
+
+
+class DownloadReport:
+    """Progress and throughput of the downloads made while the report is active.
+
+    Use it as a context manager, every file fetched or checked by mne_data_path in any thread is
+    counted until the context exits.
+
+    Attributes
+    ----------
+    n_downloaded : int
+        number of downloaded files
+    n_up_to_date : int
+        number of files already present and verified
+    n_bytes : int
+        downloaded bytes
+    elapsed : float
+        seconds since the report started
+    throughput : float
+        downloaded bytes per second
+    """
+
+    def __init__(self):
+        self.n_downloaded = 0
+        self.n_up_to_date = 0
+        self.n_bytes = 0
+        self._start = None
+        self._stop = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._stop = None
+        with _locks_lock:
+            _reports.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        with _locks_lock:
+            _reports.remove(self)
+        self._stop = time.perf_counter()
+
+    def _add(self, n_bytes: int, downloaded: bool):
+        with self._lock:
+            if downloaded:
+                self.n_downloaded += 1
+                self.n_bytes += n_bytes
+            else:
+                self.n_up_to_date += 1
+
+    @property
+    def elapsed(self) -> float:
+        if self._start is None:
+            return 0.0
+        stop = time.perf_counter() if self._stop is None else self._stop
+        return stop - self._start
+
+    @property
+    def throughput(self) -> float:
+        return self.n_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return "{:d} files downloaded ({:.1f} MB in {:.1f} s, {:.2f} MB/s), {:d} up to date".format(
+            self.n_downloaded,
+            self.n_bytes / 1e6,
+            self.elapsed,
+            self.throughput / 1e6,
+            self.n_up_to_date,
+        )
+
+
+def _report(n_bytes: int, downloaded: bool):
+    with _locks_lock:
+        reports = list(_reports)
+    for report in reports:
+        report._add(n_bytes, downloaded)
+
+
+def _split_hash(known_hash: str) -> Tuple[str, str]:
+    """Split a pooch style 'alg:hash' string, sha256 if the algorithm is not given."""
+    if ":" in known_hash:
+        alg, value = known_hash.split(":", 1)
+        return alg.lower(), value.lower()
+    return "sha256", known_hash.lower()
+
+
+def _file_hash(file_name: Union[str, Path], alg: str = "sha256") -> str:
+    hasher = hashlib.new(alg)
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class _Manifest:
+    """SHA256, size and mtime of the files of a dataset folder, keyed by their relative path."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = str(root)
+        self.file_name = os.path.join(self.root, MANIFEST_NAME)
+
+    def _key(self, file_name):
+        return os.path.relpath(file_name, self.root).replace(os.sep, "/")
+
+    def _read(self):
+        try:
+            with open(self.file_name, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, file_name):
+        return self._read().get(self._key(file_name))
+
+    def record(self, file_name, sha256):
+        stat = os.stat(file_name)
+        entry = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        with _lock(self.file_name):
+            # merge with the entries written meanwhile, then replace atomically
+            entries = self._read()
+            entries[self._key(file_name)] = entry
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f, indent=1, sort_keys=True)
+            os.replace(tmp_file, self.file_name)
+        return entry
+
+    def verify(self, file_name, known_hash=None):
+        """Whether an existing file is intact, files missing from the manifest are hashed once and
+        recorded."""
+        entry = self.get(file_name)
+        stat = os.stat(file_name)
+        if entry is None or (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            sha256 = _file_hash(file_name)
+            if entry is not None and entry["sha256"] != sha256:
+                return False
+            entry = self.record(file_name, sha256)
+        if known_hash is None:
+            return True
+        alg, value = _split_hash(known_hash)
+        if alg == "sha256":
+            return entry["sha256"] == value
+        return _file_hash(file_name, alg) == value
 
 
 def _url_to_local_path(url: str, local_path: Union[str, Path]) -> str:
@@ -38,7 +206,6 @@ def _url_to_local_path(url: str, local_path: Union[str, Path]) -> str:
         raise ValueError if url is not valid
     """
     destination = urlparse(url).path
-    print("--------ssssss,", destination)
     # First char should be '/', and it needs to be discarded
     if len(destination) < 2 or destination[0] != "/":
         raise ValueError("Invalid URL")
@@ -50,40 +217,79 @@ def _get_http(
     url: str,
     file_name: Union[str, Path],
     proxies: Optional[Dict[str, str]] = None,
-    known_hash: Optional[str] = None,
+    timeout: float = 60,
     **kwargs
-):
-    retrieve(
-        url,
-        known_hash,
-        fname=os.path.basename(file_name),
-        path=os.path.dirname(file_name),
-        downloader=HTTPDownloader(
-            progressbar=True, proxies=proxies, allow_redirects=True, **kwargs
-        ),
-    )
+) -> int:
+    """Download to file_name, resuming from its current size with a HTTP range request.
+
+    Raises
+    ------
+    IOError
+        raise IOError if fewer bytes than announced by the server were received, the partial file is
+        kept and the next call resumes it
+    """
+    offset = os.path.getsize(file_name) if os.path.isfile(file_name) else 0
+    headers = dict(kwargs.get("headers") or {})
+    # byte counts refer to the file, not to a compressed transfer
+    headers.setdefault("Accept-Encoding", "identity")
+    kwargs["headers"] = headers
+    if offset > 0:
+        headers["Range"] = "bytes={:d}-".format(offset)
+    with requests.get(
+        url, proxies=proxies, stream=True, allow_redirects=True, timeout=timeout, **kwargs
+    ) as r:
+        if offset > 0 and r.status_code == 416:
+            # the partial file is not a prefix of the remote file, start over
+            os.remove(file_name)
+            del headers["Range"]
+            return _get_http(url, file_name, proxies=proxies, timeout=timeout, **kwargs)
+        r.raise_for_status()
+        content_range = r.headers.get("Content-Range", "")
+        if r.status_code != 206 or not content_range.startswith("bytes {:d}-".format(offset)):
+            # range not supported
+            offset = 0
+        content_length = r.headers.get("Content-Length")
+        total = offset + int(content_length) if content_length is not None else None
+        if offset > 0 and "/" in content_range and content_range.rsplit("/", 1)[1] != "*":
+            total = int(content_range.rsplit("/", 1)[1])
+        n_bytes = 0
+        with open(file_name, "ab" if offset > 0 else "wb") as f, tqdm(
+            total=total, initial=offset, unit="B", unit_scale=True, leave=False,
+            desc=os.path.basename(url), disable=None,
+        ) as progressbar:
+            for chunk in r.iter_content(chunk_size=_HTTP_CHUNK_SIZE):
+                f.write(chunk)
+                n_bytes += len(chunk)
+                progressbar.update(len(chunk))
+    if total is not None and offset + n_bytes != total:
+        if offset + n_bytes > total:
+            os.remove(file_name)
+        raise IOError(
+            "Incomplete download of {:s}, {:d} of {:d} bytes received, call again to resume".format(
+                url, offset + n_bytes, total
+            )
+        )
+    return n_bytes
 
 
-def _get_ftp(
-    url: str, file_name: Union[str, Path], known_hash: Optional[str] = None, **kwargs
-):
+def _get_ftp(url: str, file_name: Union[str, Path], **kwargs) -> int:
+    # pooch skips existing files, FTP downloads are not resumed
+    if os.path.isfile(file_name):
+        os.remove(file_name)
     retrieve(
         url,
-        known_hash,
+        None,
         fname=os.path.basename(file_name),
         path=os.path.dirname(file_name),
         downloader=FTPDownloader(progressbar=True, **kwargs),
     )
+    return os.path.getsize(file_name)
 
 
-def _get_file(
-    url: str, file_name: Union[str, Path], known_hash: Optional[str] = None, **kwargs
-):
-    src_file = urlparse(url).path
-    path = os.path.dirname(file_name)
-    if not os.path.exists(file_name):
-        os.makedirs(path, exist_ok=True)
-        shutil.copy(src_file, file_name)
+def _get_file(url: str, file_name: Union[str, Path], **kwargs) -> int:
+    src_file = url2pathname(urlparse(url).path)
+    shutil.copyfile(src_file, file_name)
+    return os.path.getsize(file_name)
 
 
 def _fetch_file(
@@ -92,18 +298,47 @@ def _fetch_file(
     proxies: Optional[Dict[str, str]] = None,
     known_hash: Optional[str] = None,
     **kwargs
-):
+) -> Tuple[str, int]:
+    """Download url to file_name atomically.
+
+    The data go to file_name.part, which is checked against known_hash and then renamed. An
+    interrupted HTTP download is resumed from the partial file by the next call.
+
+    Returns
+    -------
+    Tuple[str, int]
+        SHA256 of the file and the number of downloaded bytes
+
+    Raises
+    ------
+    ValueError
+        raise ValueError if the file does not match known_hash
+    """
     scheme = urlparse(url).scheme
+    part_file = str(file_name) + ".part"
+    os.makedirs(os.path.dirname(part_file), exist_ok=True)
 
     if scheme in ("http", "https"):
-        _get_http(url, file_name, proxies=proxies, known_hash=known_hash, **kwargs)
+        n_bytes = _get_http(url, part_file, proxies=proxies, **kwargs)
     elif scheme in ("ftp"):
-        _get_ftp(url, file_name, known_hash=known_hash, **kwargs)
+        n_bytes = _get_ftp(url, part_file, **kwargs)
     elif scheme in ("file"):
-        _get_file(url, file_name, known_hash=known_hash, **kwargs)
+        n_bytes = _get_file(url, part_file, **kwargs)
     else:
         raise NotImplementedError("Cannot use scheme {:s}".format(scheme))
 
+    sha256 = _file_hash(part_file)
+    if known_hash is not None:
+        alg, value = _split_hash(known_hash)
+        actual = sha256 if alg == "sha256" else _file_hash(part_file, alg)
+        if actual != value:
+            os.remove(part_file)
+            raise ValueError(
+                "{:s} hash of {:s} is {:s}, expected {:s}".format(alg, url, actual, value)
+            )
+    os.replace(part_file, file_name)
+    return sha256, n_bytes
+
 
 @verbose
 def mne_data_path(
@@ -113,6 +348,7 @@ def mne_data_path(
     proxies: Optional[Dict[str, str]] = None,
     force_update: bool = False,
     update_path: bool = True,
+    known_hash: Optional[Union[str, Dict[str, str]]] = None,
     verbose: Optional[Union[bool, str, int]] = None,
     **kwargs
 ) -> str:
@@ -121,6 +357,10 @@ def mne_data_path(
     This function returns the local path of the target file, downloading it if needed or requested.
     The local path keeps the same structure as the url.
 
+    Downloads are written to a .part file, resumed if interrupted, and renamed once complete. The
+    SHA256 of each file is recorded in the manifest of the dataset folder, an existing file whose
+    content no longer matches is downloaded again.
+
     Parameters
     ----------
     url : str
@@ -135,6 +375,9 @@ def mne_data_path(
         whether to re-download the file, by default False
     update_path : bool, optional
         whether to update mne config, by default True
+    known_hash : Optional[Union[str, Dict[str, str]]], optional
+        expected hash of the file, 'sha256:<hex>' or another hashlib algorithm, or a table of hashes
+        keyed by url or file name, e.g. the _KNOWN_HASHES of a dataset, by default None
     verbose : Optional[Union[bool, str, int]], optional
         [description], by default None
 
@@ -142,26 +385,47 @@ def mne_data_path(
     -------
     str
         local path of the target file
+
+    Raises
+    ------
+    ValueError
+        raise ValueError if the downloaded file does not match known_hash
+    IOError
+        raise IOError if the download is incomplete, the next call resumes it
     """
+    if isinstance(known_hash, dict):
+        known_hash = known_hash.get(url, known_hash.get(os.path.basename(urlparse(url).path)))
     sign = sign.upper()
     key = "MNE_DATASETS_{:s}_PATH".format(sign)
     key_dest = "MNE-{:s}-data".format(sign.lower())
     path = _get_path(path, key, sign)
     path = str(path)
     destination = _url_to_local_path(url, os.path.join(path, key_dest))
-    # Fetch the file
-    # forget hash check
-    known_hash = None
-    if not os.path.exists(destination) or force_update:
-        if not os.path.isdir(os.path.dirname(destination)):
-            os.makedirs(os.path.dirname(destination))
-        if os.path.isfile(destination):
-            os.remove(destination)
-    #     known_hash = None
-    # else:
-    #     known_hash = file_hash(destination)
-
-    _fetch_file(url, destination, proxies=proxies, known_hash=known_hash, **kwargs)
-
-    _do_path_update(path, update_path, key, sign)
+    manifest = _Manifest(os.path.join(path, key_dest))
+
+    with _lock(destination):
+        if force_update and os.path.isfile(destination + ".part"):
+            os.remove(destination + ".part")
+        if (
+            not force_update
+            and os.path.isfile(destination)
+            and manifest.verify(destination, known_hash)
+        ):
+            _report(0, downloaded=False)
+        else:
+            start = time.perf_counter()
+            sha256, n_bytes = _fetch_file(
+                url, destination, proxies=proxies, known_hash=known_hash, **kwargs
+            )
+            manifest.record(destination, sha256)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "Downloaded {:s} ({:.1f} MB in {:.1f} s, {:.2f} MB/s)".format(
+                    url, n_bytes / 1e6, elapsed, n_bytes / 1e6 / max(elapsed, 1e-9)
+                )
+            )
+            _report(n_bytes, downloaded=True)
+
+    with _lock(key):
+        _do_path_update(path, update_path, key, sign)
     return destination
@@ -3,35 +3,198 @@
 # Authors: Swolf <swolfforever@gmail.com>
 # Date: 2020/12/30
 # License: MIT License
-from typing import Union
+from typing import Union, Optional, List
 from pathlib import Path
 
 import numpy as np
 import scipy.io as sio
+import h5py
 import mat73
+from joblib import Parallel, delayed
 
+# MATLAB classes of the numeric arrays read lazily from v7.3 files
+_NUMERIC_CLASSES = {
+    "double", "single",
+    "int8", "uint8", "int16", "uint16", "int32", "uint32", "int64", "uint64",
+}
 
-def loadmat(mat_file: Union[str, Path]) -> dict:
+
+def loadmat(
+    mat_file: Union[str, Path],
+    variable_names: Optional[List[str]] = None,
+    lazy: bool = False,
+) -> dict:
     """Wrapper of scipy.io loadmat function, works for matv7.3.
 
     Parameters
     ----------
     mat_file : Union[str, Path]
         file path
+    variable_names : Optional[List[str]], optional
+        only read these variables, by default None, read all variables
+    lazy : bool, optional
+        if True, numeric arrays of matv7.3 files, including fields of structs, are not read but
+        returned memory-mapped (np.memmap) when stored contiguously, or as H5MatArray otherwise.
+        Other mat files are read as usual. By default False
 
     Returns
     -------
     dict
         data
     """
+    if lazy and h5py.is_hdf5(mat_file):
+        return _lazy_loadmat73(mat_file, variable_names)
     try:
-        data = _loadmat(mat_file)
+        data = _loadmat(mat_file, variable_names=variable_names)
     except Exception:
-        data = mat73.loadmat(mat_file)
+        data = _mat73_loadmat(mat_file, variable_names)
+    return data
+
+
+def load_mat_files(
+    mat_files: List[Union[str, Path]],
+    variable_names: Optional[List[str]] = None,
+    lazy: bool = False,
+    n_jobs: int = -1,
+) -> List[dict]:
+    """Read several mat files concurrently with a thread pool, see loadmat.
+
+    Parameters
+    ----------
+    mat_files : List[Union[str, Path]]
+        file paths
+    variable_names : Optional[List[str]], optional
+        only read these variables, by default None, read all variables
+    lazy : bool, optional
+        if True, read numeric arrays of matv7.3 files lazily, by default False
+    n_jobs : int, optional
+        the number of threads, by default -1
+
+    Returns
+    -------
+    List[dict]
+        data of each file, in order
+    """
+    if len(mat_files) <= 1:
+        return [loadmat(f, variable_names=variable_names, lazy=lazy) for f in mat_files]
+    return Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(loadmat)(f, variable_names=variable_names, lazy=lazy) for f in mat_files
+    )
+
+
+class H5MatArray:
+    """Numeric array of a matv7.3 file read on indexing.
+
+    Arrays are in MATLAB axis order with singleton axes squeezed, as decoded by mat73. Indexing
+    follows h5py rules (slices, integers and increasing index lists), np.asarray reads the whole array.
+
+    Parameters
+    ----------
+    filename : Union[str, Path]
+        file path
+    name : str
+        path of the dataset in the file
+    """
+
+    def __init__(self, filename: Union[str, Path], name: str):
+        self.filename = filename
+        self.name = name
+        with h5py.File(filename, "r") as f:
+            dataset = f[name]
+            self.dtype = dataset.dtype
+            self._matlab_shape = dataset.shape[::-1]
+        self._axes = [i for i, n in enumerate(self._matlab_shape) if n != 1]
+        self.shape = tuple(self._matlab_shape[i] for i in self._axes)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        for i, k in enumerate(key):
+            if k is Ellipsis:
+                key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1:]
+                break
+        key = key + (slice(None),) * (self.ndim - len(key))
+        # singleton axes are dropped by indexing them
+        matlab_key = [0] * len(self._matlab_shape)
+        for axis, k in zip(self._axes, key):
+            matlab_key[axis] = k
+        with h5py.File(self.filename, "r") as f:
+            data = f[self.name][tuple(matlab_key[::-1])]
+        return np.asarray(data).T
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[...]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __repr__(self):
+        return "H5MatArray(shape={}, dtype={})".format(self.shape, self.dtype)
+
+
+def _mat73_loadmat(mat_file, variable_names=None):
+    if variable_names is None:
+        return mat73.loadmat(mat_file)
+    try:
+        return mat73.loadmat(mat_file, only_include=variable_names)
+    except TypeError:
+        # older mat73
+        return mat73.loadmat(mat_file, only_load=variable_names)
+
+
+def _lazy_loadmat73(mat_file, variable_names=None):
+    """Read a matv7.3 file, numeric arrays are mapped instead of read, the rest is decoded by mat73."""
+    lazy = {}
+    decoded = []
+
+    def _visit(path, obj):
+        matlab_class = obj.attrs.get("MATLAB_class", b"")
+        if isinstance(matlab_class, bytes):
+            matlab_class = matlab_class.decode()
+        if (
+            isinstance(obj, h5py.Dataset)
+            and matlab_class in _NUMERIC_CLASSES
+            and "MATLAB_empty" not in obj.attrs
+            and obj.dtype.fields is None
+            and obj.size > 1
+        ):
+            offset = obj.id.get_offset()
+            if obj.chunks is None and offset is not None:
+                data = np.memmap(
+                    mat_file, dtype=obj.dtype, mode="r", offset=offset, shape=obj.shape
+                )
+                lazy[path] = np.squeeze(data.T)
+            else:
+                lazy[path] = H5MatArray(mat_file, obj.name)
+        elif isinstance(obj, h5py.Group) and matlab_class == "struct":
+            for field in obj.keys():
+                _visit(path + "/" + field, obj[field])
+        else:
+            decoded.append(path)
+
+    with h5py.File(mat_file, "r") as f:
+        if variable_names is None:
+            variable_names = [name for name in f.keys() if not name.startswith("#")]
+        for name in variable_names:
+            if name in f:
+                _visit(name, f[name])
+
+    data = _mat73_loadmat(mat_file, decoded) if decoded else {}
+    for path, array in lazy.items():
+        d = data
+        *parents, leaf = path.split("/")
+        for parent in parents:
+            d = d.setdefault(parent, {})
+        d[leaf] = array
     return data
 
 
-def _loadmat(filename):
+def _loadmat(filename, variable_names=None):
     """
     this function should be called instead of direct sio.loadmat
     as it cures the problem of not properly recovering python dictionaries
@@ -87,5 +250,7 @@ def _loadmat(filename):
         else:
             return ndarray
 
-    data = sio.loadmat(filename, struct_as_record=False, squeeze_me=True)
+    data = sio.loadmat(
+        filename, variable_names=variable_names, struct_as_record=False, squeeze_me=True
+    )
     return _check_keys(data)
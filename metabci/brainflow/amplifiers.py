@@ -8,7 +8,6 @@ import struct
 import threading
 import time
 from abc import abstractmethod
-from collections import deque
 from typing import List, Optional, Tuple, Dict, Any
 
 import numpy as np
@@ -25,7 +24,7 @@ logger_amp = get_logger("amplifier")
 logger_marker = get_logger("marker")
 
 
-class RingBuffer(deque):
+class RingBuffer:
     """Online data RingBuffer.
     -author: Lichao Xu
     -Created on: 2021-04-01
@@ -35,20 +34,58 @@ class RingBuffer(deque):
     ----------
         size: int,
             Size of the RingBuffer.
+        num_chans: int,
+            Number of columns of a sample (channels and the trigger channel),
+            the buffer is allocated on the first write if None.
     """
 
-    def __init__(self, size=1024, segment=None):
-        """Ring buffer object based on python deque data
-        structure to store data.
+    def __init__(self, size=1024, segment=None, num_chans=None):
+        """Ring buffer object based on a preallocated (size, num_chans)
+        float array with a write cursor to store data.
 
         Parameters
         ----------
         size : int, optional
             maximum buffer size, by default 1024
         """
-        super(RingBuffer, self).__init__(maxlen=size)
         self.max_size = size
         self.segment = segment
+        self._buffer = None
+        if num_chans is not None:
+            self._buffer = np.zeros((size, num_chans))
+        self._cursor = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, sample):
+        """Append one sample."""
+        self.extend(np.asarray(sample, dtype=np.float64)[np.newaxis, :])
+
+    def extend(self, samples):
+        """Append a chunk of samples, shape(n_samples, num_chans)."""
+        samples = np.asarray(samples, dtype=np.float64)
+        n_samples = len(samples)
+        if n_samples == 0:
+            return
+        if self._buffer is None or self._buffer.shape[1] != samples.shape[1]:
+            self._buffer = np.zeros((self.max_size, samples.shape[1]))
+            self._cursor, self._count = 0, 0
+        if n_samples >= self.max_size:
+            self._buffer[:] = samples[n_samples - self.max_size:]
+            self._cursor = 0
+        else:
+            n_tail = min(n_samples, self.max_size - self._cursor)
+            self._buffer[self._cursor: self._cursor + n_tail] = samples[:n_tail]
+            self._buffer[: n_samples - n_tail] = samples[n_tail:]
+            self._cursor = (self._cursor + n_samples) % self.max_size
+        self._count = min(self._count + n_samples, self.max_size)
+
+    def clear(self):
+        """Drop all samples, the allocated buffer is reused."""
+        self._cursor = 0
+        self._count = 0
 
     def isfull(self):
         """Whether current buffer is full or not.
@@ -57,17 +94,47 @@ class RingBuffer(deque):
         ----------
         boolean
         """
-        return len(self) == self.max_size
+        return self._count == self.max_size
+
+    def get(self, start=0, stop=None, copy=False):
+        """Access buffer value from the oldest sample on, like get_all()[start:stop].
+
+        Parameters
+        ----------
+        copy : bool
+            Whether to always return a copy, a view may be overwritten
+            by the following writes.
+
+        Returns
+        ----------
+        ndarray
+            a view of the buffer, or one contiguous copy if the window
+            wraps around or copy is True
+        """
+        start, stop, _ = slice(start, stop).indices(self._count)
+        stop = max(start, stop)
+        if self._buffer is None:
+            return np.zeros((0, 0))
+        first = (self._cursor - self._count) % self.max_size
+        start, stop = first + start, first + stop
+        if stop <= self.max_size or start >= self.max_size:
+            if start >= self.max_size:
+                start, stop = start - self.max_size, stop - self.max_size
+            data = self._buffer[start:stop]
+            return data.copy() if copy else data
+        return np.concatenate(
+            (self._buffer[start:], self._buffer[: stop - self.max_size]), axis=0
+        )
 
     def get_all(self):
         """Access all current buffer value.
 
         Returns
         ----------
-        list
-            the list of current buffer
+        ndarray
+            current buffer, shape(n_samples, num_chans)
         """
-        return list(self)
+        return self.get()
 
 
 class Marker(RingBuffer):
@@ -181,15 +248,94 @@ class Marker(RingBuffer):
             return True
         return False
 
+    def _steps_to_trigger(self, value: int):
+        """Number of samples until a countdown with the given value expires
+        or reaches an early-delivery point of patch_size."""
+        steps = value
+        if isinstance(self.patch_size, int):
+            patch = (min(value, self.threshold) - 1) // self.patch_size * self.patch_size
+            if patch > 0:
+                steps = value - patch
+        return steps
+
+    def update(self, samples):
+        """Append a chunk of samples and return every epoch completed inside it.
+
+        Rising edges of the trigger column are found with NumPy, and countdowns
+        are decremented arithmetically between the samples where an event starts,
+        a countdown expires or a patch is delivered. Only those samples go through
+        the per-sample state machine of __call__, so the epochs are identical to
+        calling append() and __call__() sample by sample.
+
+        Parameters
+        ----------
+            samples: array_like, shape(n_samples, n_channels+1),
+                Online data with the trigger in the last column.
+
+        Returns
+        ----------
+            epochs: list of ndarray,
+                Epochs completed inside the chunk, see get_epoch.
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        epochs = []
+        n_samples = len(samples)
+        if n_samples == 0:
+            return epochs
+        events = np.trunc(samples[:, -1])
+        starts = []
+        if self.events is not None:
+            is_event = events != 0
+            if not self.countdowns and not is_event.any():
+                # nothing pending and no trigger in the chunk
+                self.extend(samples)
+                self.is_rising = True
+                return epochs
+            rising = np.empty(n_samples, dtype=bool)
+            rising[0] = self.is_rising
+            rising[1:] = ~is_event[:-1]
+            starts = [
+                i for i in np.flatnonzero(is_event & rising).tolist()
+                if int(events[i]) in self.events
+            ]
+
+        i_start, i_written, i = 0, 0, 0
+        while i < n_samples:
+            next_i = starts[i_start] if i_start < len(starts) else n_samples
+            if self.events is None and "fixed" not in self.countdowns:
+                next_i = i
+            for value in self.countdowns.values():
+                if value > 0:
+                    next_i = min(next_i, i + self._steps_to_trigger(value) - 1)
+            if next_i > i:
+                for key in self.countdowns:
+                    self.countdowns[key] -= next_i - i
+                i = next_i
+                continue
+            self.extend(samples[i_written: i + 1])
+            i_written = i + 1
+            if self.events is not None:
+                self.is_rising = bool(rising[i])
+            if self(events[i]):
+                epochs.append(self.get_epoch())
+            if i_start < len(starts) and starts[i_start] == i:
+                i_start += 1
+            i += 1
+        self.extend(samples[i_written:])
+        if self.events is not None:
+            self.is_rising = bool(events[-1] == 0)
+        return epochs
+
     def get_epoch(self):
         """
         Fetch data from buffer.
         If the self.patch_size is not None, the data will be instantly sent even though buffer is not full.
+        The epoch is returned as one contiguous copy, shape(n_samples, n_channels+1), since it is usually
+        queued to a worker while the buffer keeps being written.
         """
-        data = super().get_all()
         if isinstance(self.patch_size, int) and self.threshold_ind > 0:
-            return data[self.threshold_ind: self.epoch_ind[1]]
-        return data[self.epoch_ind[0]: self.epoch_ind[1]]
+            return self.get(self.threshold_ind, self.epoch_ind[1], copy=True)
+        return self.get(self.epoch_ind[0], self.epoch_ind[1], copy=True)
 
 
 class BaseAmplifier:
@@ -227,7 +373,7 @@ class BaseAmplifier:
         while not self._exit.is_set():
             try:
                 samples = self.recv()
-                if samples:
+                if samples is not None and len(samples):
                     self._detect_event(samples)
             except Exception:
                 pass
@@ -243,14 +389,14 @@ class BaseAmplifier:
 
     def _detect_event(self, samples):
         """detect event label"""
+        samples = np.asarray(samples, dtype=np.float64)
         for work_name in self._workers:
             logger_amp.info("process worker-{}".format(work_name))
             marker = self._markers[work_name]
             worker = self._workers[work_name]
-            for sample in samples:
-                marker.append(sample)
-                if marker(sample[-1]) and worker.is_alive():
-                    worker.put(marker.get_epoch())
+            for epoch in marker.update(samples):
+                if worker.is_alive():
+                    worker.put(epoch)
 
     def up_worker(self, name):
         logger_amp.info("up worker-{}".format(name))
@@ -329,15 +475,15 @@ class NeuroScan(BaseAmplifier):
         return (ch_id[0].decode("utf-8"), w_code[0], w_request[0], pkg_size[0])
 
     def _unpack_data(self, num_chans, b_data):
-        fmt = ">" + str((num_chans + 1) * 4) + "B"
         samples = (
-            np.array(list(struct.iter_unpack(fmt, b_data)), dtype=np.uint8)
-            .view(np.int32)
+            np.frombuffer(b_data, dtype="<i4")
+            .reshape(-1, num_chans + 1)
             .astype(np.float64)
         )
-        samples[:, -1] = samples[:, -1] - 65280
-        samples[:, :-1] = samples[:, :-1] * 0.0298 * 1e-6
-        return samples.tolist()
+        samples[:, -1] -= 65280
+        samples[:, :-1] *= 0.0298
+        samples[:, :-1] *= 1e-6
+        return samples
 
     def _recv(self, num_bytes):
         fragments = []
@@ -463,9 +609,9 @@ class Curry8(BaseAmplifier):
 
     def _unpack_data(self, num_chans, b_data):
         samples = np.frombuffer(b_data,
-                                dtype=np.float32).reshape(-1,
-                                                          num_chans).astype(np.float64)
-        samples[:, -1] = samples[:, -1] - 65280
+                                dtype="<f4").reshape(-1,
+                                                     num_chans).astype(np.float64)
+        samples[:, -1] -= 65280
         return samples
 
     def _recv(self, num_bytes):
@@ -491,7 +637,7 @@ class Curry8(BaseAmplifier):
                 if header[1] == self.dataType(
                         "Data_Eeg") and header[2] == self.blockType("DataTypeFloat32bit"):
                     samples = self._unpack_data(self.num_chans, b_data)
-                    return samples.tolist()
+                    return samples
         return []
 
     def send(self, message):
@@ -803,18 +949,16 @@ class Neuracle(BaseAmplifier):
         else:
             data, evt = self._unpack_data(raw_data)
             data = data.reshape(len(data) // self.num_chans, self.num_chans)
-        return data.tolist()
+        return data
 
     def _unpack_data(self, raw):
         len_raw = len(raw)
         event, hex_data = [], []
         # unpack hex_data in row
         hex_data = raw[:len_raw - np.mod(len_raw, 4 * self.num_chans)]
-        n_item = int(len(hex_data) / 4 / self.num_chans)
-        format_str = '<' + (str(self.num_chans) + 'f') * n_item
-        unpack_data = struct.unpack(format_str, hex_data)
+        unpack_data = np.frombuffer(hex_data, dtype="<f4").astype(np.float64)
 
-        return np.asarray(unpack_data), event
+        return unpack_data, event
 
     def connect_tcp(self):
         self.tcp_link.connect(self.device_address)
@@ -985,7 +1129,7 @@ class LSLapps():
                     self.marker_cache.remove(label)
             # Replaced the last column of device_data as the trigger column
             device_data[:, -1] = label_line
-            return device_data.tolist()
+            return device_data
         else:
             return []
 
@@ -1120,15 +1264,14 @@ class HTOnlineSystem(BaseAmplifier):
 
         Returns
         ----------
-        samples :  list
+        samples :  ndarray, shape(n_samples, num_chans+1)
             Unpacked data.
 
         """
 
-        fmt = "<" + str(self.packet_points) + "f"
-        samples = np.array(struct.unpack(fmt, b_data))  # 解开包
-        samples = samples.reshape(-1, self.num_chans + 1)
-        return samples.tolist()
+        samples = np.frombuffer(b_data, dtype="<f4", count=self.packet_points)  # 解开包
+        samples = samples.reshape(-1, self.num_chans + 1).astype(np.float64)
+        return samples
 
     def _recv(self, num_bytes):
         """
@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+# License: MIT License
+"""
+Hardware-free replay of EEG streams for online testing and benchmarking.
+
+    ReplaySource: recorded epochs or synthetic data with embedded triggers, paced in packets;
+
+    ReplayAmplifier: an amplifier that feeds a ReplaySource to the markers and workers directly;
+
+    ReplayServer: a local TCP server emulating the NeuroScan, Neuracle and HT wire formats,
+    so that the real amplifier clients can be driven without a device;
+
+    run_benchmark(): trigger-to-consume latency, dropped packets and CPU use of an online pipeline.
+
+"""
+import math
+import multiprocessing
+import queue
+import socket
+import struct
+import threading
+import time
+from typing import Optional, Tuple, Dict, Any, List, cast
+
+import numpy as np
+
+from .amplifiers import BaseAmplifier, Marker
+from .logger import get_logger
+from .workers import ProcessWorker
+
+logger_sim = get_logger("simulator")
+
+
+class ReplaySource:
+    """Paced replay of a continuous stream with an event trigger channel.
+
+    Parameters
+    ----------
+    data: ndarray, shape(n_channels, n_samples)
+        Continuous data to replay.
+    srate: float
+        Sample rate of the data.
+    events: array_like, shape(n_events, 2), optional
+        Sample positions and non-zero labels of the triggers, each trigger is one sample long.
+    packet_samples: int, optional
+        Number of samples in a packet, by default srate/25 (40 ms) as NeuroScan does.
+    speed: float
+        Replay rate relative to real time, 1 for real time, 10 for ten times faster,
+        0 to send the packets as fast as possible, by default 1.
+    loop: bool
+        Whether to restart from the beginning at the end of the data, by default False.
+
+    Attributes
+    ----------
+    stream: ndarray, shape(n_samples, n_channels+1)
+        Samples with the trigger in the last column.
+    n_sent_: int
+        Number of samples delivered since the last reset.
+    n_packets_: int
+        Number of packets delivered since the last reset.
+    finished: threading.Event
+        Set when all the data have been delivered.
+
+    Note
+    ----
+    Packets always have packet_samples samples, an incomplete packet at the end of the data is not sent.
+    """
+
+    def __init__(
+        self,
+        data,
+        srate: float,
+        events=None,
+        packet_samples: Optional[int] = None,
+        speed: float = 1.0,
+        loop: bool = False,
+    ):
+        data = np.asarray(data, dtype=np.float64)
+        self.n_channels, n_samples = data.shape
+        self.stream = np.zeros((n_samples, self.n_channels + 1))
+        self.stream[:, :-1] = data.T
+        if events is not None:
+            events = np.asarray(events).reshape(-1, 2)
+            self.stream[events[:, 0].astype(int), -1] = events[:, 1]
+        self.srate = srate
+        self.packet_samples = (
+            int(packet_samples) if packet_samples else max(1, int(round(srate / 25)))
+        )
+        self.speed = speed
+        self.loop = loop
+        self.finished = threading.Event()
+        self.reset()
+
+    @classmethod
+    def from_epochs(cls, X, y, srate: float, trigger_offset: int = 0, iti: float = 0.0, **kwargs):
+        """Concatenate epochs, e.g. from paradigm.get_data() of a BaseDataset, into a stream.
+
+        Parameters
+        ----------
+        X: ndarray, shape(n_trials, n_channels, n_samples)
+            Epochs.
+        y: array_like, shape(n_trials,)
+            Trigger labels, 0 is no event so encoded labels should be shifted, e.g. y+1.
+        srate: float
+            Sample rate of the epochs.
+        trigger_offset: int
+            Sample position of the event inside each epoch, e.g. -tmin*srate for epochs with a baseline.
+        iti: float
+            Seconds of zeros inserted after each epoch.
+        **kwargs:
+            Other parameters of ReplaySource.
+
+        Returns
+        ----------
+        source: ReplaySource
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n_trials, n_channels, n_samples = X.shape
+        trial_len = n_samples + int(round(iti * srate))
+        data = np.zeros((n_trials, n_channels, trial_len))
+        data[..., :n_samples] = X
+        data = data.transpose(1, 0, 2).reshape(n_channels, -1)
+        events = np.stack(
+            (np.arange(n_trials) * trial_len + trigger_offset, np.asarray(y)), axis=1
+        )
+        return cls(data, srate, events=events, **kwargs)
+
+    @classmethod
+    def synthetic(
+        cls,
+        n_channels: int = 8,
+        srate: float = 1000,
+        n_trials: int = 20,
+        events: Tuple[int, ...] = (1,),
+        trial_len: float = 1.0,
+        iti: float = 0.5,
+        amplitude: float = 1e-5,
+        random_state: Optional[int] = None,
+        **kwargs
+    ):
+        """Gaussian noise with a trigger every trial_len+iti seconds.
+
+        Parameters
+        ----------
+        n_channels: int
+            Number of data channels.
+        srate: float
+            Sample rate.
+        n_trials: int
+            Number of triggers.
+        events: tuple of int
+            Trigger labels, drawn uniformly for each trial.
+        trial_len: float
+            Seconds from a trigger to the end of its trial.
+        iti: float
+            Seconds between the end of a trial and the next trigger.
+        amplitude: float
+            Standard deviation of the noise in volts.
+        random_state: int, optional
+            Seed of the generator.
+        **kwargs:
+            Other parameters of ReplaySource.
+
+        Returns
+        ----------
+        source: ReplaySource
+        """
+        rng = np.random.default_rng(random_state)
+        period = int(round((trial_len + iti) * srate))
+        data = amplitude * rng.standard_normal((n_channels, n_trials * period + period))
+        events = np.stack(
+            (np.arange(n_trials) * period + period // 2, rng.choice(events, n_trials)), axis=1
+        )
+        return cls(data, srate, events=events, **kwargs)
+
+    def reset(self):
+        """Restart the replay from the first sample."""
+        self.n_sent_ = 0
+        self.n_packets_ = 0
+        self._t0 = None
+        self.finished.clear()
+
+    def next_packet(self):
+        """Wait until the next packet is due and return it.
+
+        Returns
+        ----------
+        samples: ndarray, shape(packet_samples, n_channels+1)
+            Next packet, None if all the data have been delivered.
+        """
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        start = self.n_sent_
+        stop = start + self.packet_samples
+        if self.loop:
+            samples = self.stream.take(np.arange(start, stop), axis=0, mode="wrap")
+        elif stop <= len(self.stream):
+            samples = self.stream[start:stop]
+        else:
+            self.finished.set()
+            return None
+        if self.speed:
+            delay = self._t0 + stop / (self.srate * self.speed) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.n_sent_ = stop
+        self.n_packets_ += 1
+        return samples
+
+
+class ReplayAmplifier(BaseAmplifier):
+    """An amplifier replaying a ReplaySource, no device or socket is involved.
+
+    Parameters
+    ----------
+    source: ReplaySource
+        Data to replay.
+    """
+
+    def __init__(self, source: ReplaySource):
+        super().__init__()
+        self.source = source
+        self.srate = source.srate
+        self.num_chans = source.n_channels
+
+    def recv(self):
+        samples = self.source.next_packet()
+        if samples is None:
+            # replay finished, idle instead of spinning
+            self._exit.wait(self.source.packet_samples / self.srate)
+        return samples
+
+    def start_trans(self):
+        self.source.reset()
+        self.start()
+
+    def stop_trans(self):
+        self.stop()
+
+
+class ReplayServer:
+    """A local TCP server streaming a ReplaySource in the wire format of a device.
+
+    Parameters
+    ----------
+    source: ReplaySource
+        Data to stream.
+    protocol: str
+        Wire format, 'neuroscan', 'neuracle' or 'ht'.
+    address: Tuple[ip : str, port : int]
+        Address to listen on, port 0 picks a free port, by default ('127.0.0.1', 0).
+    ch_names: list of str, optional
+        Channel names reported to HTOnlineSystem.get_name_chans, at most 7 characters each.
+
+    Attributes
+    ----------
+    address: Tuple[str, int]
+        Bound address once started.
+
+    Note
+    ----
+    Clients should be configured as for the device:
+    NeuroScan(num_chans=n_channels) and HTOnlineSystem(num_chans=n_channels, packet_samples=packet_samples)
+    with the trigger channel excluded, Neuracle(num_chans=n_channels+1) with the trigger channel included.
+    NeuroScan streams after 'start_trans', HT after 'start_acq', and Neuracle as soon as the client connects.
+    Streaming restarts the source from the beginning. One client is served.
+
+    Tip
+    ----
+    ..  code-block:: python
+        :linenos:
+        :caption: Driving the NeuroScan client without a device
+
+        source = ReplaySource.synthetic(n_channels=8, srate=1000)
+        server = ReplayServer(source, protocol='neuroscan')
+        address = server.start()
+        ns = NeuroScan(device_address=address, srate=1000, num_chans=8)
+        ns.connect_tcp()
+        ns.start_acq()
+        ns.register_worker('feedback_worker', worker, marker)
+        ns.up_worker('feedback_worker')
+        ns.start_trans()
+    """
+
+    _PROTOCOLS = ("neuroscan", "neuracle", "ht")
+    # NeuroScan control codes (code, request) of the CTRL packets
+    _NS_START_ACQ = (2, 1)
+    _NS_STOP_ACQ = (2, 2)
+    _NS_START_TRANS = (3, 3)
+    _NS_STOP_TRANS = (3, 4)
+    _NS_STOP_CONNECT = (1, 2)
+
+    def __init__(
+        self,
+        source: ReplaySource,
+        protocol: str = "neuroscan",
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        ch_names: Optional[List[str]] = None,
+    ):
+        if protocol not in self._PROTOCOLS:
+            raise ValueError(
+                "protocol should be one of {}, got {}".format(self._PROTOCOLS, protocol)
+            )
+        self.source = source
+        self.protocol = protocol
+        self.address = address
+        if ch_names is None:
+            ch_names = ["CH{:d}".format(i + 1) for i in range(source.n_channels)] + ["TRIGGER"]
+        self.ch_names = ch_names
+        self._sock = None
+        self._conn = None
+        self._exit = threading.Event()
+        self._streaming = threading.Event()
+        self._send_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Listen and serve in background threads.
+
+        Returns
+        ----------
+        address: Tuple[str, int]
+            Bound address.
+        """
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        self._sock.listen(1)
+        self._sock.settimeout(0.1)
+        self.address = self._sock.getsockname()
+        self._exit.clear()
+        self._streaming.clear()
+        self._threads = [
+            threading.Thread(target=self._serve, name="replay_server", daemon=True),
+            threading.Thread(target=self._send_loop, name="replay_sender", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        logger_sim.info("replay server ({}) listening on {}".format(self.protocol, self.address))
+        return self.address
+
+    def stop(self):
+        """Stop streaming and close the sockets."""
+        self._exit.set()
+        self._streaming.clear()
+        for t in self._threads:
+            t.join()
+        for sock in (self._conn, self._sock):
+            if sock is not None:
+                sock.close()
+        self._conn, self._sock = None, None
+        logger_sim.info("replay server stopped")
+
+    def _recv_exact(self, num_bytes):
+        fragments = []
+        b_count = 0
+        while b_count < num_bytes and not self._exit.is_set():
+            try:
+                chunk = self._conn.recv(num_bytes - b_count)
+            except socket.timeout:
+                continue
+            except OSError:
+                return None
+            if not chunk:
+                return None
+            b_count += len(chunk)
+            fragments.append(chunk)
+        if b_count < num_bytes:
+            return None
+        return b"".join(fragments)
+
+    def _send(self, message):
+        with self._send_lock:
+            self._conn.sendall(message)
+
+    def _serve(self):
+        while not self._exit.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(0.1)
+            self._conn = conn
+            break
+        else:
+            return
+        logger_sim.info("replay client connected")
+        if self.protocol == "neuracle":
+            self._start_streaming()
+        handler = getattr(self, "_handle_" + self.protocol)
+        try:
+            while not self._exit.is_set() and handler():
+                pass
+        except OSError:
+            pass
+        self._streaming.clear()
+        logger_sim.info("replay client disconnected")
+
+    def _start_streaming(self):
+        self.source.reset()
+        self._streaming.set()
+
+    def _send_loop(self):
+        while not self._exit.is_set():
+            if not self._streaming.wait(0.1):
+                continue
+            samples = self.source.next_packet()
+            if samples is None:
+                self._streaming.clear()
+                continue
+            try:
+                self._send(getattr(self, "_encode_" + self.protocol)(samples))
+            except OSError:
+                self._streaming.clear()
+
+    def _handle_neuroscan(self):
+        b_command = self._recv_exact(12)
+        if b_command is None:
+            return False
+        command = struct.unpack(">HH", b_command[4:8])
+        if command in (self._NS_START_ACQ, self._NS_STOP_ACQ):
+            # the client waits for two packets after (de)activating the acquisition
+            ack = struct.pack(">4sHHI", b"CTRL", *command, 0)
+            self._send(ack + ack)
+        elif command == self._NS_START_TRANS:
+            self._start_streaming()
+        elif command == self._NS_STOP_TRANS:
+            self._streaming.clear()
+        elif command == self._NS_STOP_CONNECT:
+            return False
+        return True
+
+    def _handle_ht(self):
+        b_command = self._recv_exact(4)
+        if b_command is None:
+            return False
+        group, command = b_command[1], b_command[2]
+        if group == 16 and command == 1:
+            self._start_streaming()
+        elif group == 16 and command == 2:
+            self._streaming.clear()
+        elif group == 1 and command in (1, 2, 3):
+            value = (
+                int(self.source.srate),
+                self.source.packet_samples,
+                self.source.n_channels + 1,
+            )[command - 1]
+            self._send(struct.pack("<BBHII", 165, command, 1, 4, value) + bytes([90]))
+        elif group == 1 and command == 4:
+            names = "".join(name[:7].ljust(7) + "\t" for name in self.ch_names).encode()
+            self._send(struct.pack("<BBHI", 165, command, len(self.ch_names), len(names)) + names + bytes([90]))
+        return True
+
+    def _handle_neuracle(self):
+        try:
+            chunk = self._conn.recv(1024)
+        except socket.timeout:
+            return True
+        return bool(chunk)
+
+    def _encode_neuroscan(self, samples):
+        b_data = np.empty(samples.shape, dtype="<i4")
+        b_data[:, :-1] = np.round(samples[:, :-1] / (0.0298 * 1e-6))
+        b_data[:, -1] = samples[:, -1] + 65280
+        b_data = b_data.tobytes()
+        return struct.pack(">4sHHI", b"DATA", 2, 1, len(b_data)) + b_data
+
+    def _encode_neuracle(self, samples):
+        return samples.astype("<f4").tobytes()
+
+    def _encode_ht(self, samples):
+        b_data = samples.astype("<f4").tobytes()
+        return struct.pack("<BBHI", 165, 16, samples.shape[1], len(b_data)) + b_data + bytes([90])
+
+
+class BenchmarkWorker(ProcessWorker):
+    """A ProcessWorker reporting when each epoch is consumed, used by run_benchmark.
+
+    Override `process` with the online processing under test, e.g. a model prediction. Overrides of
+    `pre`, e.g. to load a model, must call `super().pre()`, which signals run_benchmark that the worker
+    is ready.
+
+    Parameters
+    ----------
+    timeout: float
+        Timer setting.
+    name: str
+        Name of the worker, also used to register it on the amplifier.
+    **kwargs:
+        Other parameters of ProcessWorker, e.g. shm_shape.
+
+    Attributes
+    ----------
+    results: multiprocessing.Queue
+        ('epoch', t_consume, t_done) for each epoch, then ('cpu', cpu_seconds) when the worker exits,
+        times are time.perf_counter() values.
+    ready: multiprocessing.Event
+        Set once `pre` has run.
+    """
+
+    def __init__(self, timeout: float = 1e-3, name: str = "benchmark_worker", **kwargs):
+        super().__init__(timeout=timeout, name=name, **kwargs)
+        self.results: multiprocessing.Queue[Any] = multiprocessing.Queue()
+        self.ready = multiprocessing.Event()
+
+    def pre(self):
+        self._cpu = time.process_time()
+        self.ready.set()
+
+    def consume(self, data):
+        t_consume = time.perf_counter()
+        self.process(data)
+        self.results.put(("epoch", t_consume, time.perf_counter()))
+
+    def process(self, data):
+        """Online processing under test, nothing by default."""
+        pass
+
+    def post(self):
+        self.results.put(("cpu", time.process_time() - self._cpu))
+
+
+def _percentiles(x):
+    x = np.asarray(x) * 1e3
+    keys = ("p50", "p90", "p95", "p99", "max")
+    if len(x) == 0:
+        return dict.fromkeys(keys, np.nan)
+    return dict(zip(keys, np.percentile(x, [50, 90, 95, 99, 100]).tolist()))
+
+
+def _trigger_onsets(triggers, marker):
+    """Sample positions of the rising edges of the marker's events."""
+    if not triggers or marker.events is None:
+        return np.zeros(0, dtype=int)
+    events = np.trunc(np.concatenate(triggers))
+    is_event = events != 0
+    rising = is_event.copy()
+    rising[1:] &= ~is_event[:-1]
+    onsets = np.flatnonzero(rising)
+    return onsets[np.isin(events[onsets], marker.events)]
+
+
+def run_benchmark(
+    amplifier: BaseAmplifier,
+    source: ReplaySource,
+    marker: Marker,
+    worker: Optional[BenchmarkWorker] = None,
+    start=None,
+    stop=None,
+    timeout: Optional[float] = None,
+    drain: float = 2.0,
+    ready_timeout: float = 60.0,
+) -> Dict[str, Any]:
+    """Drive an online pipeline with a ReplaySource and measure it.
+
+    Packets are timestamped when the amplifier's recv returns them, the trigger time is the arrival
+    of the packet holding the trigger sample and the epoch time the arrival of the packet completing the
+    epoch. Epochs are matched to the triggers in order, so the marker should deliver one epoch per
+    trigger (patch_size None).
+
+    Parameters
+    ----------
+    amplifier: BaseAmplifier
+        ReplayAmplifier of the source, or a device client connected to a ReplayServer of the source.
+    source: ReplaySource
+        Replayed data.
+    marker: Marker
+        Marker of the worker.
+    worker: BenchmarkWorker, optional
+        Worker under test, a no-op BenchmarkWorker by default.
+    start: callable, optional
+        Starts the transport, by default amplifier.start, e.g. amplifier.start_trans for NeuroScan.
+    stop: callable, optional
+        Stops the transport, by default amplifier.stop, e.g. amplifier.stop_trans for NeuroScan.
+    timeout: float, optional
+        Maximum seconds to wait for the source to finish, required when the source loops.
+    drain: float
+        Maximum seconds to wait for the last epochs once the source finished.
+    ready_timeout: float
+        Maximum seconds to wait for the worker to run `pre`.
+
+    Returns
+    ----------
+    report: dict
+        n_triggers, n_epochs and missed_trials;
+        trigger_latency (trigger packet to consume), epoch_latency (last packet of the epoch to consume) and
+        consume_time (duration of `process`), as p50/p90/p95/p99/max in ms;
+        sent_samples, received_samples, dropped_samples and dropped_packets;
+        wall_time in seconds, cpu_main and cpu_worker as percent of one core.
+
+    Raises
+    ----------
+    RuntimeError
+        If the worker exits or is not ready within ready_timeout, e.g. an override of `pre` not calling
+        `super().pre()`.
+    """
+    if worker is None:
+        worker = BenchmarkWorker()
+    recv = amplifier.recv
+    times, counts, triggers = [], [], []
+
+    def timed_recv():
+        samples = recv()
+        if samples is not None and len(samples):
+            t = time.perf_counter()
+            samples = np.asarray(samples, dtype=np.float64)
+            times.append(t)
+            counts.append(len(samples))
+            triggers.append(samples[:, -1].copy())
+        return samples
+
+    epochs = []
+    cpu_worker = np.nan
+
+    def collect(block_timeout=None):
+        nonlocal cpu_worker
+        try:
+            item = worker.results.get(timeout=block_timeout) if block_timeout else worker.results.get_nowait()
+        except queue.Empty:
+            return False
+        if item[0] == "epoch":
+            epochs.append(item[1:])
+        else:
+            cpu_worker = item[1]
+        return True
+
+    worker_name = cast(str, worker.worker_name)
+    amplifier.register_worker(worker_name, worker, marker)
+    worker.start()
+    t_ready = time.perf_counter() + ready_timeout
+    while not worker.ready.wait(0.1):
+        if not worker.is_alive() or time.perf_counter() > t_ready:
+            if worker.is_alive():
+                reason = "is not ready after {} s".format(ready_timeout)
+                worker.terminate()
+            else:
+                reason = "exited during start-up"
+            worker.join(5)
+            amplifier.unregister_worker(worker_name)
+            raise RuntimeError(
+                "Worker {} {}, overrides of pre must call super().pre()".format(
+                    worker_name, reason
+                )
+            )
+    amplifier.recv = timed_recv  # type: ignore[method-assign]
+    t_start, cpu_start = time.perf_counter(), time.process_time()
+    (start or amplifier.start)()
+    try:
+        t_end = None if timeout is None else t_start + timeout
+        while not source.finished.is_set():
+            if t_end is not None and time.perf_counter() > t_end:
+                break
+            if not collect(0.05):
+                continue
+        t_end = time.perf_counter() + drain
+        while time.perf_counter() < t_end:
+            if not collect(0.05) and len(epochs) >= len(_trigger_onsets(triggers, marker)):
+                break
+        wall_time = time.perf_counter() - t_start
+        cpu_main = time.process_time() - cpu_start
+    finally:
+        (stop or amplifier.stop)()
+        del amplifier.recv
+    t_end = time.perf_counter() + drain + 5
+    while np.isnan(cpu_worker) and time.perf_counter() < t_end:
+        collect(0.1)
+    worker.join(5)
+
+    received = int(np.sum(counts))
+    dropped = max(source.n_sent_ - received, 0)
+    onsets = _trigger_onsets(triggers, marker)
+    n_matched = min(len(onsets), len(epochs))
+    consumed = np.asarray(epochs, dtype=np.float64).reshape(-1, 2)[:n_matched]
+    ends, t_packets = np.cumsum(counts), np.asarray(times)
+    t_trigger = t_packets[np.searchsorted(ends, onsets[:n_matched], side="right")]
+    t_epoch = t_packets[
+        np.minimum(np.searchsorted(ends, onsets[:n_matched] + marker.latency, side="right"), len(t_packets) - 1)
+    ]
+    return {
+        "n_triggers": len(onsets),
+        "n_epochs": len(epochs),
+        "missed_trials": max(len(onsets) - len(epochs), 0),
+        "trigger_latency": _percentiles(consumed[:, 0] - t_trigger),
+        "epoch_latency": _percentiles(consumed[:, 0] - t_epoch),
+        "consume_time": _percentiles(consumed[:, 1] - consumed[:, 0]),
+        "sent_samples": source.n_sent_,
+        "received_samples": received,
+        "dropped_samples": dropped,
+        "dropped_packets": math.ceil(dropped / source.packet_samples),
+        "wall_time": wall_time,
+        "cpu_main": 100 * cpu_main / wall_time,
+        "cpu_worker": 100 * cpu_worker / wall_time,
+    }
@@ -10,16 +10,37 @@ Start another process, define a framework for offline modeling and online proces
 
 In the actual usage process, you only need to customize the operations of the above functions.
 """
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 from abc import abstractmethod
+from multiprocessing import shared_memory
 import os
 import multiprocessing
 import queue
+import weakref
+import numpy as np
 from .logger import get_logger
 
 logger = get_logger("worker")
 
 
+class SharedEpoch:
+    """Index message of an epoch stored in a shared memory slot.
+
+    Parameters
+    ----------
+    slot: int
+        Index of the slot in the slot ring.
+    n_samples: int
+        Number of valid samples in the slot.
+    """
+
+    __slots__ = ("slot", "n_samples")
+
+    def __init__(self, slot: int, n_samples: int):
+        self.slot = slot
+        self.n_samples = n_samples
+
+
 class ProcessWorker(multiprocessing.Process):
     """Online processing.
 
@@ -36,6 +57,15 @@ class ProcessWorker(multiprocessing.Process):
         Timer setting.
     name: str
         Custom name for the online processing process.
+    shm_shape: tuple of int, optional
+        Maximum epoch shape (n_samples, n_channels+1). If given, epochs are transported through a ring of
+        preallocated shared memory slots and only a small SharedEpoch index is queued, so `consume` receives a
+        NumPy view without serialization. Epochs that do not fit, or arrive while all slots are busy, fall back
+        to the queue. By default None, every epoch is pickled through the queue.
+    shm_slots: int
+        Number of shared memory slots, by default 4.
+    shm_dtype: str
+        Dtype of the shared memory slots, float32 or float64, by default float64.
 
     Attributes
     ----------
@@ -44,6 +74,8 @@ class ProcessWorker(multiprocessing.Process):
         Multiprocess event handling.
     _in_queue: queue
         Data sharing between the online processing process and the main process.
+    _free_slots: queue
+        Indices of the shared memory slots that can be written.
 
     Tip
     ----
@@ -85,13 +117,57 @@ class ProcessWorker(multiprocessing.Process):
 
     """
 
-    def __init__(self, timeout: float = 1e-3, name: Optional[str] = None):
+    def __init__(self, timeout: float = 1e-3, name: Optional[str] = None,
+                 shm_shape: Optional[Tuple[int, int]] = None, shm_slots: int = 4,
+                 shm_dtype: str = "float64"):
         multiprocessing.Process.__init__(self)
         self.daemon = False
         self._exit = multiprocessing.Event()
         self._in_queue: multiprocessing.Queue[Any] = multiprocessing.Queue()
         self.timeout = timeout
         self.worker_name = name
+        self.shm_shape = shm_shape
+        self.shm_slots = shm_slots
+        self.shm_dtype = shm_dtype
+        self._shm = None
+        self._slots = None
+        if shm_shape is not None:
+            nbytes = shm_slots * int(np.prod(shm_shape)) * np.dtype(shm_dtype).itemsize
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            weakref.finalize(self, _release_shm, self._shm)
+            self._free_slots: multiprocessing.Queue[Any] = multiprocessing.Queue()
+            for slot in range(shm_slots):
+                self._free_slots.put(slot)
+
+    def _slot_views(self):
+        if self._slots is None:
+            self._slots = np.ndarray(
+                (self.shm_slots, *self.shm_shape), dtype=self.shm_dtype, buffer=self._shm.buf
+            )
+        return self._slots
+
+    def _put_shared(self, data):
+        data = np.asarray(data)
+        if data.ndim != 2 or data.shape[0] > self.shm_shape[0] or data.shape[1] != self.shm_shape[1]:
+            return False
+        try:
+            slot = self._free_slots.get_nowait()
+        except queue.Empty:
+            logger.warning(
+                "no free shared memory slot in worker-{}, fall back to queue".format(
+                    self.worker_name if self.worker_name else os.getpid()
+                )
+            )
+            return False
+        self._slot_views()[slot, : data.shape[0]] = data
+        self._in_queue.put(SharedEpoch(slot, data.shape[0]))
+        return True
+
+    def _get_data(self, item):
+        """Resolve a queued item, returns (data, slot)."""
+        if isinstance(item, SharedEpoch):
+            return self._slot_views()[item.slot, : item.n_samples], item.slot
+        return item, None
 
     def put(self, data):
         """Put the data in the queue
@@ -115,6 +191,8 @@ class ProcessWorker(multiprocessing.Process):
                 self.worker_name if self.worker_name else os.getpid()
             )
         )
+        if self._shm is not None and self._put_shared(data):
+            return
         self._in_queue.put(data)
 
     def run(self):
@@ -155,13 +233,17 @@ class ProcessWorker(multiprocessing.Process):
         self.clear_queue()
         while not self._exit.is_set():
             try:
-                data = self._in_queue.get(timeout=self.timeout)
+                data, slot = self._get_data(self._in_queue.get(timeout=self.timeout))
                 logger.info(
                     "consume samples in worker-{}".format(
                         self.worker_name if self.worker_name else os.getpid()
                     )
                 )
-                self.consume(data)
+                try:
+                    self.consume(data)
+                finally:
+                    if slot is not None:
+                        self._free_slots.put(slot)
             except queue.Empty:
                 # if queue is empty, loop to wait for next data until exiting
                 pass
@@ -206,7 +288,8 @@ class ProcessWorker(multiprocessing.Process):
         Parameters
         ----------
         data: ndarray, shape(n_samples, n_channels+1)
-            Single trial of online data.
+            Single trial of online data. With the shared memory transport it is a view of a slot that is
+            reused after `consume` returns, copy it to keep it.
 
         """
         pass
@@ -264,11 +347,21 @@ class ProcessWorker(multiprocessing.Process):
         )
         while True:
             try:
-                self._in_queue.get(timeout=self.timeout)
+                item = self._in_queue.get(timeout=self.timeout)
             except queue.Empty:
                 break
+            if isinstance(item, SharedEpoch):
+                self._free_slots.put(item.slot)
         logger.info(
             "all queue items in worker-{} are cleared".format(
                 self.worker_name if self.worker_name else os.getpid()
             )
         )
+
+
+def _release_shm(shm):
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
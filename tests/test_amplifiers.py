@@ -0,0 +1,173 @@
+from .base_tmpl import BaseTmpl
+from collections import deque
+import multiprocessing
+import queue
+import struct
+import time
+import numpy as np
+from metabci.brainflow.amplifiers import (
+    RingBuffer, Marker, NeuroScan, Curry8, Neuracle, HTOnlineSystem)
+from metabci.brainflow.workers import ProcessWorker
+
+
+class _EchoWorker(ProcessWorker):
+    """Sends back each consumed epoch and whether it was read from a shared memory slot."""
+
+    def __init__(self, **kwargs):
+        super().__init__(timeout=0.01, name="echo", **kwargs)
+        self.results = multiprocessing.Queue()
+        self.ready = multiprocessing.Event()
+
+    def pre(self):
+        self.ready.set()
+
+    def consume(self, data):
+        shared = np.shares_memory(data, self._slot_views())
+        time.sleep(0.05)
+        self.results.put((shared, np.array(data)))
+
+    def post(self):
+        pass
+
+
+class TestRingBuffer(BaseTmpl):
+
+    def test_extend(self):
+        rng = np.random.default_rng(42)
+        data = rng.standard_normal((100, 3))
+        buffer = RingBuffer(size=16)
+        expected = deque(maxlen=16)
+        start = 0
+        for n_samples in [1, 5, 11, 3, 20, 1, 7, 9, 30, 13]:
+            chunk = data[start:start + n_samples]
+            start += n_samples
+            buffer.extend(chunk)
+            expected.extend(chunk.tolist())
+            self.assertEqual(len(buffer), len(expected))
+            self.assertTrue(np.array_equal(buffer.get_all(), np.array(expected)))
+            self.assertTrue(np.array_equal(buffer.get(3, 12), np.array(list(expected)[3:12]).reshape(-1, 3)))
+        buffer.append(data[0])
+        self.assertTrue(buffer.isfull())
+        self.assertTrue(np.array_equal(buffer.get(-1), data[:1]))
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+
+
+class TestMarker(BaseTmpl):
+
+    def test_update(self):
+        rng = np.random.default_rng(42)
+        data = rng.standard_normal((3000, 4))
+        data[:, -1] = 0
+        for p in rng.choice(2900, 40, replace=False):
+            data[p:p + rng.integers(1, 4), -1] = rng.choice([1, 2, 3])
+        for kwargs in [
+            dict(interval=[0.02, 0.2], events=[1, 2]),
+            dict(interval=[-0.1, 0.1], events=[1, 2, 3]),
+            dict(interval=[0, 0.3], events=[1, 2, 3], patch_size=40),
+            dict(interval=[0, 0.25], events=None),
+        ]:
+            expected, epochs = [], []
+            marker = Marker(srate=1000, **kwargs)
+            for sample in data:
+                marker.append(sample)
+                if marker(sample[-1]):
+                    expected.append(marker.get_epoch())
+            marker = Marker(srate=1000, **kwargs)
+            for chunk in np.array_split(data, 77):
+                epochs.extend(marker.update(chunk))
+            self.assertEqual(len(epochs), len(expected))
+            for epoch, epoch_expected in zip(epochs, expected):
+                self.assertTrue(np.array_equal(epoch, epoch_expected))
+
+
+def _neuroscan_legacy(num_chans, b_data):
+    fmt = ">" + str((num_chans + 1) * 4) + "B"
+    samples = (
+        np.array(list(struct.iter_unpack(fmt, b_data)), dtype=np.uint8)
+        .view(np.int32)
+        .astype(np.float64)
+    )
+    samples[:, -1] = samples[:, -1] - 65280
+    samples[:, :-1] = samples[:, :-1] * 0.0298 * 1e-6
+    return samples.tolist()
+
+
+def _neuracle_legacy(num_chans, raw):
+    hex_data = raw[:len(raw) - np.mod(len(raw), 4 * num_chans)]
+    n_item = int(len(hex_data) / 4 / num_chans)
+    format_str = '<' + (str(num_chans) + 'f') * n_item
+    return np.asarray(struct.unpack(format_str, hex_data))
+
+
+def _ht_legacy(num_chans, packet_points, b_data):
+    fmt = "<" + str(packet_points) + "f"
+    samples = np.array(struct.unpack(fmt, b_data))
+    return samples.reshape(-1, num_chans + 1).tolist()
+
+
+class TestDecoders(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.int_bytes = rng.integers(-2**31, 2**31, 40 * 9, dtype=np.int32).astype("<i4").tobytes()
+        self.float_bytes = rng.standard_normal(40 * 9).astype("<f4").tobytes()
+
+    def assertBytesEqual(self, samples, expected):
+        samples = np.asarray(samples, dtype=np.float64)
+        expected = np.asarray(expected, dtype=np.float64)
+        self.assertEqual(samples.shape, expected.shape)
+        self.assertEqual(samples.tobytes(), expected.tobytes())
+
+    def test_neuroscan(self):
+        amp = NeuroScan(num_chans=8)
+        self.assertBytesEqual(amp._unpack_data(8, self.int_bytes), _neuroscan_legacy(8, self.int_bytes))
+
+    def test_curry8(self):
+        amp = Curry8(num_chans=9)
+        expected = np.frombuffer(self.float_bytes, dtype=np.float32).reshape(-1, 9).astype(np.float64)
+        expected[:, -1] = expected[:, -1] - 65280
+        self.assertBytesEqual(amp._unpack_data(9, self.float_bytes), expected)
+
+    def test_neuracle(self):
+        amp = Neuracle(num_chans=9)
+        raw = self.float_bytes + b"\x00\x01"
+        self.assertBytesEqual(amp._unpack_data(raw)[0], _neuracle_legacy(9, raw))
+
+    def test_ht(self):
+        amp = HTOnlineSystem(packet_samples=40, num_chans=8)
+        self.assertBytesEqual(amp._unpack_data(self.float_bytes), _ht_legacy(8, 40 * 9, self.float_bytes))
+
+
+class TestSharedMemoryWorker(BaseTmpl):
+
+    def test_shm(self):
+        rng = np.random.default_rng(42)
+        epochs = [rng.standard_normal((n_samples, 4)) for n_samples in [100, 60, 100, 80, 150]]
+        worker = _EchoWorker(shm_shape=(100, 4), shm_slots=2)
+        worker.start()
+        self.assertTrue(worker.ready.wait(10))
+        # let the worker clear its queue after pre
+        time.sleep(0.5)
+        for epoch in epochs:
+            worker.put(epoch)
+        results = [worker.results.get(timeout=10) for _ in epochs]
+        for epoch, (_, data) in zip(epochs, results):
+            self.assertTrue(np.array_equal(epoch, data))
+        shared = [result[0] for result in results]
+        # two slots, the third and fourth epochs find the ring full, the last one is oversized
+        self.assertEqual(shared, [True, True, False, False, False])
+
+        # epochs left in the queue at exit are recycled by clear_queue
+        worker.put(epochs[0])
+        worker.put(epochs[1])
+        worker.stop()
+        worker.join(10)
+        slots = []
+        while True:
+            try:
+                slots.append(worker._free_slots.get(timeout=0.5))
+            except queue.Empty:
+                break
+        self.assertEqual(sorted(slots), [0, 1])
@@ -0,0 +1,67 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.stats import pearsonr
+from metabci.brainda.algorithms.decomposition.base import pearson_features
+from metabci.brainda.algorithms.decomposition.cca import SCCA, _scca_feature, _trca_kernel, _ged_wong
+
+
+def _references(freqs, srate, n_samples, n_harmonics=3):
+    t = np.arange(n_samples) / srate
+    Yf = []
+    for f in freqs:
+        Y = []
+        for h in range(1, n_harmonics + 1):
+            Y.extend([np.sin(2 * np.pi * h * f * t), np.cos(2 * np.pi * h * f * t)])
+        Yf.append(Y)
+    return np.array(Yf)
+
+
+class TestSCCA(BaseTmpl):
+
+    def test_batched_rhos(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((6, 8, 200))
+        Yf = _references(np.linspace(8, 15, 8), 250, 200)
+        for n_components in (1, 2):
+            est = SCCA(n_components=n_components).fit(Yf=Yf)
+            rhos = est.transform(X)
+            Xc = X - np.mean(X, axis=-1, keepdims=True)
+            expected = np.stack(
+                [_scca_feature(x, est.Yf_, n_components=n_components) for x in Xc]
+            )
+            self.assertEqual(rhos.shape, (6, 8))
+            self.assertTrue(np.allclose(rhos, expected))
+
+
+class TestPearsonFeatures(BaseTmpl):
+
+    def test_filters(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((5, 4, 50))
+        templates = rng.standard_normal((3, 4, 50))
+        U = rng.standard_normal((4, 2))
+        Us = rng.standard_normal((3, 4, 2))
+        corr = pearson_features(X, templates, U)
+        corrs = pearson_features(X, templates, Us)
+        corr32 = pearson_features(X, templates, Us, dtype="float32")
+        self.assertEqual(corr32.dtype, np.float32)
+        for i in range(5):
+            for k in range(3):
+                rho = pearsonr((U.T @ X[i]).ravel(), (U.T @ templates[k]).ravel())[0]
+                self.assertAlmostEqual(corr[i, k], rho)
+                rho = pearsonr((Us[k].T @ X[i]).ravel(), (Us[k].T @ templates[k]).ravel())[0]
+                self.assertAlmostEqual(corrs[i, k], rho)
+                self.assertAlmostEqual(corr32[i, k], rho, places=4)
+
+
+class TestTRCA(BaseTmpl):
+
+    def test_kernel(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((4, 5, 60))
+        M, _, N = X.shape
+        P = np.vstack([np.identity(N) for _ in range(M)])
+        _, expected = _ged_wong(np.hstack(X).T, None, P @ P.T, n_components=5)
+        U = _trca_kernel(X)
+        signs = np.sign(np.sum(U * expected, axis=0))
+        self.assertTrue(np.allclose(U * signs, expected))
@@ -0,0 +1,54 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.linalg import eigh
+from metabci.brainda.algorithms.utils.covariance import (
+    covariances, estimators, sqrtm, invsqrtm, logm, expm, powm)
+
+
+def _matrix_operator_legacy(Ci, operator):
+    Co = []
+    for C in Ci.reshape((-1, *Ci.shape[-2:])):
+        eigvals, eigvects = eigh(C, check_finite=False)
+        Co.append(eigvects @ np.diag(operator(eigvals)) @ eigvects.T)
+    return np.reshape(Co, Ci.shape)
+
+
+class TestMatrixOperator(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((3, 5, 6, 50))
+        self.C = X @ np.swapaxes(X, -1, -2) / 50
+
+    def test_operators(self):
+        for func, operator in [
+            (sqrtm, np.sqrt),
+            (invsqrtm, lambda x: 1 / np.sqrt(x)),
+            (logm, np.log),
+            (expm, np.exp),
+            (lambda C, **kwargs: powm(C, 0.3, **kwargs), lambda x: x**0.3),
+        ]:
+            expected = _matrix_operator_legacy(self.C, operator)
+            self.assertTrue(np.allclose(func(self.C), expected))
+            self.assertTrue(np.allclose(func(self.C[0, 0]), expected[0, 0]))
+            Co = func(self.C, dtype="float32")
+            self.assertEqual(Co.dtype, np.float32)
+            self.assertTrue(np.allclose(Co, expected, rtol=1e-4, atol=1e-4))
+
+    def test_parallel(self):
+        C = np.tile(self.C.reshape(-1, 6, 6), (80, 1, 1))
+        self.assertTrue(np.array_equal(sqrtm(C, n_jobs=2), sqrtm(C)))
+
+
+class TestCovariances(BaseTmpl):
+
+    def test_batch_estimators(self):
+        rng = np.random.default_rng(42)
+        for shape in [(10, 8, 100), (3, 2, 6, 20), (4, 1, 50), (8, 30)]:
+            X = rng.standard_normal(shape)
+            for est in ['cov', 'lwf', 'oas']:
+                covmats = covariances(X, estimator=est)
+                expected = covariances(X, estimator=estimators[est])
+                self.assertEqual(covmats.shape, expected.shape)
+                self.assertTrue(np.allclose(covmats, expected))
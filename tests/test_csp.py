@@ -0,0 +1,86 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.signal import butter
+from metabci.brainda.algorithms.decomposition.csp import ajd, _ajd_pham, MultiCSP, FBCSP, FBMultiCSP
+
+
+class TestAJD(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        A = rng.standard_normal((7, 7))
+        self.A = A
+        self.X = np.stack([A @ np.diag(rng.uniform(0.5, 3, 7)) @ A.T for _ in range(5)])
+
+    def test_methods(self):
+        for method in ['rjd', 'ajd_pham', 'uwedge']:
+            X = self.X
+            if method == 'rjd':
+                # rjd is an orthogonal diagonalizer, whiten the set first
+                w, V = np.linalg.eigh(np.mean(X, axis=0))
+                W = V / np.sqrt(w)
+                X = W.T @ X @ W
+            V, D, info = ajd(X, method=method, return_info=True)
+            self.assertTrue(info['converged'])
+            self.assertTrue(np.all(np.diff(D) <= 0))
+            Y = V.T @ X @ V
+            off = np.sum(Y**2) - np.sum(np.diagonal(Y, axis1=-2, axis2=-1)**2)
+            self.assertTrue(off / np.sum(Y**2) < 1e-8)
+
+    def test_ajd_pham_reference(self):
+        # column-normalized V of the sequential sweep of the reference implementation for this set
+        V_ref = np.array([
+            [0.31111914, -0.32396037, -0.13968822, 0.10593407, -0.18952597],
+            [0.61613897, 0.30723234, 0.66977994, -0.38724776, 0.30505393],
+            [0.16575450, -0.12594191, 0.52485598, 0.21293421, 0.45897430],
+            [-0.53908594, 0.54010646, -0.48222902, 0.77713541, -0.25797298],
+            [-0.45330943, 0.70219770, -0.15447783, 0.43535816, 0.77059362]])
+        rng = np.random.default_rng(42)
+        A = rng.standard_normal((5, 5))
+        X = np.stack([A @ np.diag(rng.uniform(0.5, 3, 5)) @ A.T for _ in range(4)])
+        N = rng.standard_normal((4, 5, 50))
+        X = X + 0.1 * (N @ np.swapaxes(N, -1, -2)) / 50
+        V, _ = _ajd_pham(X)
+        V = V / np.linalg.norm(V, axis=0)
+        V = V[:, np.argmax(np.abs(V_ref.T @ V), axis=1)]
+        V = V * np.sign(np.sum(V * V_ref, axis=0))
+        self.assertTrue(np.allclose(V, V_ref, atol=1e-6))
+
+    def test_multicsp(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((60, 7, 128))
+        y = np.repeat([0, 1, 2], 20)
+        X[y == 1, 0] *= 3
+        X[y == 2, 1] *= 3
+        features = MultiCSP(n_components=4, multiclass='grosse-wentrup', ajd_method='uwedge').fit(X, y).transform(X)
+        self.assertEqual(features.shape, (60, 4))
+
+
+class TestSharedCovariances(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.X = rng.standard_normal((60, 6, 250))
+        self.y = np.repeat([0, 1, 2], 20)
+        self.X[self.y == 1, 0] *= 2
+        self.filterbank = [butter(4, [lo, lo + 8], btype='band', fs=250, output='sos') for lo in (8, 16)]
+
+    def test_fbcsp(self):
+        X, y = self.X[self.y < 2], self.y[self.y < 2]
+        features = []
+        for shared in [False, True]:
+            estimator = FBCSP(
+                n_components=2, n_mutualinfo_components=3, filterbank=self.filterbank, shared_covariances=shared)
+            features.append(estimator.fit(X, y).transform(X))
+        self.assertTrue(np.allclose(features[0], features[1]))
+
+    def test_fbmulticsp(self):
+        features = []
+        for shared in [False, True]:
+            estimator = FBMultiCSP(
+                n_components=2, multiclass='grosse-wentrup', n_mutualinfo_components=3,
+                filterbank=self.filterbank, shared_covariances=shared)
+            features.append(estimator.fit(self.X, self.y).transform(self.X))
+        self.assertTrue(np.allclose(features[0], features[1]))
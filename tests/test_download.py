@@ -1,7 +1,42 @@
 from .base_tmpl import BaseTmpl
 import os
+import hashlib
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
 from metabci.brainda.utils import download
 
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    content = os.urandom(300000)
+    ranges = []
+    # number of bytes sent by the next response before the connection drops
+    truncate = None
+
+    def do_GET(self):
+        start = 0
+        header = self.headers.get("Range")
+        self.ranges.append(header)
+        if header:
+            start = int(header[len("bytes="):].split("-")[0])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", "bytes {}-{}/{}".format(start, len(self.content) - 1, len(self.content)))
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(self.content) - start))
+        self.end_headers()
+        if self.truncate is not None:
+            self.wfile.write(self.content[start:start + self.truncate])
+            _RangeHandler.truncate = None
+            self.close_connection = True
+        else:
+            self.wfile.write(self.content[start:])
+
+    def log_message(self, *args):
+        pass
+
+
 class TestDownload(BaseTmpl):
 
     def test_download(self):
@@ -12,3 +47,84 @@ class TestDownload(BaseTmpl):
         self.dbgPrint(dest)
         self.assertEqual(dest, download._url_to_local_path(url, tmpdir))
 
+    def test_file_url(self):
+        with tempfile.TemporaryDirectory() as path:
+            src = os.path.join(path, "remote", "S1.mat")
+            os.makedirs(os.path.dirname(src))
+            with open(src, "wb") as f:
+                f.write(b"eeg data")
+            url = "file://" + src
+            known_hash = "sha256:" + hashlib.sha256(b"eeg data").hexdigest()
+            local = os.path.join(path, "local")
+
+            with download.DownloadReport() as report:
+                dest = download.mne_data_path(url, "fake", path=local, known_hash=known_hash, update_path=False)
+                download.mne_data_path(url, "fake", path=local, update_path=False)
+            self.assertEqual((report.n_downloaded, report.n_up_to_date, report.n_bytes), (1, 1, 8))
+            self.assertTrue(os.path.isfile(os.path.join(local, "MNE-fake-data", download.MANIFEST_NAME)))
+
+            # a corrupted file is downloaded again
+            with open(dest, "wb") as f:
+                f.write(b"bad data")
+            with download.DownloadReport() as report:
+                download.mne_data_path(url, "fake", path=local, update_path=False)
+            self.assertEqual(report.n_downloaded, 1)
+            with open(dest, "rb") as f:
+                self.assertEqual(f.read(), b"eeg data")
+
+            with self.assertRaises(ValueError):
+                download.mne_data_path(url, "fake", path=local, force_update=True,
+                                       known_hash="sha256:" + "0" * 64, update_path=False)
+            self.assertFalse(os.path.exists(dest + ".part"))
+
+    def test_http_resume(self):
+        server = HTTPServer(("127.0.0.1", 0), _RangeHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = "http://127.0.0.1:{}/data/S1.mat".format(server.server_port)
+            content = _RangeHandler.content
+            with tempfile.TemporaryDirectory() as path:
+                dest = download._url_to_local_path(url, os.path.join(path, "MNE-fake-data"))
+                os.makedirs(os.path.dirname(dest))
+                # interrupted download
+                with open(dest + ".part", "wb") as f:
+                    f.write(content[:100000])
+                known_hash = hashlib.sha256(content).hexdigest()
+                with download.DownloadReport() as report:
+                    download.mne_data_path(url, "fake", path=path, known_hash=known_hash, update_path=False)
+                self.assertEqual(_RangeHandler.ranges[-1], "bytes=100000-")
+                self.assertEqual(report.n_bytes, 200000)
+                with open(dest, "rb") as f:
+                    self.assertEqual(f.read(), content)
+                self.assertFalse(os.path.exists(dest + ".part"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_http_truncated(self):
+        server = HTTPServer(("127.0.0.1", 0), _RangeHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = "http://127.0.0.1:{}/data/S2.mat".format(server.server_port)
+            content = _RangeHandler.content
+            # expected hashes looked up by file name
+            known_hashes = {"S2.mat": "sha256:" + hashlib.sha256(content).hexdigest()}
+            with tempfile.TemporaryDirectory() as path:
+                _RangeHandler.truncate = 120000
+                with self.assertRaises(IOError):
+                    download.mne_data_path(url, "fake", path=path, known_hash=known_hashes, update_path=False)
+                dest = download._url_to_local_path(url, os.path.join(path, "MNE-fake-data"))
+                self.assertFalse(os.path.exists(dest))
+                # the bytes received before the connection dropped are kept
+                received = os.path.getsize(dest + ".part")
+                self.assertTrue(0 < received <= 120000)
+
+                download.mne_data_path(url, "fake", path=path, known_hash=known_hashes, update_path=False)
+                self.assertEqual(_RangeHandler.ranges[-1], "bytes={}-".format(received))
+                with open(dest, "rb") as f:
+                    self.assertEqual(f.read(), content)
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,76 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi, sosfiltfilt
+from sklearn.base import BaseEstimator, TransformerMixin
+from metabci.brainda.algorithms.decomposition import base
+from metabci.brainda.algorithms.decomposition.base import (
+    FilterBank,
+    StreamingFilterBank,
+    generate_filterbank,
+    set_filterbank_cache,
+)
+
+
+class _Mean(BaseEstimator, TransformerMixin):
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return np.mean(X, axis=-1)
+
+
+def _filterbank():
+    return generate_filterbank(
+        [(6, 40), (14, 40), (22, 40)], [(4, 50), (12, 50), (20, 50)], srate=250
+    )
+
+
+class TestFilterBank(BaseTmpl):
+
+    def tearDown(self):
+        set_filterbank_cache(0)
+        super().tearDown()
+
+    def test_parallel_cached(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((4, 3, 250))
+        filterbank = _filterbank()
+        expected = np.stack([sosfiltfilt(sos, X, axis=-1) for sos in filterbank])
+        set_filterbank_cache(8)
+        for _ in range(2):
+            est = FilterBank(_Mean(), filterbank, n_jobs=2).fit(X)
+            self.assertTrue(np.allclose(est.transform_filterbank(X), expected))
+        self.assertEqual(len(base._filterbank_cache), len(filterbank))
+        self.assertTrue(np.allclose(est.transform(X), np.mean(expected, axis=-1).transpose(1, 0, 2).reshape(4, -1)))
+
+
+class TestStreamingFilterBank(BaseTmpl):
+
+    def test_online(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((3, 500))
+        filterbank = _filterbank()
+        stream = StreamingFilterBank(filterbank, 3, 200)
+        for chunk in np.array_split(X, [7, 40, 41, 300], axis=-1):
+            stream.update(chunk)
+        expected = []
+        for sos in filterbank:
+            zi = sosfilt_zi(sos)[:, np.newaxis, :] * X[np.newaxis, :, :1]
+            expected.append(sosfilt(sos, X, axis=-1, zi=zi)[0])
+        expected = np.stack(expected)
+        Xs = stream.get_subbands(150)
+        self.assertEqual(Xs.shape, (3, 1, 3, 150))
+        self.assertTrue(np.allclose(Xs[:, 0], expected[..., -150:]))
+
+    def test_offline(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((3, 500))
+        filterbank = _filterbank()
+        stream = StreamingFilterBank(filterbank, 3, 300, online=False)
+        for chunk in np.array_split(X, 9, axis=-1):
+            stream.update(chunk)
+        est = FilterBank(_Mean(), filterbank)
+        expected = est.transform_filterbank(X[np.newaxis, :, -250:])
+        self.assertTrue(np.allclose(stream.get_subbands(250), expected))
+        with self.assertRaises(ValueError):
+            stream.get_subbands(400)
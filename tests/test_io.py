@@ -0,0 +1,48 @@
+import os
+import tempfile
+from .base_tmpl import BaseTmpl
+import numpy as np
+import h5py
+import scipy.io as sio
+from metabci.brainda.utils.io import loadmat, load_mat_files, H5MatArray
+
+
+def _write_mat73(filename, x, y):
+    # minimal matv7.3 file: HDF5 with a 512 bytes MATLAB header, arrays stored transposed
+    with h5py.File(filename, "w", userblock_size=512) as f:
+        f.create_dataset("x", data=x.T).attrs["MATLAB_class"] = np.bytes_("double")
+        g = f.create_group("s")
+        g.attrs["MATLAB_class"] = np.bytes_("struct")
+        g.create_dataset("y", data=y.T, chunks=True, compression="gzip").attrs[
+            "MATLAB_class"] = np.bytes_("double")
+    with open(filename, "r+b") as f:
+        f.write(b"MATLAB 7.3 MAT-file".ljust(116, b" ") + b"\x00" * 8 + b"\x00\x02IM")
+
+
+class TestLoadmat(BaseTmpl):
+
+    def test_loadmat(self):
+        rng = np.random.default_rng(0)
+        x, y = rng.standard_normal((4, 6)), rng.standard_normal((3, 5, 2))
+        with tempfile.TemporaryDirectory() as path:
+            v5_file = os.path.join(path, "v5.mat")
+            sio.savemat(v5_file, {"x": x, "y": y})
+            data = loadmat(v5_file, variable_names=["x"])
+            self.assertNotIn("y", data)
+            self.assertTrue(np.array_equal(data["x"], x))
+
+            v73_file = os.path.join(path, "v73.mat")
+            _write_mat73(v73_file, x, y)
+            data = loadmat(v73_file)
+            lazy_data = loadmat(v73_file, lazy=True)
+            self.assertIsInstance(lazy_data["x"], np.memmap)
+            self.assertIsInstance(lazy_data["s"]["y"], H5MatArray)
+            self.assertTrue(np.array_equal(lazy_data["x"], data["x"]))
+            self.assertTrue(np.array_equal(np.asarray(lazy_data["s"]["y"]), data["s"]["y"]))
+            self.assertTrue(np.array_equal(lazy_data["s"]["y"][1, :, 1], y[1, :, 1]))
+            self.assertTrue(np.array_equal(lazy_data["s"]["y"][..., 0], y[..., 0]))
+            del lazy_data
+
+            data = load_mat_files([v5_file, v73_file], variable_names=["x"], n_jobs=2)
+            self.assertTrue(np.array_equal(data[0]["x"], x))
+            self.assertTrue(np.array_equal(data[1]["x"], x))
@@ -0,0 +1,18 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from metabci.brainda.algorithms.transfer_learning import LST
+
+
+class TestLST(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.X = rng.standard_normal((12, 4, 100))
+        self.y = np.repeat(np.arange(3), 4)
+
+    def test_unseen_labels(self):
+        lst = LST().fit(self.X[:8], self.y[:8])
+        self.assertEqual(lst.transform(self.X[:8], self.y[:8]).shape, (8, 4, 100))
+        with self.assertRaises(ValueError):
+            lst.transform(self.X, self.y)
@@ -0,0 +1,101 @@
+import tempfile
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.linalg import block_diag, eigh
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from metabci.brainda.algorithms.transfer_learning import MEKT, SourceFeatureStore, choose_multiple_subjects
+from metabci.brainda.algorithms.transfer_learning.mekt import (
+    graph_laplacian, mekt_feature, mekt_kernel, source_discriminability)
+
+
+class TestMEKT(BaseTmpl):
+
+    def test_sparse_graph_laplacian(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((50, 8))
+        L, D = graph_laplacian(X, k=5)
+        L_sparse, D_sparse = graph_laplacian(X, k=5, sparse=True)
+        self.assertTrue(np.allclose(L, L_sparse.toarray()))
+        self.assertTrue(np.allclose(D, D_sparse.toarray()))
+
+    def test_mekt_kernel(self):
+        rng = np.random.default_rng(42)
+        Xs = rng.standard_normal((40, 6))
+        ys = np.repeat([0, 1], 20)
+        Xs[ys == 1, :2] += 2
+        Xt = 1.5 * rng.standard_normal((30, 6))
+        Xt[:15, :2] += 2
+        d, alpha, beta, rho = 3, 0.01, 0.1, 20
+        A, B = mekt_kernel(Xs, Xt, ys, d=d, max_iter=3, alpha=alpha, beta=beta, rho=rho, k=5)
+
+        # dense reference with the n_trials x n_trials matrices Ht, M and block_diag(Xs, Xt)
+        ns, nf = Xs.shape
+        nt = len(Xt)
+        Sw, Sb = source_discriminability(Xs, ys)
+        P = block_diag(Sw, np.zeros((nf, nf)))
+        P0 = block_diag(Sb, np.zeros((nf, nf)))
+        L, D = graph_laplacian(Xt, k=5, t=1)
+        iD12 = np.diag(1 / np.sqrt(np.diag(D)))
+        L = block_diag(np.zeros((nf, nf)), Xt.T @ iD12 @ L @ iD12 @ Xt)
+        Q = np.block([[np.eye(nf), -np.eye(nf)], [-np.eye(nf), 2 * np.eye(nf)]])
+        Ht = np.eye(nt) - np.ones((nt, nt)) / nt
+        S = block_diag(np.zeros((nf, nf)), Xt.T @ Ht @ Xt)
+        Ns = np.eye(2)[ys] / ns
+        X = block_diag(Xs, Xt)
+        clf = LinearDiscriminantAnalysis(solver="lsqr", shrinkage="auto")
+        yt = clf.fit(Xs, ys).predict(Xt)
+        Emax = S + alpha * P0 + 1e-3 * np.eye(2 * nf)
+        for _ in range(3):
+            Nt = np.eye(2)[yt] / nt
+            M = np.block([[Ns @ Ns.T, -Ns @ Nt.T], [-Nt @ Ns.T, Nt @ Nt.T]])
+            _, V = eigh(alpha * P + beta * L + rho * Q + X.T @ M @ X, Emax)
+            A_ref, B_ref = V[:nf, :d], V[nf:, :d]
+            yt = clf.fit(Xs @ A_ref, ys).predict(Xt @ B_ref)
+
+        signs = np.sign(np.sum(A * A_ref, axis=0) + np.sum(B * B_ref, axis=0))
+        self.assertTrue(np.allclose(A * signs, A_ref))
+        self.assertTrue(np.allclose(B * signs, B_ref))
+
+    def test_fit_transform(self):
+        rng = np.random.default_rng(42)
+        Xs = rng.standard_normal((40, 4, 100))
+        ys = np.repeat([0, 1], 20)
+        Xs[ys == 1, 0] *= 2
+        Xt = 1.5 * rng.standard_normal((30, 4, 100))
+        source_features, target_features = MEKT(subspace_dim=3).fit_transform(Xs, ys, Xt)
+        self.assertEqual(source_features.shape, (40, 3))
+        self.assertEqual(target_features.shape, (30, 3))
+
+
+class TestSourceFeatureStore(BaseTmpl):
+
+    def test_store(self):
+        rng = np.random.default_rng(42)
+        data = {}
+        for subject in range(4):
+            X = rng.standard_normal((20, 4, 100))
+            y = np.repeat([0, 1], 10)
+            X[y == 1, 0] *= 1.5 + 0.2 * subject
+            data[subject] = (X, y)
+        Xt = 1.5 * rng.standard_normal((10, 4, 100))
+        with tempfile.TemporaryDirectory() as path:
+            store = SourceFeatureStore(path, config={'srate': 100}).add_subjects(data)
+            self.assertEqual(store.subjects, ['0', '1', '2', '3'])
+            self.assertNotEqual(store.key, SourceFeatureStore(path).key)
+
+            featureXs = np.concatenate([mekt_feature(X, 'lwf') for X, _ in data.values()])
+            ys = np.concatenate([y for _, y in data.values()])
+            y_subjects = np.repeat(np.arange(4), 20)
+            featureXt = mekt_feature(Xt, 'lwf')
+            _, selected = choose_multiple_subjects(featureXs, featureXt, ys, y_subjects, k=2)
+            self.assertEqual(store.choose_subjects(featureXt, k=2), [str(s) for s in selected])
+
+            features, y, (Sw, Sb) = store.source_data(store.subjects)
+            Sw_ref, Sb_ref = source_discriminability(featureXs, ys)
+            self.assertTrue(np.allclose(features, featureXs))
+            self.assertTrue(np.allclose(Sw, Sw_ref))
+            self.assertTrue(np.allclose(Sb, Sb_ref))
+
+            source_features, target_features = MEKT(subspace_dim=3).fit_transform_store(store, Xt, n_subjects=2)
+            self.assertEqual(source_features.shape, (40, 3))
+            self.assertEqual(target_features.shape, (10, 3))
@@ -0,0 +1,199 @@
+import tempfile
+import types
+from .base_tmpl import BaseTmpl
+import numpy as np
+import mne
+from metabci.brainda.datasets import PhysionetMI, PhysionetME
+from metabci.brainda.datasets.base import BaseDataset, EpochsArray, epochs_array_to_raw
+from metabci.brainda.paradigms import MotorImagery
+from metabci.brainda.paradigms.base import BaseTimeEncodingParadigm, _hook_identity
+
+
+class FakeDataset(BaseDataset):
+    _CACHE_KEY_EXCLUDE = ("n_loads",)
+
+    def __init__(self, gain=1):
+        super().__init__(
+            dataset_code="fake", subjects=[1, 2], events={"left_hand": (1, (0, 1)), "right_hand": (2, (0, 1))},
+            channels=["C3", "CZ", "C4"], srate=100, paradigm="imagery")
+        self.gain = gain
+        self.n_loads = 0
+
+    def data_path(self, subject, path=None, force_update=False, update_path=None, proxies=None, verbose=None):
+        return [[]]
+
+    def _get_single_subject_data(self, subject, verbose=None):
+        self.n_loads += 1
+        rng = np.random.default_rng(subject)
+        data = np.zeros((4, 3000))
+        data[:3] = self.gain * 1e-6 * rng.standard_normal((3, 3000))
+        data[3, 100:2900:200] = np.tile([1, 2], 7)
+        info = mne.create_info(self.channels + ["STI"], self.srate, ["eeg"] * 3 + ["stim"])
+        return {"session_0": {"run_0": mne.io.RawArray(data, info, verbose=False)}}
+
+
+class FakeEpochedDataset(FakeDataset):
+
+    def get_epochs_array(self, subject, verbose=None):
+        rng = np.random.default_rng(subject)
+        runs = {}
+        for i in range(2):
+            # stored as (channel, time, trial) like the Tsinghua datasets
+            data = 1e-6 * rng.standard_normal((3, 250, 10))
+            runs["run_{:d}".format(i)] = EpochsArray(
+                data=np.transpose(data, (2, 0, 1)),
+                ch_names=self.channels,
+                labels=np.tile([1, 2], 5),
+                onset=50,
+            )
+        return {"session_0": runs}
+
+    def _get_single_subject_data(self, subject, verbose=None):
+        info = mne.create_info(self.channels + ["STI"], self.srate, ["eeg"] * 3 + ["stim"])
+        return {
+            session: {run: epochs_array_to_raw(epochs, info) for run, epochs in runs.items()}
+            for session, runs in self.get_epochs_array(subject).items()
+        }
+
+
+class TestEpochsArray(BaseTmpl):
+
+    def test_same_as_mne(self):
+        dataset = FakeEpochedDataset()
+        for intervals in [None, [(-0.5, 1.5)], [(0.2, 1.0), (0.5, 2.0)]]:
+            paradigm = MotorImagery(channels=["C4", "C3"], intervals=intervals)
+            Xs, ys, metas = paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1)
+            # a raw hook forces epoching with MNE
+            paradigm.register_raw_hook(lambda raw, caches: (raw, caches))
+            Xs_mne, ys_mne, metas_mne = paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1)
+            for event in ["left_hand", "right_hand"]:
+                self.assertTrue(np.allclose(Xs[event], Xs_mne[event], rtol=0, atol=1e-12))
+                self.assertTrue(np.array_equal(ys[event], ys_mne[event]))
+                self.assertTrue(metas[event].equals(metas_mne[event]))
+
+    def test_fallback(self):
+        # epochs spanning adjacent trials are only available from the continuous data
+        dataset = FakeEpochedDataset()
+        paradigm = MotorImagery(events=["left_hand"], intervals=[(-0.5, 2.5)])
+        self.assertIsNone(paradigm._get_single_subject_epochs_array(
+            dataset, 1, *paradigm._map_events_intervals(dataset)))
+        X = paradigm.get_data(dataset, subjects=[1], n_jobs=1)[0]["left_hand"]
+        self.assertEqual(X.shape, (10, 3, 300))
+
+
+def _make_hook(weights):
+    def hook(X, y, meta, caches):
+        return X * weights[0], y, meta, caches
+    return hook
+
+
+def _scale_hook(X, y, meta, caches):
+    return SCALE * X, y, meta, caches
+
+
+SCALE = 2
+
+
+class TestEpochCache(BaseTmpl):
+
+    def test_hook_identity(self):
+        a = np.zeros(2000)
+        b = a.copy()
+        b[1000] = 1
+        self.assertNotEqual(_hook_identity(_make_hook(a)), _hook_identity(_make_hook(b)))
+        self.assertEqual(_hook_identity(_make_hook(a)), _hook_identity(_make_hook(a.copy())))
+        # globals referenced by the hook are part of its identity
+        other = types.FunctionType(_scale_hook.__code__, {"SCALE": 3}, _scale_hook.__name__)
+        other.__module__, other.__qualname__ = _scale_hook.__module__, _scale_hook.__qualname__
+        self.assertNotEqual(_hook_identity(_scale_hook), _hook_identity(other))
+
+    def test_cache(self):
+        dataset = FakeDataset()
+        paradigm = MotorImagery()
+        X, y, meta = paradigm.get_data(dataset, subjects=[1, 2], return_concat=True, n_jobs=1)
+        with tempfile.TemporaryDirectory() as path:
+            paradigm.register_cache(path)
+            for _ in range(2):
+                X_cached, y_cached, meta_cached = paradigm.get_data(
+                    dataset, subjects=[1, 2], return_concat=True, n_jobs=1)
+                self.assertTrue(np.array_equal(X, X_cached))
+                self.assertTrue(np.array_equal(y, y_cached))
+                self.assertTrue(meta.equals(meta_cached))
+            self.assertEqual(dataset.n_loads, 4)
+
+            X_single = paradigm.get_data(dataset, subjects=[1], n_jobs=1)[0]['left_hand']
+            self.assertIsInstance(X_single, np.memmap)
+            self.assertEqual(dataset.n_loads, 4)
+
+            # a new hook is a new config
+            paradigm.register_data_hook(lambda X, y, meta, caches: (2 * X, y, meta, caches))
+            X_hook = paradigm.get_data(dataset, subjects=[1], n_jobs=1)[0]['left_hand']
+            self.assertTrue(np.allclose(X_hook, 2 * X_single))
+            self.assertEqual(dataset.n_loads, 5)
+
+            paradigm.clear_cache(dataset, subjects=[1])
+            paradigm.get_data(dataset, subjects=[1], return_concat=True, n_jobs=1)
+            self.assertEqual(dataset.n_loads, 6)
+
+            with self.assertRaises(NotImplementedError):
+                BaseTimeEncodingParadigm().register_cache(path)
+
+    def test_dataset_options(self):
+        # datasets sharing a code but loading different data get different entries
+        paradigm = MotorImagery()
+        datasets = [FakeDataset(), FakeDataset(gain=2)]
+        with tempfile.TemporaryDirectory() as path:
+            paradigm.register_cache(path)
+            self.assertNotEqual(paradigm._cache_dir(datasets[0], 1), paradigm._cache_dir(datasets[1], 1))
+            Xs = [paradigm.get_data(dataset, subjects=[1], return_concat=True, n_jobs=1)[0] for dataset in datasets]
+            self.assertTrue(np.allclose(Xs[1], 2 * Xs[0]))
+            self.assertEqual([dataset.n_loads for dataset in datasets], [1, 1])
+            self.assertNotEqual(
+                paradigm._cache_dir(PhysionetMI(), 1), paradigm._cache_dir(PhysionetME(), 1))
+
+
+class TestStreaming(BaseTmpl):
+
+    def test_iter_data(self):
+        dataset = FakeDataset()
+        paradigm = MotorImagery()
+        Xs, ys, metas = paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1)
+        chunks = list(paradigm.iter_data(dataset, subjects=[1, 2]))
+        self.assertEqual(len(chunks), 2)
+        for event in ["left_hand", "right_hand"]:
+            X = np.concatenate([chunk[0][event] for chunk in chunks])
+            y = np.concatenate([chunk[1][event] for chunk in chunks])
+            self.assertTrue(np.array_equal(X, Xs[event]))
+            self.assertTrue(np.array_equal(y, ys[event]))
+        self.assertEqual(list(chunks[1][2]["left_hand"]["subject"].unique()), [2])
+
+    def test_out(self):
+        dataset = FakeEpochedDataset()
+        paradigm = MotorImagery()
+        shape, event_counts = paradigm.data_shape(dataset, subjects=[1, 2])
+        self.assertEqual(shape, (40, 3, 100))
+        self.assertEqual(event_counts, {"left_hand": 20, "right_hand": 20})
+        X_ref, y_ref, meta_ref = paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1, return_concat=True)
+        with tempfile.TemporaryDirectory() as path:
+            out = np.lib.format.open_memmap(
+                path + "/X.npy", mode="w+", dtype=np.float64, shape=shape)
+            X, y, meta = paradigm.get_data(
+                dataset, subjects=[1, 2], n_jobs=1, out=out, event_counts=event_counts)
+            self.assertIsInstance(X, np.memmap)
+            # same order as without out
+            self.assertTrue(np.array_equal(X, X_ref))
+            self.assertTrue(np.array_equal(y, y_ref))
+            self.assertTrue(meta.equals(meta_ref))
+            with self.assertRaises(ValueError):
+                paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1, out=out[:30])
+            with self.assertRaises(ValueError):
+                paradigm.get_data(dataset, subjects=[1, 2], n_jobs=1, out=out,
+                                  event_counts={"left_hand": 10, "right_hand": 30})
+            del X, out
+
+    def test_time_encoding(self):
+        paradigm = BaseTimeEncodingParadigm()
+        with self.assertRaises(NotImplementedError):
+            next(iter(paradigm.iter_data(FakeDataset(), subjects=[1])))
+        with self.assertRaises(NotImplementedError):
+            paradigm.data_shape(FakeDataset(), subjects=[1])
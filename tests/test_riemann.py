@@ -0,0 +1,79 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from scipy.linalg import eigvalsh
+from metabci.brainda.algorithms.manifold import (
+    mean_riemann, update_mean_riemann, distance_riemann, distance_riemann_centroids, MDRM,
+    RecursiveAlignment)
+from metabci.brainda.algorithms.utils.covariance import covariances, invsqrtm
+
+
+class TestMeanRiemann(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((40, 6, 100))
+        self.C = X @ np.swapaxes(X, -1, -2) / 100
+
+    def test_methods(self):
+        M, info = mean_riemann(self.C, return_info=True)
+        self.assertTrue(info['converged'])
+        self.assertEqual(len(info['residuals']), info['n_iter'])
+        M_fp, info_fp = mean_riemann(self.C, method='fixed_point', return_info=True)
+        self.assertTrue(info_fp['converged'])
+        self.assertTrue(np.allclose(M, M_fp))
+        _, info_warm = mean_riemann(self.C, init=M, return_info=True)
+        self.assertEqual(info_warm['n_iter'], 1)
+
+    def test_update(self):
+        M = mean_riemann(self.C)
+        M_online, n_tracked = update_mean_riemann(None, self.C[:10])
+        M_online, n_tracked = update_mean_riemann(M_online, self.C[10:], n_tracked)
+        self.assertEqual(n_tracked, 40)
+        self.assertTrue(np.allclose(update_mean_riemann(None, self.C[0])[0], self.C[0]))
+        self.assertTrue(distance_riemann(M_online, M)[0] < 0.1)
+
+    def test_mdrm_warm_start(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((30, 6, 100))
+        y = np.repeat([1, 2, 3], 10)
+        estimator = MDRM(warm_start=True).fit(X, y)
+        centroids = estimator.centroids_
+        estimator.fit(X, y)
+        self.assertTrue(np.all(estimator.n_iter_ == 1))
+        self.assertTrue(np.allclose(estimator.centroids_, centroids))
+
+
+class TestDistanceRiemann(BaseTmpl):
+
+    def test_distance(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((12, 5, 50))
+        C = X @ np.swapaxes(X, -1, -2) / 50
+        expected = np.array([
+            [np.sqrt(np.sum(np.log(eigvalsh(A, B)) ** 2)) for B in C[:3]] for A in C
+        ])
+        self.assertTrue(np.allclose(distance_riemann(C, C[1]), expected[:, 1]))
+        self.assertTrue(np.allclose(distance_riemann(C[:3], C[:3]), 0))
+        self.assertTrue(np.allclose(distance_riemann_centroids(C, invsqrtm(C[:3])), expected))
+
+
+class TestRecursiveAlignment(BaseTmpl):
+
+    def test_streaming(self):
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((30, 5, 100))
+        X = X - np.mean(X, axis=-1, keepdims=True)
+        Cs = covariances(X, estimator='lwf')
+        for align_method in ['euclid', 'riemann']:
+            batch = RecursiveAlignment(align_method=align_method)
+            Xt = batch.transform(X)
+            stream = RecursiveAlignment(align_method=align_method)
+            for C in Cs[:20]:
+                aligned = stream.transform_one(C)
+            self.assertTrue(np.allclose(aligned, stream.iC12_ @ Cs[19] @ stream.iC12_))
+            restored = RecursiveAlignment(align_method=align_method).set_state(stream.get_state())
+            restored.partial_fit(Cs[20:])
+            self.assertEqual(restored.n_tracked, 30)
+            self.assertTrue(np.allclose(restored.C_, batch.C_))
+            self.assertTrue(np.allclose(restored.iC12_ @ X[-1], Xt[-1]))
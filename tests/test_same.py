@@ -0,0 +1,33 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from metabci.brainda.algorithms.transfer_learning import MSSAME
+from metabci.brainda.algorithms.transfer_learning.same import get_augment_noiseAfter_ms
+
+
+class TestSAME(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.flist = list(8 + 0.5 * np.arange(10))
+        self.plist = list(0.5 * np.arange(10) % 2)
+        self.X = rng.standard_normal((20, 4, 250))
+        self.y = np.repeat(np.arange(10), 2)
+
+    def test_batched(self):
+        mssame = MSSAME(fs=250, flist=self.flist, plist=self.plist, Nh=3, n_Aug=2, n_Neig=4, alpha=0)
+        X_aug, y_aug = mssame.fit(self.X, self.y).augment()
+        self.assertTrue(np.array_equal(y_aug, np.repeat(np.arange(10), 2)))
+        temp = np.transpose(np.stack(mssame.T_), [1, 2, 0])
+        for i in range(10):
+            data_aug = get_augment_noiseAfter_ms(250, self.flist, self.plist, 3, 2, temp, i, 4, alpha=0)
+            self.assertTrue(np.allclose(X_aug[2 * i:2 * i + 2], np.transpose(data_aug, [2, 0, 1])))
+
+    def test_reproducible(self):
+        mssame = MSSAME(fs=250, flist=self.flist, plist=self.plist, Nh=3, n_Aug=2, n_Neig=4, random_state=0)
+        X_aug, _ = mssame.fit(self.X, self.y).augment()
+        out = np.zeros(X_aug.shape, dtype=np.float32)
+        X_aug32, _ = mssame.augment(out=out)
+        self.assertIs(X_aug32, out)
+        self.assertEqual(mssame.set_params(dtype='float32').augment()[0].dtype, np.float32)
+        self.assertTrue(np.array_equal(X_aug, mssame.set_params(dtype=None).augment()[0]))
@@ -0,0 +1,76 @@
+from .base_tmpl import BaseTmpl
+import numpy as np
+from metabci.brainflow.amplifiers import Marker, NeuroScan, HTOnlineSystem
+from metabci.brainflow.simulator import (
+    ReplaySource, ReplayAmplifier, ReplayServer, BenchmarkWorker, run_benchmark)
+
+
+class _NotReadyWorker(BenchmarkWorker):
+
+    def pre(self):
+        # does not call super().pre()
+        pass
+
+
+class TestReplay(BaseTmpl):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.X = 1e-5 * rng.standard_normal((6, 4, 250))
+        self.y = np.array([1, 2, 1, 2, 2, 1])
+
+    def test_from_epochs(self):
+        source = ReplaySource.from_epochs(self.X, self.y, 250, iti=0.2, packet_samples=25, speed=0)
+        packets = []
+        while True:
+            samples = source.next_packet()
+            if samples is None:
+                break
+            packets.append(samples)
+        self.assertTrue(source.finished.is_set())
+        stream = np.concatenate(packets)
+        self.assertEqual(len(stream), 6 * 300)
+        self.assertTrue(np.array_equal(stream[:250, :-1], self.X[0].T))
+        self.assertTrue(np.array_equal(np.flatnonzero(stream[:, -1]), np.arange(6) * 300))
+        self.assertTrue(np.array_equal(stream[np.arange(6) * 300, -1], self.y))
+
+    def test_server(self):
+        for protocol in ['neuroscan', 'ht']:
+            source = ReplaySource.from_epochs(self.X, self.y, 250, packet_samples=25, speed=0)
+            server = ReplayServer(source, protocol=protocol)
+            address = server.start()
+            try:
+                if protocol == 'neuroscan':
+                    amplifier = NeuroScan(device_address=address, srate=250, num_chans=4)
+                    amplifier.connect_tcp()
+                    amplifier.start_acq()
+                    amplifier.send(amplifier._COMMANDS["start_trans"])
+                else:
+                    amplifier = HTOnlineSystem(
+                        device_address=address, srate=250, packet_samples=25, num_chans=4)
+                    amplifier.connect_tcp()
+                    amplifier.send(amplifier._COMMANDS["start_acq"])
+                samples = np.concatenate([amplifier.recv() for _ in range(60)])
+                amplifier.close_connection()
+            finally:
+                server.stop()
+            self.assertTrue(np.allclose(samples, source.stream, atol=0.0298e-6))
+            self.assertTrue(np.array_equal(samples[:, -1], source.stream[:, -1]))
+
+    def test_benchmark(self):
+        source = ReplaySource.from_epochs(self.X, self.y, 250, iti=0.2, packet_samples=25, speed=10)
+        marker = Marker(interval=[0, 0.8], srate=250, events=[1, 2])
+        report = run_benchmark(ReplayAmplifier(source), source, marker)
+        self.assertEqual(report['n_triggers'], 6)
+        self.assertEqual(report['n_epochs'], 6)
+        self.assertEqual(report['dropped_packets'], 0)
+        self.assertTrue(report['epoch_latency']['p50'] < report['trigger_latency']['p50'])
+
+    def test_benchmark_not_ready(self):
+        source = ReplaySource.from_epochs(self.X, self.y, 250, iti=0.2, packet_samples=25, speed=10)
+        marker = Marker(interval=[0, 0.8], srate=250, events=[1, 2])
+        amplifier = ReplayAmplifier(source)
+        with self.assertRaises(RuntimeError):
+            run_benchmark(amplifier, source, marker, worker=_NotReadyWorker(), ready_timeout=1)
+        self.assertEqual(len(amplifier._workers), 0)